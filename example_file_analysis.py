@@ -6,27 +6,26 @@ This script shows how the agent can read, analyze, and work with file contents.
 """
 
 import os
+import asyncio
 import tempfile
-from groq_agent.config import ConfigurationManager
-from groq_agent.api_client import GroqAPIClient
-from groq_agent.file_operations import FileOperations
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
+from typing import Final
 
 
-def create_sample_files():
-    """Create sample files for demonstration."""
-    
-    # Sample Python file with some issues
-    python_code = '''def calculate_fibonacci(n):
-    """Calculate fibonacci number."""
-    if n <= 1:
-        return n
-    return calculate_fibonacci(n-1) + calculate_fibonacci(n-2)
-
-def process_data(data):
-    # Missing docstring
+# Models by latency tier; quality-sensitive passes can opt into the 70B tier
+SPEED_MAP = {
+    "instant": "llama-3.1-8b-instant",
+    "balanced": "llama-3.3-70b-versatile",
+    "fast70b": "llama-3.3-70b-specdec",
+}
+
+
+# Sample Python file with some issues
+PYTHON_SAMPLE: Final[bytes] = b'''def process_data(data):
     result = []
     for item in data:
-        if item > 0:  # No error handling
+        if item > 0:
             result.append(item * 2)
     return result
 
@@ -35,26 +34,20 @@ class UserManager:
         self.users = []
     
     def add_user(self, name, email):
-        # No validation
         user = {"name": name, "email": email}
         self.users.append(user)
     
     def get_user(self, email):
-        # Inefficient linear search
         for user in self.users:
             if user["email"] == email:
                 return user
         return None
 
-# Global variable without clear purpose
 config = {}
-
-if __name__ == "__main__":
-    print("Hello World")
 '''
-    
-    # Sample JavaScript file
-    js_code = '''function processUserData(userData) {
+
+# Sample JavaScript file
+JS_SAMPLE: Final[bytes] = b'''function processUserData(userData) {
     // No input validation
     let result = [];
     
@@ -104,20 +97,26 @@ function fetchUserData(userId, callback) {
         });
 }
 '''
+
+
+def _write_sample(path, content):
+    """Write content to a sample file and return its path."""
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+
+def create_sample_files(tmpdir):
+    """Create sample files for demonstration inside tmpdir."""
     
-    # Create temporary files
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-        f.write(python_code)
-        python_file = f.name
-    
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-        f.write(js_code)
-        js_file = f.name
-    
-    return python_file, js_file
+    # Write both sample files concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        python_future = executor.submit(_write_sample, os.path.join(tmpdir, 'sample.py'), PYTHON_SAMPLE)
+        js_future = executor.submit(_write_sample, os.path.join(tmpdir, 'sample.js'), JS_SAMPLE)
+        return python_future.result(), js_future.result()
 
 
-def demonstrate_file_analysis():
+async def demonstrate_file_analysis():
     """Demonstrate file analysis capabilities."""
     
     print("=== Groq CLI Agent - Enhanced File Analysis Demo ===\n")
@@ -129,69 +128,58 @@ def demonstrate_file_analysis():
         print("export GROQ_API_KEY='your-api-key-here'")
         return
     
+    # Import the agent only once it will be used, so the early exit stays fast
+    if importlib.util.find_spec("groq_agent") is None:
+        print("groq_agent is not installed; run 'pip install -e .' from the repository root")
+        return
+    
+    from groq_agent.config import ConfigurationManager
+    from groq_agent.api_client import GroqAPIClient
+    from groq_agent.file_operations import FileOperations
+    from groq_agent.cache import ResponseCache
+    from rich.progress import Progress
+    
     # Initialize components
     config = ConfigurationManager()
     api_client = GroqAPIClient(config)
-    file_ops = FileOperations(api_client)
-    
-    # Create sample files
-    python_file, js_file = create_sample_files()
+    file_ops = FileOperations(api_client, ResponseCache())
     
-    try:
-        print("1. Comprehensive Analysis of Python File")
-        print("=" * 50)
-        print(f"Analyzing: {python_file}")
-        print()
-        
-        # Analyze Python file comprehensively
-        success = file_ops.analyze_file(python_file, "llama-2-70B", "comprehensive")
-        
-        if success:
-            print("\n✅ Analysis completed successfully!")
-        else:
-            print("\n❌ Analysis failed!")
-        
-        print("\n" + "=" * 50)
-        print("2. Security Analysis of JavaScript File")
-        print("=" * 50)
-        print(f"Analyzing: {js_file}")
-        print()
-        
-        # Analyze JavaScript file for security
-        success = file_ops.analyze_file(js_file, "llama-2-70B", "security")
+    # Sample files live in a temporary directory removed when the block exits
+    with tempfile.TemporaryDirectory() as tmpdir:
+        python_file, js_file = create_sample_files(tmpdir)
         
-        if success:
-            print("\n✅ Security analysis completed successfully!")
-        else:
-            print("\n❌ Security analysis failed!")
+        # The Python file's analyses go out as one prompt batch sharing the
+        # same file prefix; it runs alongside the JavaScript security analysis.
+        # All requests share the client's async connection pool.
+        tasks = [
+            ("Comprehensive, performance and review analysis of Python file", python_file,
+             file_ops.analyze_file_multi_async(
+                 python_file, SPEED_MAP["instant"], ["comprehensive", "performance", "review"]
+             )),
+            ("Security analysis of JavaScript file", js_file,
+             file_ops.analyze_file_async(js_file, SPEED_MAP["fast70b"], "security")),
+        ]
         
-        print("\n" + "=" * 50)
-        print("3. Performance Analysis of Python File")
+        print("1-4. Running analyses concurrently")
         print("=" * 50)
-        print(f"Analyzing: {python_file}")
+        for label, path, _ in tasks:
+            print(f"{label}: {path}")
         print()
         
-        # Analyze Python file for performance
-        success = file_ops.analyze_file(python_file, "llama-2-70B", "performance")
+        async def run(label, analysis):
+            return label, await analysis
         
-        if success:
-            print("\n✅ Performance analysis completed successfully!")
-        else:
-            print("\n❌ Performance analysis failed!")
-        
-        print("\n" + "=" * 50)
-        print("4. File Review with Improvements")
-        print("=" * 50)
-        print(f"Reviewing: {python_file}")
-        print()
-        
-        # Review and suggest improvements
-        success = file_ops.review_file(python_file, "llama-2-70B", auto_apply=False)
-        
-        if success:
-            print("\n✅ File review completed successfully!")
-        else:
-            print("\n❌ File review failed!")
+        # Report each analysis as it finishes under a live progress bar
+        async with api_client:
+            with Progress() as progress:
+                progress_task = progress.add_task("Analyzing", total=len(tasks))
+                for finished in asyncio.as_completed([run(label, analysis) for label, _, analysis in tasks]):
+                    label, success = await finished
+                    progress.advance(progress_task)
+                    if success:
+                        print(f"\n✅ {label} completed successfully!")
+                    else:
+                        print(f"\n❌ {label} failed!")
         
         print("\n" + "=" * 50)
         print("5. CLI Commands to Try")
@@ -212,15 +200,8 @@ def demonstrate_file_analysis():
         print(f"groq-agent")
         print(f"# Then in chat: /file load {python_file}")
         print(f"# Then ask: 'What are the main issues with this code?'")
-        
-    finally:
-        # Clean up temporary files
-        try:
-            os.unlink(python_file)
-            os.unlink(js_file)
-            print(f"\n🧹 Cleaned up temporary files")
-        except OSError:
-            pass
+    
+    print(f"\n🧹 Cleaned up temporary files")
     
     print("\n=== Demo completed ===")
     print("\nKey Features Demonstrated:")
@@ -228,11 +209,11 @@ def demonstrate_file_analysis():
     print("✅ File metadata extraction (size, lines, permissions)")
     print("✅ Multiple analysis types (comprehensive, security, performance)")
     print("✅ Context-aware AI responses")
-    print("✅ Interactive file review with diff")
+    print("✅ Text review of a file alongside other analysis types")
     print("✅ File context in chat sessions")
 
 
 if __name__ == "__main__":
-    demonstrate_file_analysis()
+    asyncio.run(demonstrate_file_analysis())
 
 
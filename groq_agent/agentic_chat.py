@@ -1,28 +1,672 @@
 """Advanced Agent Chat Interface with enhanced AI capabilities."""
 
 import sys
+import bisect
 import os
+import re
+import json
 import time
+import heapq
+import fnmatch
+from collections import deque
+from itertools import chain, islice
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Callable, Deque, FrozenSet, Iterable, List, Dict, Any, Optional, Tuple
 from prompt_toolkit import prompt
 from prompt_toolkit.completion import WordCompleter
 from prompt_toolkit.history import FileHistory
 from prompt_toolkit.styles import Style
 from prompt_toolkit.formatted_text import FormattedText
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.syntax import Syntax
 from rich.prompt import Prompt, Confirm
 from rich.text import Text
-from rich.table import Table
 from rich.status import Status
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .config import ConfigurationManager
 from .api_client import GroqAPIClient
 from .model_selector import ModelSelector
 from .file_operations import FileOperations
+from .text_patterns import CONTINUATION_RE
+
+
+# File types picked up by the workspace scan
+SCAN_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css',
+    '.json', '.yaml', '.yml', '.md', '.txt', '.sh', '.java',
+    '.cpp', '.c', '.go', '.rs', '.php', '.rb', '.sql'
+})
+
+# Directories the workspace scan never descends into
+SCAN_IGNORE_DIRS = frozenset({
+    '.git', '__pycache__', 'node_modules', '.venv', 'venv',
+    '.mypy_cache', '.pytest_cache', 'dist', 'build'
+})
+
+# Upper bound on threads walking top-level directories during the scan
+SCAN_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+SEARCH_RESULT_LIMIT = 10
+# Characters that make a /search query a glob pattern
+GLOB_CHARS = frozenset('*?[')
+
+# Files passed to the model as context for a request
+RELEVANT_FILES_LIMIT = 3
+
+RELEVANT_FILES_CACHE_SIZE = 128
+
+FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Rows per table when listing accessible files
+FILE_LIST_CHUNK_SIZE = 500
+
+# Operations kept for building context; older ones are dropped
+OPERATION_HISTORY_LIMIT = 100
+
+# Project summaries list more files than this as plain text instead of a table
+SUMMARY_TABLE_MAX_ROWS = 32
+
+# Marker files identifying the project type, checked in order
+PROJECT_MARKERS = (
+    ('package.json', 'nodejs'),
+    ('requirements.txt', 'python'),
+    ('Cargo.toml', 'rust')
+)
+
+SOURCE_EXTENSIONS = frozenset({'.py', '.js', '.ts', '.java', '.cpp', '.go'})
+
+# /read shows at most this much of a file; highlighting time grows with the
+# size of the buffer, so larger files are cut at a line boundary
+MAX_READ_BYTES = 256 * 1024
+
+# Optional "<start>-<end>" line window after the /read file name
+READ_LINE_RANGE_RE = re.compile(r'(.+?)\s+(\d+)-(\d+)')
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Larger files are not previewed when reviewing changes
+MAX_PREVIEW_BYTES = 1 << 20
+
+LANGUAGE_MAP = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.html': 'html',
+    '.css': 'css',
+    '.json': 'json',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.md': 'markdown'
+}
+
+
+@lru_cache(maxsize=64)
+def _language_for_extension(ext: str) -> str:
+    """Map a lowercase file extension to a syntax highlighting language."""
+    return LANGUAGE_MAP.get(ext, 'text')
+
+
+@lru_cache(maxsize=256)
+def _count_lines(path: str, mtime_ns: int, size: int) -> int:
+    """Count the lines of a file over binary chunks instead of decoding it.
+    
+    The mtime and size are part of the cache key, so an edited file is
+    counted again while repeated analyses of an unchanged one are free.
+    """
+    newlines = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            newlines += chunk.count(b'\n')
+    return newlines + 1
+
+
+def _skip_lines(f: Any, count: int) -> None:
+    """Advance a binary file past count lines without reading a whole line at once."""
+    while count:
+        chunk = f.readline(READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        if chunk.endswith(b'\n'):
+            count -= 1
+
+
+# The instructions never change, so they lead every request as one shared
+# system message and only the context and request are formatted per turn
+AGENT_SYSTEM_MESSAGE = {"role": "system", "content": """You are an advanced AI assistant with access to powerful tools. You can:
+- Search and analyze codebases
+- Read and edit files with diff previews
+- Understand project structure and context
+- Provide intelligent code suggestions
+
+Please respond intelligently to the user's request, using your tools when appropriate."""}
+
+AGENT_PROMPT_TEMPLATE = """Advanced Agent Context:
+{context}
+
+User Request: {user_input}"""
+
+
+@lru_cache(maxsize=8)
+def _format_workspace_summary(workspace: str, project_type: str, file_count: int) -> str:
+    """Build the workspace lines of the agent prompt context."""
+    return f"Workspace: {workspace}\nProject Type: {project_type}\nFiles: {file_count} accessible"
+
+
+WORD_RE = re.compile(r"\w+")
+
+# Content words that point at an existing website project
+CONTENT_KEYWORDS = frozenset({
+    'college', 'colleges', 'school', 'schools', 'university', 'universities',
+    'delhi', 'mumbai', 'bangalore'
+})
+
+
+# Request keywords and the categories they signal; a keyword may signal several
+REQUEST_KEYWORDS: Dict[str, FrozenSet[str]] = {}
+for _category, _keywords in (
+    ('create', ('create', 'make', 'build', 'generate', 'set up', 'initialize',
+                'website', 'app', 'project', 'structure', 'framework', 'new')),
+    ('modify', ('modify', 'change', 'update', 'edit', 'add', 'remove', 'fix', 'improve',
+                'enhance', 'adjust', 'alter', 'revise', 'amend')),
+    ('website', ('website', 'web', 'html', 'page')),
+    ('simple', ('simple', 'basic')),
+    ('app', ('app', 'application', 'react', 'vue', 'angular')),
+    ('script', ('python', 'script', 'tool')),
+    ('data', ('data', 'json', 'csv', 'xml')),
+    ('json', ('json',)),
+    ('csv', ('csv',)),
+    ('config', ('config', 'settings', 'configuration')),
+    ('component', ('task', 'button', 'page', 'component')),
+    ('task', ('task',)),
+    ('button', ('button',))
+):
+    for _keyword in _keywords:
+        REQUEST_KEYWORDS[_keyword] = REQUEST_KEYWORDS.get(_keyword, frozenset()) | {_category}
+del _category, _keywords, _keyword
+
+# A match also carries the categories of every keyword it starts with
+# ("application" contains "app"), which keeps substring semantics
+_REQUEST_KEYWORD_TAGS = {
+    keyword: frozenset().union(*(tags for other, tags in REQUEST_KEYWORDS.items() if keyword.startswith(other)))
+    for keyword in REQUEST_KEYWORDS
+}
+
+# The lookahead finds the longest keyword at every position, overlapping ones included
+REQUEST_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(REQUEST_KEYWORDS, key=len, reverse=True)) + "))"
+)
+
+
+@lru_cache(maxsize=128)
+def _classify_request(user_input: str) -> FrozenSet[str]:
+    """Find the request categories whose keywords occur in the input.
+    
+    Args:
+        user_input: Request text from the user
+        
+    Returns:
+        Categories such as 'create', 'modify' or 'website'
+    """
+    tags = set()
+    for match in REQUEST_KEYWORD_RE.finditer(user_input.lower()):
+        tags |= _REQUEST_KEYWORD_TAGS[match.group(1)]
+    return frozenset(tags)
+
+
+# JSON arrays in model responses, fenced in a code block or inline
+JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\[.*?\])\s*```', re.DOTALL)
+JSON_ARRAY_RE = re.compile(r'\[.*?\]', re.DOTALL)
+
+def _loads_json(text: str) -> Any:
+    """Parse JSON with orjson when it is installed, falling back to json."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _first_json_array(fragments: Iterable[str]) -> Tuple[Optional[list], str]:
+    """Read streamed text until the first complete top-level JSON array.
+    
+    Args:
+        fragments: Text fragments in arrival order
+        
+    Returns:
+        The parsed array, or None when the text ended without one, and the
+        text consumed so far
+    """
+    buffer: List[str] = []
+    captured: List[str] = []
+    depth = 0
+    in_string = False
+    escaped = False
+    for fragment in fragments:
+        buffer.append(fragment)
+        for char in fragment:
+            if depth:
+                captured.append(char)
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == '\\':
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = True
+                elif char == '[':
+                    depth += 1
+                elif char == ']':
+                    depth -= 1
+                    if not depth:
+                        try:
+                            parsed = _loads_json(''.join(captured))
+                        except ValueError:
+                            parsed = None
+                        if isinstance(parsed, list):
+                            return parsed, ''.join(buffer)
+                        captured = []
+            elif char == '[':
+                # Brackets in prose before the JSON are retried as new candidates
+                depth = 1
+                captured = [char]
+    return None, ''.join(buffer)
+
+
+# Header of the editor buffer used to describe several new files at once
+FILE_PROMPTS_TEMPLATE = (
+    "# Describe what each file should contain below its name.\n"
+    "# Files left empty are skipped. Other lines starting with '#' are ignored.\n"
+)
+
+
+def _parse_file_prompts(text: str, requested: List[str]) -> List[Dict[str, str]]:
+    """Split an edited FILE_PROMPTS_TEMPLATE buffer into file specifications.
+    
+    Args:
+        text: Buffer returned by the editor
+        requested: Paths whose "# <path>" lines start a description
+        
+    Returns:
+        File specifications in buffer order, skipping empty descriptions
+    """
+    wanted = set(requested)
+    prompts: Dict[str, List[str]] = {}
+    current = None
+    for line in text.splitlines():
+        if line.startswith('#'):
+            name = line[1:].strip()
+            if name in wanted:
+                current = prompts.setdefault(name, [])
+            continue
+        if current is not None:
+            current.append(line)
+    
+    file_specs = []
+    for file_path, lines in prompts.items():
+        prompt = "\n".join(lines).strip()
+        if prompt:
+            file_specs.append({'path': file_path, 'prompt': prompt})
+    return file_specs
+
+
+# Encoding used to count context tokens when tiktoken is installed
+TOKEN_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=1)
+def _token_encoder() -> Any:
+    """Load the tiktoken encoder once, or None if it is unavailable."""
+    # Imported here: tiktoken is only needed once a context grows large
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception:
+        # The encoding is downloaded on first use and may not be reachable
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    """Count the tokens of text with tiktoken, or estimate 4 characters per token."""
+    encoder = _token_encoder()
+    if encoder is None:
+        return len(text) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+# File name fragments that mark UI building blocks
+COMPONENT_NAME_KEYWORDS = ('task', 'button', 'page', 'component')
+
+# Files that can hold a button
+UI_FILE_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.html')
+
+KNOWN_CITIES = ('delhi', 'mumbai', 'bangalore', 'chennai', 'kolkata', 'hyderabad', 'pune', 'ahmedabad')
+
+LOCATION_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'in\s+([A-Za-z]+)',  # "in Delhi"
+    r'of\s+([A-Za-z]+)',  # "of Delhi"
+    r'([A-Za-z]+)\s+schools',  # "Delhi schools"
+    r'([A-Za-z]+)\s+colleges'  # "Delhi colleges"
+))
+
+
+@lru_cache(maxsize=32)
+def _words(text: str) -> FrozenSet[str]:
+    """Split text into its set of lowercase words."""
+    return frozenset(WORD_RE.findall(text.lower()))
+
+
+# Words in messages, tasks and operations that carry context worth preserving
+ESSENTIAL_KEYWORDS = (
+    'website', 'html', 'web', 'delhi', 'location', 'city',
+    'school', 'college', 'university', 'institute', 'json'
+)
+
+# Lookahead so that overlapping keywords ("website" and "web") are all found
+ESSENTIAL_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(sorted(ESSENTIAL_KEYWORDS, key=len, reverse=True)) + "))"
+)
+
+WEBSITE_TAGS = frozenset({'website', 'html', 'web'})
+LOCATION_TAGS = frozenset({'delhi', 'location', 'city'})
+
+# Content types in order of precedence
+CONTENT_TYPE_TAGS = (
+    ('school', 'Schools'),
+    ('college', 'Colleges'),
+    ('university', 'Universities'),
+    ('institute', 'Institutes')
+)
+
+
+@lru_cache(maxsize=64)
+def _essential_tags(text: str) -> FrozenSet[str]:
+    """Find the essential-context keywords contained in lowercase text."""
+    return frozenset(ESSENTIAL_KEYWORD_RE.findall(text))
+
+
+def _extract_location(content: str) -> str:
+    """Extract location information from lowercase content."""
+    # Look for city names
+    for city in KNOWN_CITIES:
+        if city in content:
+            return city.title()
+    
+    # Look for location patterns
+    for pattern in LOCATION_PATTERNS:
+        match = pattern.search(content)
+        if match:
+            return match.group(1).title()
+    
+    return "Unknown"
+
+
+def _content_type_for_tags(tags: FrozenSet[str]) -> str:
+    """Pick the content type named by the essential-context keywords."""
+    for tag, content_type in CONTENT_TYPE_TAGS:
+        if tag in tags:
+            return content_type
+    return ""
+
+
+@lru_cache(maxsize=64)
+def _message_facts(content: str) -> Tuple[Tuple[str, ...], bool]:
+    """Extract the essential-context lines of one conversation message.
+    
+    The same recent messages are examined on every turn, so each distinct
+    message is analyzed once.
+    
+    Returns:
+        The context lines, and whether the message is about a website, which
+        ends the scan of older messages
+    """
+    content = content.lower()
+    # One pass over the message finds every keyword checked below
+    tags = _essential_tags(content)
+    
+    # Extract website/HTML context
+    if tags & WEBSITE_TAGS:
+        return ("PROJECT TYPE: Website/HTML project",), True
+    
+    facts = []
+    
+    # Extract location context (Delhi, etc.)
+    if tags & LOCATION_TAGS:
+        facts.append(f"LOCATION: {_extract_location(content)}")
+    
+    # Extract content type context (schools, colleges, etc.)
+    if tags & {'school', 'college', 'university'}:
+        content_type = _content_type_for_tags(tags)
+        if content_type:
+            facts.append(f"CONTENT TYPE: {content_type}")
+    
+    # Extract file type context
+    if 'json' in tags:
+        facts.append("FILE TYPE: JSON data structure")
+    
+    return tuple(facts), False
+
+
+# Conversation lines in the smart context are prefixed with the speaker
+CONTEXT_ROLE_PREFIXES = {'user': "USER: ", 'assistant': "ASSISTANT: ", 'system': "SYSTEM: "}
+
+# Closing section of every smart context, which never changes
+CONTEXT_INSTRUCTIONS = "\n".join((
+    "=== CONTEXT INSTRUCTIONS ===",
+    "IMPORTANT: Maintain continuity with previous conversation and tasks.",
+    "If the user refers to previous work (like 'change it to', 'make it', etc.),",
+    "refer to the conversation history and current task context above.",
+    "Do not lose track of what was previously created or modified.",
+    "When modifying existing files, preserve the current content and enhance it.",
+    "CRITICAL: Always preserve the ESSENTIAL CONTEXT above in all operations.",
+    "Do not remove or replace existing content unless explicitly requested.",
+    "=== END CONTEXT INSTRUCTIONS ==="
+))
+
+
+# Smart context sections whose layout is fixed; only the values change per turn
+SESSION_STATE_TEMPLATE = "\n".join((
+    "=== SESSION STATE ===",
+    "Total Operations: %d",
+    "Files Accessed: %d",
+    "Context Utilization: %.1f%%",
+    "Current Model: %s",
+    "=== END SESSION STATE ===\n"
+))
+
+USER_REQUEST_TEMPLATE = "\n".join((
+    "=== CURRENT USER REQUEST ===",
+    "User Input: %s",
+    "=== END CURRENT USER REQUEST ===\n"
+))
+
+# Sections kept when the context has to be trimmed, most important first
+CONTEXT_PRIORITY_SECTIONS = (
+    "=== ESSENTIAL CONTEXT (CRITICAL) ===",
+    "=== CONVERSATION HISTORY ===",
+    "=== CURRENT USER REQUEST ===",
+    "=== CURRENT TASK CONTEXT ===",
+    "=== CONTEXT INSTRUCTIONS ===",
+    "=== RECENT OPERATIONS ===",
+    "=== PROJECT CONTEXT ===",
+    "=== SESSION STATE ==="
+)
+
+
+@lru_cache(maxsize=256)
+def _clock_time(timestamp: float) -> str:
+    """Format a timestamp as local HH:MM:SS, once per distinct timestamp."""
+    return time.strftime('%H:%M:%S', time.localtime(timestamp))
+
+
+# Prompt styling and completions are the same for every session, so they are
+# built once at import instead of per instance
+PROMPT_STYLE = Style.from_dict({
+    'prompt': 'bold ansicyan',
+    'toolbar': 'reverse ansimagenta'
+})
+BOTTOM_TOOLBAR = FormattedText([
+    ('class:toolbar', ' GitHub: TM NABEEL @tmnabeel30 created | Type /help for tools ')
+])
+COMPLETION_COMMANDS = (
+    '/help', '/model', '/exit', '/clear', '/history', '/status', '/tools',
+    '/search', '/read', '/edit', '/create', '/delete', '/analyze', '/debug',
+    '/context', '/undo', '/redo', '/plan', '/execute', '/qna', '/agent', '/mode',
+    '/fast', '/balanced', '/powerful', '/ultra', '/mixtral', '/gemma',
+    '/compound', '/compound-mini', '/next', '/prev', '/shortcuts',
+    '/files', '/scan', '/workspace'
+)
+
+MODEL_SHORTCUT_COMMANDS = frozenset({
+    '/fast', '/balanced', '/powerful', '/ultra', '/mixtral', '/gemma', '/compound', '/compound-mini'
+})
+
+# Welcome panels that never change are built once
+WELCOME_HEADER_PANEL = Panel(
+    Text("🚀 CodeFlow Advanced Agent", style="bold blue", justify="center"),
+    subtitle="GitHub: TM NABEEL @tmnabeel30 created",
+    subtitle_align="right",
+    border_style="blue",
+    padding=(1, 2)
+)
+
+CAPABILITIES_PANEL = Panel(
+    """
+[bold]🤖 Advanced AI Capabilities:[/bold]
+• Semantic codebase search
+• Intelligent file operations
+• Code analysis and debugging
+• Context-aware responses
+• Tool execution tracking
+    """.strip(),
+    title="🛠️ Advanced Tools",
+    border_style="yellow",
+    padding=(1, 2)
+)
+
+
+@lru_cache(maxsize=4)
+def _build_workspace_panel(workspace: str, project_type: str, file_count: int, model: str) -> Panel:
+    """Build the welcome panel describing the current workspace."""
+    workspace_info = f"""
+[bold]Workspace:[/bold] {workspace}
+[bold]Project Type:[/bold] {project_type}
+[bold]Files:[/bold] {file_count} accessible
+[bold]Current Model:[/bold] {model}
+    """.strip()
+    
+    return Panel(
+        workspace_info,
+        title="📁 Workspace Information",
+        border_style="green",
+        padding=(1, 2)
+    )
+
+
+# Words that ask for a change on their own. Inflected forms are listed so
+# "adding" or "updates" count, and the closing \b keeps "appreciate" or
+# "address" from matching
+MODIFICATION_RE = re.compile(
+    r"\b(?:add(?:s|ed|ing)?|creat(?:e|es|ed|ing)|modif(?:y|ies|ied|ying)"
+    r"|chang(?:e|es|ed|ing)|updat(?:e|es|ed|ing)|edit(?:s|ed|ing)?|fix(?:es|ed|ing)?"
+    r"|implement(?:s|ed|ing)?|mak(?:e|es|ing)|made|build(?:s|ing)?|built"
+    r"|generat(?:e|es|ed|ing)|buttons?|functions?|components?|pages?|files?|code"
+    r"|features?|websites?|apps?)\b",
+    re.IGNORECASE
+)
+
+# Pronouns and theme/style words that refer back to existing files
+CONTEXT_REFERENCE_RE = re.compile(
+    r"\b(?:it|this|that|the|these|those"
+    r"|red|black|blue|green|themes?|colou?rs?|styles?|css)\b",
+    re.IGNORECASE
+)
+
+
+
+def _walk_subtree(top: str, subdir: str) -> Tuple[List[str], Dict[str, int]]:
+    """Walk one top-level directory of the workspace.
+    
+    Ignored directories are pruned before they are descended into, and hidden
+    files and directories are skipped.
+    
+    Args:
+        top: Workspace root
+        subdir: Name of the directory under the root to walk
+        
+    Returns:
+        Workspace-relative paths of the files found, and the mtime of every
+        directory visited keyed by its absolute path
+    """
+    files_found = []
+    scanned_dirs = {}
+    for root, dirs, files in os.walk(os.path.join(top, subdir)):
+        try:
+            scanned_dirs[root] = os.stat(root).st_mtime_ns
+        except OSError:
+            continue
+        dirs[:] = [d for d in dirs if d not in SCAN_IGNORE_DIRS and d[0] != '.']
+        # Files are stored relative to the workspace to keep paths short
+        prefix = os.path.join(os.path.relpath(root, top), '')
+        files_found.extend(
+            prefix + file_name for file_name in files
+            if file_name[0] != '.' and os.path.splitext(file_name)[1] in SCAN_EXTENSIONS
+        )
+    return files_found, scanned_dirs
+
+
+def _dir_mtime_ns(path: str) -> Optional[int]:
+    """Return the mtime of a directory in nanoseconds, or None if it is gone."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _unchanged_subtrees(top: str, files: List[str],
+                        scanned_dirs: Dict[str, int]) -> Dict[str, Tuple[List[str], Dict[str, int]]]:
+    """Split a cached scan into the top-level subtrees whose directories are unchanged.
+    
+    Args:
+        top: Workspace root
+        files: Workspace-relative file paths from the cached scan
+        scanned_dirs: Directory mtimes from the cached scan keyed by absolute path
+        
+    Returns:
+        Files and directory mtimes of every unchanged subtree, keyed by the
+        name of its top-level directory
+    """
+    subtrees: Dict[str, Tuple[List[str], Dict[str, int]]] = {}
+    changed = set()
+    for directory, mtime_ns in scanned_dirs.items():
+        relative = os.path.relpath(directory, top)
+        if relative == '.':
+            continue
+        subdir = relative.split(os.sep, 1)[0]
+        if _dir_mtime_ns(directory) != mtime_ns:
+            changed.add(subdir)
+        elif subdir not in changed:
+            subtrees.setdefault(subdir, ([], {}))[1][directory] = mtime_ns
+    for subdir in changed:
+        subtrees.pop(subdir, None)
+    
+    for file_path in files:
+        subdir, sep, _ = file_path.partition(os.sep)
+        if sep and subdir in subtrees:
+            subtrees[subdir][0].append(file_path)
+    return subtrees
 
 
 class AgenticChat:
@@ -32,23 +676,49 @@ class AgenticChat:
         """Initialize the agentic chat interface."""
         self.config = config
         self.api_client = api_client
-        self.model_selector = ModelSelector(api_client)
-        self.file_ops = FileOperations(api_client)
-        self.console = Console()
+        # One console for the session; auto-highlighting is off because status
+        # lines carry their own markup and don't need numbers or paths restyled
+        self.console = Console(highlight=False)
+        self.model_selector = ModelSelector(api_client, console=self.console)
+        self.file_ops = FileOperations(api_client, console=self.console)
         
         # Chat state
         self.current_model = config.get_default_model()
-        self.messages: List[Dict[str, str]] = []
         self.max_history = config.get_max_history()
+        # Bounded history: appending past max_history drops the oldest message
+        self.messages: Deque[Dict[str, str]] = deque(maxlen=self.max_history or None)
         
         # Agentic state
         self.workspace_path = Path.cwd()
+        # The workspace as a plain string, for os.path calls and messages
+        self._workspace_root = os.fspath(self.workspace_path)
         self.accessible_files: set = set()
+        self.workspace_cache_file = config.config_dir / "workspace_cache.json"
+        self._scanned_dirs: Dict[str, int] = {}
+        # Unchanged top-level subtrees of an outdated cached scan
+        self._stale_subtrees: Optional[Dict[str, Tuple[List[str], Dict[str, int]]]] = None
+        self._by_basename: Dict[str, List[str]] = {}
+        # Case-folded base name of every accessible file, kept alongside the set
+        self._names_folded: Dict[str, str] = {}
+        # Accessible files in sorted order, for listings
+        self._sorted_files: List[str] = []
+        # Accessible files grouped by lowercase extension
+        self._files_by_ext: Dict[str, List[str]] = {}
+        # File sizes already looked up for /files, dropped when a file changes
+        self._file_sizes: Dict[str, int] = {}
+        # Bumped whenever accessible_files changes so derived caches can be dropped
+        self._files_version = 0
+        self._relevant_files_cache: Dict[str, List[str]] = {}
+        self._relevant_files_version = 0
+        self._required_files_cache: Dict[Tuple[str, str, str], List[Dict[str, str]]] = {}
         self.recent_changes: List[Dict[str, Any]] = []
         self.tool_calls: List[Dict[str, Any]] = []
         
         # Context Optimization - Full 64k context utilization
-        self.operation_history: List[Dict[str, Any]] = []
+        self.operation_history: Deque[Dict[str, Any]] = deque(maxlen=OPERATION_HISTORY_LIMIT)
+        # Character size of each operation in operation_history, and their total
+        self._operation_sizes: Deque[int] = deque(maxlen=OPERATION_HISTORY_LIMIT)
+        self._history_char_count = 0
         self.task_context: Dict[str, Any] = {}
         self.session_state: Dict[str, Any] = {}
         self.context_buffer: List[Dict[str, Any]] = []
@@ -59,20 +729,15 @@ class AgenticChat:
         # Input styling and history
         history_file = config.config_dir / "agentic_chat_history.txt"
         self.history = FileHistory(str(history_file))
-        self.prompt_style = Style.from_dict({
-            'prompt': 'bold ansicyan',
-            'toolbar': 'reverse ansimagenta'
-        })
+        self.prompt_style = PROMPT_STYLE
+        self._bottom_toolbar = BOTTOM_TOOLBAR
+        self._prompt_tokens: Optional[FormattedText] = None
+        self._prompt_model: Optional[str] = None
         
         # Enhanced command completions
-        self.command_completer = WordCompleter([
-            '/help', '/model', '/exit', '/clear', '/history', '/status', '/tools',
-            '/search', '/read', '/edit', '/create', '/delete', '/analyze', '/debug',
-            '/context', '/undo', '/redo', '/plan', '/execute', '/qna', '/agent', '/mode',
-            '/fast', '/balanced', '/powerful', '/ultra', '/mixtral', '/gemma',
-            '/compound', '/compound-mini', '/next', '/prev', '/shortcuts',
-            '/files', '/scan', '/workspace'
-        ])
+        self.command_completer = WordCompleter(list(COMPLETION_COMMANDS))
+        
+        self._command_handlers = self._build_command_handlers()
         
         # Initialize workspace
         self._initialize_workspace()
@@ -83,57 +748,204 @@ class AgenticChat:
     def _initialize_workspace(self) -> None:
         """Initialize the workspace with comprehensive scanning."""
         with Status("[bold green]🔍 Initializing Agentic Workspace...", console=self.console):
-            self._scan_workspace()
+            if self._load_workspace_cache():
+                self.console.print(f"[green]✓ Found {len(self.accessible_files)} accessible files (cached)[/green]")
+                return
+            self._scan_workspace(self._stale_subtrees)
+            self._stale_subtrees = None
             self._analyze_project_structure()
+            self._save_workspace_cache()
     
-    def _scan_workspace(self) -> None:
-        """Scan workspace for accessible files."""
-        import glob
+    def _load_workspace_cache(self) -> bool:
+        """Load the previous scan if no directory in the workspace has changed.
         
-        files = set()
-        extensions = {
-            '*.py', '*.js', '*.ts', '*.jsx', '*.tsx', '*.html', '*.css',
-            '*.json', '*.yaml', '*.yml', '*.md', '*.txt', '*.sh', '*.java',
-            '*.cpp', '*.c', '*.go', '*.rs', '*.php', '*.rb', '*.sql'
-        }
+        Adding, removing or renaming a file updates the mtime of its parent
+        directory, so comparing directory mtimes is enough to trust the cached
+        file list without listing every directory again. When some directory
+        has changed, the top-level subtrees that have not are kept in
+        _stale_subtrees so the rescan can skip them.
+        
+        Returns:
+            True if the cached scan was loaded, False otherwise
+        """
+        try:
+            with open(self.workspace_cache_file, 'r') as f:
+                cache = json.load(f)
+            if cache["workspace"] != self._workspace_root:
+                return False
+            scanned_dirs = cache["dirs"]
+            cached_files = cache["accessible_files"]
+            project_structure = cache["project_structure"]
+            for directory, mtime_ns in scanned_dirs.items():
+                if _dir_mtime_ns(directory) != mtime_ns:
+                    self._stale_subtrees = _unchanged_subtrees(
+                        self._workspace_root, cached_files, scanned_dirs
+                    )
+                    return False
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return False
         
-        for ext in extensions:
-            files.update(glob.glob(str(self.workspace_path / "**" / ext), recursive=True))
+        self.accessible_files = set(cached_files)
+        self.project_structure = project_structure
+        self._scanned_dirs = scanned_dirs
+        self._index_files()
+        return True
+    
+    def _save_workspace_cache(self) -> None:
+        """Store the current scan so the next session can skip the walk."""
+        cache = {
+            "workspace": self._workspace_root,
+            "dirs": self._scanned_dirs,
+            "accessible_files": self._sorted_files,
+            "project_structure": self.project_structure
+        }
+        try:
+            with open(self.workspace_cache_file, 'w') as f:
+                json.dump(cache, f)
+        except OSError:
+            pass
+    
+    def _scan_workspace(self, reuse: Optional[Dict[str, Tuple[List[str], Dict[str, int]]]] = None) -> None:
+        """Scan workspace for accessible files.
         
-        # Filter out common directories
-        ignore_dirs = {'.git', '__pycache__', 'node_modules', '.venv', 'venv'}
+        Args:
+            reuse: Files and directory mtimes of top-level subtrees known to be
+                unchanged since an earlier scan, keyed by directory name
+        """
+        # The top level is listed here and every subdirectory is walked on its
+        # own thread; listing directories is I/O-bound, so the walks overlap.
+        top = self._workspace_root
         filtered_files = set()
+        scanned_dirs = {}
+        subdirs = []
+        try:
+            scanned_dirs[top] = os.stat(top).st_mtime_ns
+            with os.scandir(top) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name[0] == '.':
+                        continue
+                    if entry.is_dir():
+                        # Like os.walk, symlinked directories are not followed
+                        if name not in SCAN_IGNORE_DIRS and not entry.is_symlink():
+                            subdirs.append(name)
+                    elif os.path.splitext(name)[1] in SCAN_EXTENSIONS:
+                        filtered_files.add(name)
+        except OSError:
+            pass
+        
+        if reuse:
+            walk = []
+            for subdir in subdirs:
+                if subdir in reuse:
+                    files, dirs = reuse[subdir]
+                    filtered_files.update(files)
+                    scanned_dirs.update(dirs)
+                else:
+                    walk.append(subdir)
+            subdirs = walk
         
-        for file_path in files:
-            path = Path(file_path)
-            if not any(ignore_dir in path.parts for ignore_dir in ignore_dirs):
-                filtered_files.add(str(path))
+        if subdirs:
+            workers = min(SCAN_MAX_WORKERS, len(subdirs))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for files, dirs in executor.map(lambda d: _walk_subtree(top, d), subdirs):
+                    filtered_files.update(files)
+                    scanned_dirs.update(dirs)
         
         self.accessible_files = filtered_files
+        self._scanned_dirs = scanned_dirs
+        self._index_files()
         self.console.print(f"[green]✓ Found {len(self.accessible_files)} accessible files[/green]")
     
+    def _index_files(self) -> None:
+        """Rebuild the basename and extension indices over accessible files."""
+        self._files_version += 1
+        self._by_basename = {}
+        self._names_folded = {}
+        self._files_by_ext = {}
+        self._file_sizes = {}
+        self._sorted_files = sorted(self.accessible_files)
+        for file_path in self._sorted_files:
+            file_name = os.path.basename(file_path)
+            self._by_basename.setdefault(file_name, []).append(file_path)
+            # Names like __init__.py or index.js repeat across directories; share one copy
+            self._names_folded[file_path] = sys.intern(file_name.casefold())
+            self._files_by_ext.setdefault(os.path.splitext(file_name)[1].lower(), []).append(file_path)
+    
+    def _add_accessible_file(self, file_path: str) -> None:
+        """Track a newly created file."""
+        file_path = self._relative_path(file_path)
+        self._file_sizes.pop(file_path, None)
+        if file_path not in self.accessible_files:
+            self._files_version += 1
+            self.accessible_files.add(file_path)
+            bisect.insort(self._sorted_files, file_path)
+            file_name = os.path.basename(file_path)
+            self._by_basename.setdefault(file_name, []).append(file_path)
+            self._names_folded[file_path] = sys.intern(file_name.casefold())
+            self._files_by_ext.setdefault(os.path.splitext(file_name)[1].lower(), []).append(file_path)
+    
+    def _remove_accessible_file(self, file_path: str) -> None:
+        """Stop tracking a deleted file."""
+        self._files_version += 1
+        if file_path in self.accessible_files:
+            self.accessible_files.remove(file_path)
+            del self._sorted_files[bisect.bisect_left(self._sorted_files, file_path)]
+        self._names_folded.pop(file_path, None)
+        self._file_sizes.pop(file_path, None)
+        matches = self._by_basename.get(os.path.basename(file_path))
+        if matches and file_path in matches:
+            matches.remove(file_path)
+        bucket = self._files_by_ext.get(os.path.splitext(file_path)[1].lower())
+        if bucket and file_path in bucket:
+            bucket.remove(file_path)
+    
+    def _absolute_path(self, file_path: str) -> str:
+        """Turn a workspace-relative file path into an absolute one."""
+        return os.path.join(self._workspace_root, file_path)
+    
+    def _relative_path(self, file_path: str) -> str:
+        """Turn a path typed by the user into the workspace-relative form files are tracked by.
+        
+        Absolute paths, "./" prefixes and ".." segments all map to the same key.
+        """
+        return os.path.relpath(os.path.join(self._workspace_root, file_path), self._workspace_root)
+    
+    def _resolve_file(self, query: str) -> Optional[str]:
+        """Find the accessible file a command argument refers to.
+        
+        Args:
+            query: File name or partial path given by the user
+            
+        Returns:
+            Matching file path, or None if no file matches
+        """
+        relative = self._relative_path(query)
+        if relative in self.accessible_files:
+            return relative
+        matches = self._by_basename.get(relative)
+        if matches:
+            return matches[0]
+        return next((f for f in self.accessible_files if relative in f), None)
+    
     def _analyze_project_structure(self) -> None:
         """Analyze project structure."""
         self.project_structure = {
             'type': 'unknown',
             'main_files': [],
-            'source_files': [],
             'config_files': []
         }
         
-        for file_path in self.accessible_files:
-            path = Path(file_path)
-            file_name = path.name.lower()
-            
-            if file_name == 'package.json':
-                self.project_structure['type'] = 'nodejs'
-            elif file_name == 'requirements.txt':
-                self.project_structure['type'] = 'python'
-            elif file_name == 'cargo.toml':
-                self.project_structure['type'] = 'rust'
-            
-            if path.suffix in ['.py', '.js', '.ts', '.java', '.cpp', '.go']:
-                self.project_structure['source_files'].append(str(path))
+        # The project type is decided by marker files at the workspace root
+        for marker, project_type in PROJECT_MARKERS:
+            if os.path.isfile(os.path.join(self._workspace_root, marker)):
+                self.project_structure['type'] = project_type
+                break
+    
+    @property
+    def source_files(self) -> List[str]:
+        """Accessible files containing source code."""
+        return [f for f in self.accessible_files if os.path.splitext(f)[1] in SOURCE_EXTENSIONS]
     
     def start(self) -> Optional[str]:
         """Start the agentic chat session."""
@@ -176,148 +988,126 @@ class AgenticChat:
     
     def _show_agentic_welcome(self) -> None:
         """Display advanced agent welcome message."""
-        header_title = "🚀 CodeFlow Advanced Agent"
-        header = Panel(
-            Text(header_title, style="bold blue", justify="center"),
-            subtitle="GitHub: TM NABEEL @tmnabeel30 created",
-            subtitle_align="right",
-            border_style="blue",
-            padding=(1, 2)
-        )
-        
-        workspace_info = f"""
-[bold]Workspace:[/bold] {self.workspace_path}
-[bold]Project Type:[/bold] {self.project_structure['type']}
-[bold]Files:[/bold] {len(self.accessible_files)} accessible
-[bold]Current Model:[/bold] {self.current_model or 'Not set'}
-        """.strip()
-        
-        workspace_panel = Panel(
-            workspace_info,
-            title="📁 Workspace Information",
-            border_style="green",
-            padding=(1, 2)
-        )
-        
-        capabilities_info = """
-[bold]🤖 Advanced AI Capabilities:[/bold]
-• Semantic codebase search
-• Intelligent file operations
-• Code analysis and debugging
-• Context-aware responses
-• Tool execution tracking
-        """.strip()
-        
-        capabilities_panel = Panel(
-            capabilities_info,
-            title="🛠️ Advanced Tools",
-            border_style="yellow",
-            padding=(1, 2)
+        workspace_panel = _build_workspace_panel(
+            self._workspace_root,
+            self.project_structure['type'],
+            len(self.accessible_files),
+            self.current_model or 'Not set'
         )
         
-        self.console.print(header)
+        self.console.print(WELCOME_HEADER_PANEL)
         self.console.print()
         self.console.print(workspace_panel)
-        self.console.print(capabilities_panel)
+        self.console.print(CAPABILITIES_PANEL)
         self.console.print()
     
     def _get_agentic_user_input(self) -> str:
         """Get user input with advanced agent prompt styling."""
-        prompt_tokens = FormattedText([
-            ('class:prompt', f"Advanced ({self.current_model}): ")
-        ])
-
-        bottom_toolbar = FormattedText([
-            ('class:toolbar', ' GitHub: TM NABEEL @tmnabeel30 created | Type /help for tools ')
-        ])
+        # The prompt only changes when the model does
+        if self._prompt_model != self.current_model:
+            self._prompt_tokens = FormattedText([
+                ('class:prompt', f"Advanced ({self.current_model}): ")
+            ])
+            self._prompt_model = self.current_model
 
         return prompt(
-            prompt_tokens,
+            self._prompt_tokens,
             history=self.history,
             completer=self.command_completer,
             multiline=False,
             style=self.prompt_style,
-            bottom_toolbar=bottom_toolbar
+            bottom_toolbar=self._bottom_toolbar
         )
     
+    def _build_command_handlers(self) -> Dict[str, Callable[[str], Optional[bool]]]:
+        """Map slash commands to handlers taking the command arguments.
+        
+        A handler returning True ends the chat session.
+        """
+        return {
+            '/help': lambda args: self._show_agentic_help(),
+            '/model': lambda args: self._change_model(),
+            '/shortcuts': lambda args: self.model_selector.show_quick_shortcuts(),
+            '/next': lambda args: self._switch_to_next_model(),
+            '/prev': lambda args: self._switch_to_previous_model(),
+            '/files': lambda args: self._list_accessible_files(),
+            '/scan': lambda args: self._rescan_workspace(),
+            '/workspace': lambda args: self._show_workspace_info(),
+            '/search': self._handle_search,
+            '/read': self._handle_read,
+            '/edit': self._handle_edit,
+            '/create': self._handle_create,
+            '/delete': self._handle_delete,
+            '/analyze': self._handle_analyze,
+            '/status': lambda args: self._show_status(),
+            '/tools': lambda args: self._show_tools(),
+            '/context': lambda args: self._show_context_status(),
+            '/history': lambda args: self._show_history(),
+            # Mode switching
+            '/qna': lambda args: self._request_mode_switch('qna'),
+            '/agent': lambda args: self._request_mode_switch('agent'),
+            '/mode': self._handle_mode_command,
+            '/clear': lambda args: self._clear_history(),
+            '/exit': lambda args: True
+        }
+    
     def _handle_agentic_command(self, command: str) -> bool:
         """Handle advanced agent slash commands."""
         parts = command.split(' ', 1)
         cmd = parts[0].lower()
         args = parts[1] if len(parts) > 1 else ""
         
-        if cmd == '/help':
-            self._show_agentic_help()
-        elif cmd == '/model':
-            self._change_model()
-        elif cmd == '/shortcuts':
-            self.model_selector.show_quick_shortcuts()
-        elif cmd in ['/fast', '/balanced', '/powerful', '/ultra', '/mixtral', '/gemma', '/compound', '/compound-mini']:
+        handler = self._command_handlers.get(cmd)
+        if handler:
+            return bool(handler(args))
+        
+        if cmd in MODEL_SHORTCUT_COMMANDS:
             shortcut = cmd[1:]  # Remove the leading '/'
             new_model = self.model_selector.quick_switch_model(shortcut)
             if new_model:
                 self.current_model = new_model
                 self.config.set_default_model(new_model)
                 self.console.print(f"[green]Switched to model: {new_model}[/green]")
-        elif cmd == '/next':
-            next_model = self.model_selector.get_next_model(self.current_model)
-            if next_model:
-                self.current_model = next_model
-                self.config.set_default_model(next_model)
-                self.console.print(f"[green]Switched to next model: {next_model}[/green]")
-            else:
-                self.console.print("[red]Could not switch to next model[/red]")
-        elif cmd == '/prev':
-            prev_model = self.model_selector.get_previous_model(self.current_model)
-            if prev_model:
-                self.current_model = prev_model
-                self.config.set_default_model(prev_model)
-                self.console.print(f"[green]Switched to previous model: {prev_model}[/green]")
-            else:
-                self.console.print("[red]Could not switch to previous model[/red]")
-        elif cmd == '/files':
-            self._list_accessible_files()
-        elif cmd == '/scan':
-            self._rescan_workspace()
-        elif cmd == '/workspace':
-            self._show_workspace_info()
-        elif cmd == '/search':
-            self._handle_search(args)
-        elif cmd == '/read':
-            self._handle_read(args)
-        elif cmd == '/edit':
-            self._handle_edit(args)
-        elif cmd == '/create':
-            self._handle_create(args)
-        elif cmd == '/delete':
-            self._handle_delete(args)
-        elif cmd == '/analyze':
-            self._handle_analyze(args)
-        elif cmd == '/status':
-            self._show_status()
-        elif cmd == '/tools':
-            self._show_tools()
-        elif cmd == '/context':
-            self._show_context_status()  # Updated to show context optimization status
-        elif cmd == '/history':
-            self._show_history()
-        # Mode switching
-        elif cmd == '/qna' or (cmd == '/mode' and args.strip().lower() == 'qna'):
-            self._switch_to_mode = 'qna'
-            return True
-        elif cmd == '/agent' or (cmd == '/mode' and args.strip().lower() == 'agent'):
-            self._switch_to_mode = 'agent'
-            return True
-        elif cmd == '/clear':
-            self._clear_history()
-        elif cmd == '/exit':
-            return True
         else:
             self.console.print(f"[red]Unknown command: {cmd}[/red]")
             self.console.print("Type /help for available commands")
         
         return False
     
+    def _switch_to_next_model(self) -> None:
+        """Switch to the next model in the rotation."""
+        next_model = self.model_selector.get_next_model(self.current_model)
+        if next_model:
+            self.current_model = next_model
+            self.config.set_default_model(next_model)
+            self.console.print(f"[green]Switched to next model: {next_model}[/green]")
+        else:
+            self.console.print("[red]Could not switch to next model[/red]")
+    
+    def _switch_to_previous_model(self) -> None:
+        """Switch to the previous model in the rotation."""
+        prev_model = self.model_selector.get_previous_model(self.current_model)
+        if prev_model:
+            self.current_model = prev_model
+            self.config.set_default_model(prev_model)
+            self.console.print(f"[green]Switched to previous model: {prev_model}[/green]")
+        else:
+            self.console.print("[red]Could not switch to previous model[/red]")
+    
+    def _request_mode_switch(self, mode: str) -> bool:
+        """Leave the session and ask the caller to start another mode."""
+        self._switch_to_mode = mode
+        return True
+    
+    def _handle_mode_command(self, args: str) -> bool:
+        """Handle /mode <qna|agent>."""
+        mode = args.strip().lower()
+        if mode in ('qna', 'agent'):
+            return self._request_mode_switch(mode)
+        self.console.print("[red]Unknown command: /mode[/red]")
+        self.console.print("Type /help for available commands")
+        return False
+    
     def _handle_search(self, query: str) -> None:
         """Handle search command."""
         if not query:
@@ -325,20 +1115,33 @@ class AgenticChat:
             return
         
         with Status("[bold green]🔍 Searching codebase...", console=self.console):
-            results = []
-            query_lower = query.lower()
+            query_folded = query.casefold()
+            # Glob queries such as *.py or test_?.js match whole file names
+            if any(char in query for char in GLOB_CHARS):
+                find = re.compile(fnmatch.translate(query_folded)).match
+            else:
+                find = None
             
-            for file_path in self.accessible_files:
-                path = Path(file_path)
-                if query_lower in path.name.lower():
-                    results.append({
-                        'file': file_path,
-                        'match_type': 'filename',
-                        'relevance': 0.8
-                    })
+            # Keep only the best SEARCH_RESULT_LIMIT matches in a min-heap;
+            # matches nearer the start of the file name rank higher
+            heap = []
+            for file_path, name in self._names_folded.items():
+                if find is not None:
+                    position = 0 if find(name) else -1
+                else:
+                    position = name.find(query_folded)
+                if position < 0:
+                    continue
+                entry = (1.0 - position / len(name), file_path)
+                if len(heap) < SEARCH_RESULT_LIMIT:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
             
-            # Limit results
-            results = results[:10]
+            results = [
+                {'file': file_path, 'match_type': 'filename', 'relevance': score}
+                for score, file_path in sorted(heap, reverse=True)
+            ]
         
         if results:
             self._display_search_results(results)
@@ -347,6 +1150,8 @@ class AgenticChat:
     
     def _display_search_results(self, results: List[Dict[str, Any]]) -> None:
         """Display search results."""
+        from rich.table import Table
+        
         table = Table(title="🔍 Search Results", show_header=True, header_style="bold magenta")
         table.add_column("#", style="dim", width=4)
         table.add_column("File", style="cyan")
@@ -354,7 +1159,7 @@ class AgenticChat:
         table.add_column("Relevance", style="yellow")
         
         for i, result in enumerate(results, 1):
-            file_path = Path(result['file']).name
+            file_path = os.path.basename(result['file'])
             match_type = result['match_type']
             relevance = f"{result['relevance']:.2f}"
             
@@ -364,55 +1169,85 @@ class AgenticChat:
     
     def _handle_read(self, file_path: str) -> None:
         """Handle read command."""
+        from rich.syntax import Syntax
+        
         if not file_path:
             self.console.print("[red]Please specify a file path[/red]")
             return
         
-        # Find the file
-        target_file = None
-        for accessible_file in self.accessible_files:
-            if file_path in accessible_file or Path(accessible_file).name == file_path:
-                target_file = accessible_file
-                break
+        line_range = None
+        match = READ_LINE_RANGE_RE.fullmatch(file_path.strip())
+        if match:
+            file_path = match.group(1)
+            line_range = (max(int(match.group(2)), 1), int(match.group(3)))
+            if line_range[1] < line_range[0]:
+                self.console.print(f"[red]Invalid line range: {match.group(2)}-{match.group(3)}[/red]")
+                return
         
+        target_file = self._resolve_file(file_path)
         if not target_file:
             self.console.print(f"[red]File not found: {file_path}[/red]")
             return
         
         try:
-            with open(target_file, 'r') as f:
-                content = f.read()
+            if line_range:
+                start_line, end_line = line_range
+                with open(self._absolute_path(target_file), 'rb') as f:
+                    _skip_lines(f, start_line - 1)
+                    # Stop collecting once the byte budget is spent; a line is
+                    # read at most up to the budget, so minified files stay bounded
+                    lines = []
+                    remaining = MAX_READ_BYTES
+                    truncated = False
+                    for _ in range(end_line - start_line + 1):
+                        line = f.readline(remaining + 1)
+                        if not line:
+                            break
+                        if len(line) > remaining:
+                            lines.append(line[:remaining])
+                            truncated = True
+                            break
+                        lines.append(line)
+                        remaining -= len(line)
+                if not lines:
+                    self.console.print(f"[yellow]{target_file} has no lines in {start_line}-{end_line}[/yellow]")
+                    return
+                content = b''.join(lines).decode('utf-8', errors='replace')
+            else:
+                start_line = 1
+                with open(self._absolute_path(target_file), 'rb') as f:
+                    raw = f.read(MAX_READ_BYTES)
+                    truncated = bool(f.read(1))
+                if truncated:
+                    # Don't show a partial last line
+                    cut = raw.rfind(b'\n')
+                    if cut > 0:
+                        raw = raw[:cut + 1]
+                content = raw.decode('utf-8', errors='replace')
             
             language = self._detect_language(target_file)
-            syntax = Syntax(content, language, theme="monokai", line_numbers=True)
+            syntax = Syntax(content, language, theme="monokai", line_numbers=True, start_line=start_line)
             
             panel = Panel(
                 syntax,
-                title=f"📄 {Path(target_file).name}",
+                title=f"📄 {os.path.basename(target_file)}",
                 border_style="green",
                 padding=(1, 2)
             )
             
             self.console.print(panel)
+            if truncated:
+                self.console.print(
+                    f"[yellow]Output truncated at {self._format_file_size(MAX_READ_BYTES)}. "
+                    f"Use /read <file> <start>-<end> to view other lines.[/yellow]"
+                )
             
         except Exception as e:
             self.console.print(f"[red]Error reading file: {e}[/red]")
     
     def _detect_language(self, file_path: str) -> str:
         """Detect programming language."""
-        ext = Path(file_path).suffix.lower()
-        language_map = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.html': 'html',
-            '.css': 'css',
-            '.json': 'json',
-            '.yaml': 'yaml',
-            '.yml': 'yaml',
-            '.md': 'markdown'
-        }
-        return language_map.get(ext, 'text')
+        return _language_for_extension(os.path.splitext(file_path)[1].lower())
     
     def _handle_edit(self, file_paths: str) -> None:
         """Handle edit command for one or more files with diff preview."""
@@ -423,11 +1258,7 @@ class AgenticChat:
         requested = file_paths.split()
         targets: List[str] = []
         for req in requested:
-            target = None
-            for accessible_file in self.accessible_files:
-                if req in accessible_file or Path(accessible_file).name == req:
-                    target = accessible_file
-                    break
+            target = self._resolve_file(req)
             if target:
                 targets.append(target)
             else:
@@ -449,13 +1280,16 @@ class AgenticChat:
             auto_apply=False,
         )
 
+        # Files reviewed together share one timestamp
+        batch_time = time.time()
         for target_file, success in results.items():
             if success:
                 self.console.print(f"[green]✓ File edited successfully: {target_file}[/green]")
+                self._file_sizes.pop(target_file, None)
                 self.recent_changes.append(
                     {
                         "file": target_file,
-                        "timestamp": time.time(),
+                        "timestamp": batch_time,
                         "action": "edited",
                     }
                 )
@@ -468,25 +1302,19 @@ class AgenticChat:
             self.console.print("[red]Please specify a file path[/red]")
             return
         
-        # Find the file
-        target_file = None
-        for accessible_file in self.accessible_files:
-            if file_path in accessible_file or Path(accessible_file).name == file_path:
-                target_file = accessible_file
-                break
-        
+        target_file = self._resolve_file(file_path)
         if not target_file:
             self.console.print(f"[red]File not found: {file_path}[/red]")
             return
         
         try:
-            with open(target_file, 'r') as f:
-                content = f.read()
+            absolute_path = self._absolute_path(target_file)
+            stat = os.stat(absolute_path)
             
             analysis = {
                 'file': target_file,
-                'size': len(content),
-                'lines': content.count('\n') + 1,
+                'size': stat.st_size,
+                'lines': _count_lines(absolute_path, stat.st_mtime_ns, stat.st_size),
                 'language': self._detect_language(target_file)
             }
             
@@ -500,7 +1328,7 @@ class AgenticChat:
         info_text = f"""
 [bold]File:[/bold] {analysis['file']}
 [bold]Language:[/bold] {analysis['language']}
-[bold]Size:[/bold] {analysis['size']} characters
+[bold]Size:[/bold] {self._format_file_size(analysis['size'])}
 [bold]Lines:[/bold] {analysis['lines']}
         """.strip()
         
@@ -518,7 +1346,7 @@ class AgenticChat:
         status_info = f"""
 [bold]🤖 Agentic System Status[/bold]
 
-[cyan]Workspace:[/cyan] {self.workspace_path}
+[cyan]Workspace:[/cyan] {self._workspace_root}
 [cyan]Project Type:[/cyan] {self.project_structure['type']}
 [cyan]Files:[/cyan] {len(self.accessible_files)} accessible
 [cyan]Current Model:[/cyan] {self.current_model}
@@ -543,7 +1371,7 @@ class AgenticChat:
 [cyan]Search & Analysis:[/cyan]
 • /search <query> - Semantic codebase search
 • /analyze <file> - Analyze code structure and quality
-• /read <file> - Read file contents
+• /read <file> [start-end] - Read file contents
 
 [cyan]File Operations:[/cyan]
 • /edit <file1> [file2 ...] - Edit one or more files with intelligent changes
@@ -570,7 +1398,7 @@ class AgenticChat:
         """Show current context."""
         context_info = f"""
 [bold]Current Context:[/bold]
-• Workspace: {self.workspace_path}
+• Workspace: {self._workspace_root}
 • Files: {len(self.accessible_files)} accessible
 • Tool Calls: {len(self.tool_calls)} executed
 • Recent Changes: {len(self.recent_changes)} files modified
@@ -588,6 +1416,8 @@ class AgenticChat:
     
     def _show_history(self) -> None:
         """Show recent changes history."""
+        from rich.table import Table
+        
         if not self.recent_changes:
             self.console.print("[yellow]No recent changes[/yellow]")
             return
@@ -599,9 +1429,9 @@ class AgenticChat:
         table.add_column("Time", style="yellow")
         
         for i, change in enumerate(self.recent_changes[-10:], 1):
-            file_path = Path(change['file']).name
+            file_path = os.path.basename(change['file'])
             action = change.get('action', 'modified')
-            timestamp = time.strftime('%H:%M:%S', time.localtime(change['timestamp']))
+            timestamp = _clock_time(change['timestamp'])
             
             table.add_row(str(i), file_path, action, timestamp)
         
@@ -610,9 +1440,6 @@ class AgenticChat:
     def _process_agentic_request_with_context(self, user_input: str) -> Optional[str]:
         """Process user request using advanced agentic capabilities with full context optimization."""
         try:
-            if len(self.messages) > self.max_history:
-                self.messages = self.messages[-self.max_history:]
-
             smart_context = self._build_smart_context(user_input)
             optimized_context = self._optimize_context_for_64k(smart_context)
 
@@ -630,7 +1457,7 @@ class AgenticChat:
             user_message = {"role": "user", "content": user_input}
             self.session_state['models_used'].add(self.current_model)
 
-            messages = self.messages + [context_message, user_message]
+            messages = list(self.messages) + [context_message, user_message]
 
             with Status("[bold green]🤖 Processing with 64k context optimization...", console=self.console):
                 response = self.api_client.chat_completion(
@@ -651,8 +1478,6 @@ class AgenticChat:
 
             self.messages.append(user_message)
             self.messages.append({"role": "assistant", "content": response_content})
-            if len(self.messages) > self.max_history:
-                self.messages = self.messages[-self.max_history:]
 
             self._add_to_operation_history({
                 'type': 'ai_response',
@@ -671,43 +1496,34 @@ class AgenticChat:
         if self._is_file_modification_request(user_input):
             return self._handle_file_modification_request(user_input)
         
-        self.messages.append({"role": "user", "content": user_input})
-        
         # Build enhanced context
-        context_parts = []
-        context_parts.append(f"Workspace: {self.workspace_path}")
-        context_parts.append(f"Project Type: {self.project_structure['type']}")
-        context_parts.append(f"Files: {len(self.accessible_files)} accessible")
+        context_parts = [
+            _format_workspace_summary(
+                self._workspace_root,
+                self.project_structure['type'],
+                len(self.accessible_files)
+            )
+        ]
         
         # Add recent changes
         if self.recent_changes:
-            recent_files = [Path(c['file']).name for c in self.recent_changes[-3:]]
+            recent_files = [os.path.basename(c['file']) for c in self.recent_changes[-3:]]
             context_parts.append(f"Recent changes: {', '.join(recent_files)}")
         
-        enhanced_message = f"""
-Advanced Agent Context:
-{chr(10).join(context_parts)}
-
-User Request: {user_input}
-
-You are an advanced AI assistant with access to powerful tools. You can:
-- Search and analyze codebases
-- Read and edit files with diff previews
-- Understand project structure and context
-- Provide intelligent code suggestions
-
-Please respond intelligently to the user's request, using your tools when appropriate.
-"""
-        
-        self.messages[-1] = {"role": "user", "content": enhanced_message}
+        enhanced_message = AGENT_PROMPT_TEMPLATE.format(
+            context="\n".join(context_parts),
+            user_input=user_input
+        )
         
-        if len(self.messages) > self.max_history:
-            self.messages = self.messages[-self.max_history:]
+        # Only this request carries the enhanced prompt; history keeps the plain input
+        messages = [AGENT_SYSTEM_MESSAGE]
+        messages.extend(self.messages)
+        messages.append({"role": "user", "content": enhanced_message})
         
         with Status("[bold green]🤖 Processing with advanced AI...", console=self.console):
             try:
                 response = self.api_client.chat_completion(
-                    messages=self.messages,
+                    messages=messages,
                     model=self.current_model,
                     temperature=0.7,
                     max_tokens=30000
@@ -715,59 +1531,32 @@ Please respond intelligently to the user's request, using your tools when approp
                 
                 if not response or not response.choices or not response.choices[0].message:
                     self.console.print("[red]Error: Received empty response from API[/red]")
-                    if self.messages:
-                        self.messages.pop()
                     return None
                 
                 response_content = response.choices[0].message.content
                 
                 if not response_content or not response_content.strip():
                     self.console.print("[red]Error: Received empty response content from API[/red]")
-                    if self.messages:
-                        self.messages.pop()
                     return None
                 
+                self.messages.append({"role": "user", "content": user_input})
                 self.messages.append({"role": "assistant", "content": response_content})
                 return response_content
                 
             except Exception as e:
                 self.console.print(f"[red]Error getting response: {e}[/red]")
-                if self.messages:
-                    self.messages.pop()
                 return None
     
     def _is_file_modification_request(self, user_input: str) -> bool:
         """Check if user input is requesting file modifications."""
-        modification_keywords = [
-            'add', 'create', 'modify', 'change', 'update', 'edit', 'fix', 'implement',
-            'make', 'build', 'generate',
-            'button', 'function', 'component', 'page', 'file', 'code', 'feature',
-            'website', 'app'
-        ]
-        
-        user_lower = user_input.lower()
-        
-        # Check for modification keywords
-        if any(keyword in user_lower for keyword in modification_keywords):
-            return True
-        
-        # Check for pronouns that suggest modification of existing content
-        pronouns = ['it', 'this', 'that', 'the', 'these', 'those']
-        if any(pronoun in user_lower for pronoun in pronouns):
-            # Check if there are recent changes or files to modify
-            if self.recent_changes or self.task_context.get('files_modified'):
-                return True
-        
-        # Check for context continuation keywords
-        continuation_keywords = ['make it', 'change it to', 'update it', 'modify it', 'add to it']
-        if any(keyword in user_lower for keyword in continuation_keywords):
+        # Continuation phrases like "make it" or "update it" are covered by these keywords
+        if MODIFICATION_RE.search(user_input):
             return True
         
-        # Check for theme/style modifications (these should modify existing files)
-        style_keywords = ['red', 'black', 'blue', 'green', 'theme', 'color', 'style', 'css']
-        if any(keyword in user_lower for keyword in style_keywords):
-            # If we have existing files, this should modify them
-            if self.recent_changes or self.task_context.get('files_modified'):
+        # Pronouns and theme/style words refer to existing content, so they
+        # only count when there are files we have already worked on
+        if self.recent_changes or self.task_context.get('files_modified'):
+            if CONTEXT_REFERENCE_RE.search(user_input):
                 return True
         
         # Check if this seems like a continuation of previous work
@@ -778,8 +1567,7 @@ Please respond intelligently to the user's request, using your tools when approp
         essential_context = self._extract_essential_context()
         if essential_context and ('Website/HTML project' in essential_context or 'HTML/Website' in essential_context):
             # If we have a website project and user mentions content, modify existing files
-            content_keywords = ['college', 'school', 'university', 'delhi', 'mumbai', 'bangalore']
-            if any(keyword in user_lower for keyword in content_keywords):
+            if CONTENT_KEYWORDS & _words(user_input):
                 return True
         
         return False
@@ -799,10 +1587,7 @@ Please respond intelligently to the user's request, using your tools when approp
             
             if not relevant_files:
                 # Check if this is a modification request for non-existent files
-                modification_keywords = ['modify', 'change', 'update', 'edit', 'add', 'remove', 'fix', 'improve']
-                user_lower = user_input.lower()
-                
-                if any(keyword in user_lower for keyword in modification_keywords):
+                if 'modify' in _classify_request(user_input):
                     self.console.print("[yellow]No existing files found for modification.[/yellow]")
                     create_new = Prompt.ask(
                         "Would you like to create new files instead? (y/n)", 
@@ -857,6 +1642,7 @@ Please respond intelligently to the user's request, using your tools when approp
                 results[target_file] = success
                 
                 if success:
+                    self._file_sizes.pop(target_file, None)
                     self.recent_changes.append({
                         'file': target_file,
                         'timestamp': time.time(),
@@ -864,8 +1650,9 @@ Please respond intelligently to the user's request, using your tools when approp
                     })
 
             # Show summary and ask for confirmation
-            successful_files = [f for f, success in results.items() if success]
-            failed_files = [f for f, success in results.items() if not success]
+            successful_files, failed_files = [], []
+            for file_path, success in results.items():
+                (successful_files if success else failed_files).append(file_path)
             
             if successful_files:
                 self.console.print(f"[green]✅ Successfully processed: {', '.join(successful_files)}[/green]")
@@ -883,24 +1670,14 @@ Please respond intelligently to the user's request, using your tools when approp
 
     def _is_multi_file_creation_request(self, user_input: str) -> bool:
         """Check if user input is requesting creation of multiple files."""
-        creation_keywords = [
-            'create', 'make', 'build', 'generate', 'set up', 'initialize',
-            'website', 'app', 'project', 'structure', 'framework', 'new'
-        ]
-        
-        modification_keywords = [
-            'modify', 'change', 'update', 'edit', 'add', 'remove', 'fix', 'improve',
-            'enhance', 'adjust', 'alter', 'revise', 'amend'
-        ]
-        
-        user_lower = user_input.lower()
+        tags = _classify_request(user_input)
         
         # If it explicitly mentions creation keywords, it's a creation request
-        if any(keyword in user_lower for keyword in creation_keywords):
+        if 'create' in tags:
             return True
         
         # If it mentions modification keywords, it's likely a modification request
-        if any(keyword in user_lower for keyword in modification_keywords):
+        if 'modify' in tags:
             return False
         
         # Default behavior: check if relevant files exist
@@ -928,28 +1705,27 @@ Please respond intelligently to the user's request, using your tools when approp
                 auto_apply=False
             )
         else:  # Fallback for simpler file operation implementations
-            spec = file_specs[0]
-            path = spec.get("path")
-            prompt = spec.get("prompt", "")
-            file_type = spec.get("type")
-            success = self.file_ops.create_file_from_prompt(
-                path,
-                self.current_model,
-                prompt,
-                file_type,
-            )
-            results[path] = success
+            # create_file_from_prompt may prompt the user, so files are made one at a time
+            for spec in file_specs:
+                path = spec.get("path")
+                results[path] = self.file_ops.create_file_from_prompt(
+                    path,
+                    self.current_model,
+                    spec.get("prompt", ""),
+                    spec.get("type"),
+                )
         
-        # Track successful creations
+        # Track successful creations; files created together share one timestamp
         successful_files = []
+        batch_time = time.time()
         for file_path, success in results.items():
             if success:
                 self.recent_changes.append({
                     'file': file_path,
-                    'timestamp': time.time(),
+                    'timestamp': batch_time,
                     'action': 'created'
                 })
-                self.accessible_files.add(file_path)
+                self._add_accessible_file(file_path)
                 successful_files.append(file_path)
         
         # Single confirmation for the entire task
@@ -961,7 +1737,16 @@ Please respond intelligently to the user's request, using your tools when approp
         return f"✅ Created {len(successful_files)} files successfully: {', '.join(successful_files)}"
 
     def _determine_required_files(self, user_input: str) -> List[Dict[str, str]]:
-        """Use AI to determine what files are needed for the request."""
+        """Use AI to determine what files are needed for the request.
+        
+        File specs returned by the model are reused for the same request,
+        model and project type instead of asking again.
+        """
+        cache_key = (user_input, self.current_model, self.project_structure.get('type', 'unknown'))
+        cached_specs = self._required_files_cache.get(cache_key)
+        if cached_specs is not None:
+            return [dict(spec) for spec in cached_specs]
+        
         self.console.print("[cyan]🤖 Analyzing request to determine required files...[/cyan]")
         
         # Build context for AI analysis
@@ -969,7 +1754,7 @@ Please respond intelligently to the user's request, using your tools when approp
 User Request: {user_input}
 
 Project Context:
-- Workspace: {self.workspace_path}
+- Workspace: {self._workspace_root}
 - Project Type: {self.project_structure.get('type', 'unknown')}
 - Existing Files: {len(self.accessible_files)} files
 
@@ -1003,36 +1788,50 @@ Be minimal and focused. Only create what's needed.
 """
         
         try:
-            # Get AI response for file structure
-            response = self.api_client.chat_completion(
-                messages=[{"role": "user", "content": context}],
-                model=self.current_model,
-                temperature=0.3,
-                max_tokens=30000
-            )
+            messages = [{"role": "user", "content": context}]
+            chat_stream = getattr(self.api_client, 'chat_stream', None)
+            if chat_stream is not None:
+                # The specs lead the reply, so stop reading once the array is complete
+                stream = chat_stream(
+                    messages=messages,
+                    model=self.current_model,
+                    temperature=0.3,
+                    max_tokens=30000
+                )
+                try:
+                    file_specs, response_content = _first_json_array(stream)
+                finally:
+                    close = getattr(stream, 'close', None)
+                    if close is not None:
+                        close()
+            else:
+                response = self.api_client.chat_completion(
+                    messages=messages,
+                    model=self.current_model,
+                    temperature=0.3,
+                    max_tokens=30000
+                )
 
-            if not response or not response.choices or not response.choices[0].message:
-                return self._get_default_file_specs(user_input)
+                if not response or not response.choices or not response.choices[0].message:
+                    return self._get_default_file_specs(user_input)
 
-            response_content = response.choices[0].message.content
-            
-            # Try to parse JSON from response
-            import json
-            import re
+                file_specs = None
+                response_content = response.choices[0].message.content
             
-            # Extract JSON from response (handle markdown code blocks)
-            json_match = re.search(r'```(?:json)?\s*(\[.*?\])\s*```', response_content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                # Try to find JSON array in the text
-                json_match = re.search(r'\[.*?\]', response_content, re.DOTALL)
+            if file_specs is None:
+                # Extract JSON from response (handle markdown code blocks)
+                json_match = JSON_FENCE_RE.search(response_content)
                 if json_match:
-                    json_str = json_match.group(0)
+                    json_str = json_match.group(1)
                 else:
-                    return self._get_default_file_specs(user_input)
-            
-            file_specs = json.loads(json_str)
+                    # Try to find JSON array in the text
+                    json_match = JSON_ARRAY_RE.search(response_content)
+                    if json_match:
+                        json_str = json_match.group(0)
+                    else:
+                        return self._get_default_file_specs(user_input)
+                
+                file_specs = _loads_json(json_str)
             
             # Validate file specifications
             valid_specs = []
@@ -1041,6 +1840,7 @@ Be minimal and focused. Only create what's needed.
                     valid_specs.append(spec)
             
             if valid_specs:
+                self._required_files_cache[cache_key] = [dict(spec) for spec in valid_specs]
                 return valid_specs
             else:
                 return self._get_default_file_specs(user_input)
@@ -1051,12 +1851,12 @@ Be minimal and focused. Only create what's needed.
 
     def _get_default_file_specs(self, user_input: str) -> List[Dict[str, str]]:
         """Get minimal default file specifications based on request keywords."""
-        user_lower = user_input.lower()
+        tags = _classify_request(user_input)
         
         # Analyze the request more intelligently
-        if any(keyword in user_lower for keyword in ['website', 'web', 'html', 'page']):
+        if 'website' in tags:
             # For websites, only create essential files
-            if 'simple' in user_lower or 'basic' in user_lower:
+            if 'simple' in tags:
                 return [
                     {"path": "index.html", "prompt": f"Simple HTML file for: {user_input}"}
                 ]
@@ -1065,26 +1865,26 @@ Be minimal and focused. Only create what's needed.
                     {"path": "index.html", "prompt": f"Main HTML file for: {user_input}"},
                     {"path": "styles.css", "prompt": "CSS styling for the website"}
                 ]
-        elif any(keyword in user_lower for keyword in ['app', 'application', 'react', 'vue', 'angular']):
+        elif 'app' in tags:
             # For apps, only create essential files
             return [
                 {"path": "package.json", "prompt": "Node.js package configuration"},
                 {"path": "src/main.js", "prompt": f"Main application file for: {user_input}"}
             ]
-        elif any(keyword in user_lower for keyword in ['python', 'script', 'tool']):
+        elif 'script' in tags:
             # For Python scripts, only create the main file
             return [
                 {"path": "main.py", "prompt": f"Python script for: {user_input}"}
             ]
-        elif any(keyword in user_lower for keyword in ['data', 'json', 'csv', 'xml']):
+        elif 'data' in tags:
             # For data files, create only the data file
-            if 'json' in user_lower:
+            if 'json' in tags:
                 return [{"path": "data.json", "prompt": f"JSON data for: {user_input}"}]
-            elif 'csv' in user_lower:
+            elif 'csv' in tags:
                 return [{"path": "data.csv", "prompt": f"CSV data for: {user_input}"}]
             else:
                 return [{"path": "data.json", "prompt": f"Data file for: {user_input}"}]
-        elif any(keyword in user_lower for keyword in ['config', 'settings', 'configuration']):
+        elif 'config' in tags:
             # For configuration files
             return [{"path": "config.json", "prompt": f"Configuration for: {user_input}"}]
         else:
@@ -1095,12 +1895,7 @@ Be minimal and focused. Only create what's needed.
 
     def _ask_for_single_task_confirmation(self, task_description: str, affected_files: List[str]) -> None:
         """Ask user for single confirmation after completing a task."""
-        self.console.print(f"\n[bold cyan]🎉 Task completed: {task_description}[/bold cyan]")
-        
-        # Show brief project summary
-        self._show_brief_project_summary(affected_files)
-        
-        self.console.print("\n[bold]What would you like to do?[/bold]")
+        from rich.table import Table
         
         table = Table(show_header=False, box=None)
         table.add_column("Option", style="cyan")
@@ -1110,13 +1905,15 @@ Be minimal and focused. Only create what's needed.
         table.add_row("R", "Review changes in detail")
         table.add_row("C", "Continue with next task")
         
-        self.console.print(table)
+        # Render the summary and the options in one pass
+        self.console.print(Group(
+            Text.from_markup(f"\n[bold cyan]🎉 Task completed: {task_description}[/bold cyan]"),
+            *self._brief_project_summary(affected_files),
+            Text.from_markup("\n[bold]What would you like to do?[/bold]"),
+            table
+        ))
         
-        choice = Prompt.ask(
-            "Choose an option",
-            choices=["A", "R", "C"],
-            default="C"
-        )
+        choice = self._ask_option(["A", "R", "C"], default="C")
         
         if choice == "R":
             self._review_changes(affected_files)
@@ -1127,12 +1924,7 @@ Be minimal and focused. Only create what's needed.
 
     def _ask_for_task_confirmation(self, task_description: str, affected_files: List[str]) -> None:
         """Ask user for confirmation after completing a task."""
-        self.console.print(f"\n[bold cyan]🎉 Task completed: {task_description}[/bold cyan]")
-        
-        # Show project structure summary
-        self._show_project_summary(affected_files)
-        
-        self.console.print("\n[bold]What would you like to do next?[/bold]")
+        from rich.table import Table
         
         table = Table(show_header=False, box=None)
         table.add_column("Option", style="cyan")
@@ -1144,13 +1936,15 @@ Be minimal and focused. Only create what's needed.
         table.add_row("E", "Edit specific files")
         table.add_row("C", "Continue with next task")
         
-        self.console.print(table)
+        # Render the summary and the options in one pass
+        self.console.print(Group(
+            Text.from_markup(f"\n[bold cyan]🎉 Task completed: {task_description}[/bold cyan]"),
+            *self._project_summary(affected_files),
+            Text.from_markup("\n[bold]What would you like to do next?[/bold]"),
+            table
+        ))
         
-        choice = Prompt.ask(
-            "Choose an option",
-            choices=["A", "R", "M", "E", "C"],
-            default="C"
-        )
+        choice = self._ask_option(["A", "R", "M", "E", "C"], default="C")
         
         if choice == "R":
             self._review_changes(affected_files)
@@ -1163,74 +1957,114 @@ Be minimal and focused. Only create what's needed.
         else:  # C
             self.console.print("[cyan]Continuing with next task...[/cyan]")
 
+    def _ask_option(self, choices: List[str], default: str) -> str:
+        """Read a single-letter option, without waiting for Enter on a terminal.
+        
+        Args:
+            choices: Accepted upper-case option letters
+            default: Option used when Enter is pressed
+            
+        Returns:
+            The chosen option
+        """
+        if not sys.stdin.isatty():
+            return Prompt.ask("Choose an option", choices=choices, default=default)
+        
+        import click
+        
+        self.console.print(f"Choose an option [bold magenta][{'/'.join(choices)}][/bold magenta] "
+                           f"[bold cyan]({default})[/bold cyan]: ", end="")
+        while True:
+            key = click.getchar()
+            if key in ('\r', '\n'):
+                choice = default
+            else:
+                choice = key.upper()
+                if choice not in choices:
+                    continue
+            self.console.print(choice)
+            return choice
+
     def _show_brief_project_summary(self, affected_files: List[str]) -> None:
         """Show a brief summary of the project structure."""
-        self.console.print(f"\n[bold cyan]📊 Project Summary:[/bold cyan]")
+        self.console.print(Group(*self._brief_project_summary(affected_files)))
+
+    def _brief_project_summary(self, affected_files: List[str]) -> List[Any]:
+        """Build the renderables of the brief project summary.
         
-        # Show file structure
-        structure_table = Table(title="📁 Created Files", show_header=True, header_style="bold magenta")
-        structure_table.add_column("#", style="dim", width=4)
-        structure_table.add_column("File Path", style="cyan")
-        structure_table.add_column("Type", style="green")
-        structure_table.add_column("Status", style="yellow")
+        Returns:
+            Heading and file listing, to be printed together
+        """
+        file_summary, _ = self._build_file_summary(affected_files)
+        return [Text.from_markup("\n[bold cyan]📊 Project Summary:[/bold cyan]"), file_summary]
+
+    def _build_file_summary(self, affected_files: List[str]) -> Tuple[Any, int]:
+        """Build the created-files listing for the project summaries.
         
-        for i, file_path in enumerate(affected_files, 1):
-            path = Path(file_path)
-            file_type = path.suffix or "No extension"
+        Long lists are rendered as plain lines in a panel, since laying out a
+        Table row by row gets slow with many files.
+        
+        Returns:
+            Renderable listing the files, and their total size in bytes
+        """
+        from rich.table import Table
+        
+        rows = []
+        total_size = 0
+        for file_path in affected_files:
+            file_type = os.path.splitext(file_path)[1] or "No extension"
             
-            # Check if file exists and get size
+            # One stat tells both whether the file exists and its size
             try:
-                if path.exists():
-                    size = path.stat().st_size
-                    status = f"✅ {size} bytes"
-                else:
-                    status = "❌ Not found"
-            except:
+                size = os.stat(file_path).st_size
+                status = f"✅ {size} bytes"
+                total_size += size
+            except FileNotFoundError:
+                status = "❌ Not found"
+            except OSError:
                 status = "❓ Unknown"
             
-            structure_table.add_row(str(i), str(path), file_type, status)
+            rows.append((file_path, file_type, status))
         
-        self.console.print(structure_table)
-
-    def _show_project_summary(self, affected_files: List[str]) -> None:
-        """Show a summary of the project structure."""
-        self.console.print(f"\n[bold cyan]📊 Project Summary:[/bold cyan]")
+        if len(rows) > SUMMARY_TABLE_MAX_ROWS:
+            listing = "\n".join(
+                f"{i:>3}. {file_path} [{file_type}] {status}"
+                for i, (file_path, file_type, status) in enumerate(rows, 1)
+            )
+            return Panel(Text(listing), title="📁 Created Files", border_style="magenta"), total_size
         
-        # Show file structure
         structure_table = Table(title="📁 Created Files", show_header=True, header_style="bold magenta")
         structure_table.add_column("#", style="dim", width=4)
         structure_table.add_column("File Path", style="cyan")
         structure_table.add_column("Type", style="green")
         structure_table.add_column("Status", style="yellow")
         
-        for i, file_path in enumerate(affected_files, 1):
-            path = Path(file_path)
-            file_type = path.suffix or "No extension"
-            
-            # Check if file exists and get size
-            try:
-                if path.exists():
-                    size = path.stat().st_size
-                    status = f"✅ {size} bytes"
-                else:
-                    status = "❌ Not found"
-            except:
-                status = "❓ Unknown"
-            
-            structure_table.add_row(str(i), str(path), file_type, status)
+        for i, row in enumerate(rows, 1):
+            structure_table.add_row(str(i), *row)
         
-        self.console.print(structure_table)
+        return structure_table, total_size
+
+    def _show_project_summary(self, affected_files: List[str]) -> None:
+        """Show a summary of the project structure."""
+        self.console.print(Group(*self._project_summary(affected_files)))
+
+    def _project_summary(self, affected_files: List[str]) -> List[Any]:
+        """Build the renderables of the full project summary.
+        
+        Returns:
+            Heading, file listing and statistics panel, to be printed together
+        """
+        file_summary, total_size = self._build_file_summary(affected_files)
         
         # Show project statistics
         total_files = len(affected_files)
-        total_size = sum(Path(f).stat().st_size for f in affected_files if Path(f).exists())
         
         stats_info = f"""
 [bold]📈 Project Statistics:[/bold]
 • Total Files: {total_files}
 • Total Size: {total_size} bytes
 • Project Type: {self.project_structure.get('type', 'unknown')}
-• Workspace: {self.workspace_path}
+• Workspace: {self._workspace_root}
         """.strip()
         
         panel = Panel(
@@ -1240,7 +2074,7 @@ Be minimal and focused. Only create what's needed.
             padding=(1, 2)
         )
         
-        self.console.print(panel)
+        return [Text.from_markup("\n[bold cyan]📊 Project Summary:[/bold cyan]"), file_summary, panel]
 
     def _edit_specific_files(self, affected_files: List[str]) -> None:
         """Allow editing of specific files."""
@@ -1273,13 +2107,12 @@ Be minimal and focused. Only create what's needed.
         for file_path in files_to_edit:
             self.console.print(f"\n[cyan]Editing: {file_path}[/cyan]")
             try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
+                content = Path(file_path).read_text(encoding='utf-8')
                 
                 edited_content = self.file_ops._edit_file_content(file_path, content)
                 if edited_content is not None:
-                    with open(file_path, 'w') as f:
-                        f.write(edited_content)
+                    Path(file_path).write_text(edited_content, encoding='utf-8')
+                    self._file_sizes.pop(file_path, None)
                     self.console.print(f"[green]✅ Updated: {file_path}[/green]")
                 else:
                     self.console.print(f"[yellow]⚠️ No changes made to: {file_path}[/yellow]")
@@ -1293,35 +2126,75 @@ Be minimal and focused. Only create what's needed.
         
         for file_path in affected_files:
             try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                
+                size = os.stat(file_path).st_size
                 self.console.print(f"\n[bold yellow]{file_path}:[/bold yellow]")
+                if size > MAX_PREVIEW_BYTES:
+                    self.console.print(
+                        f"[yellow]Preview skipped: file is {self._format_file_size(size)}. Use /read to view it.[/yellow]"
+                    )
+                    continue
+                
+                content = Path(file_path).read_text(encoding='utf-8', errors='replace')
                 self.file_ops.diff_manager.show_file_preview(file_path, content, "Current Content")
                 
             except Exception as e:
                 self.console.print(f"[red]Error reading {file_path}: {e}[/red]")
     
     def _find_relevant_files(self, user_input: str) -> List[str]:
-        """Find files relevant to the user's request."""
-        user_lower = user_input.lower()
+        """Find files relevant to the user's request.
+        
+        Results are cached per request until the accessible files change.
+        """
+        if self._relevant_files_version != self._files_version:
+            self._relevant_files_cache.clear()
+            self._relevant_files_version = self._files_version
+        
+        relevant_files = self._relevant_files_cache.get(user_input)
+        if relevant_files is None:
+            relevant_files = self._scan_relevant_files(user_input)
+            if len(self._relevant_files_cache) >= RELEVANT_FILES_CACHE_SIZE:
+                self._relevant_files_cache.clear()
+            self._relevant_files_cache[user_input] = relevant_files
+        return list(relevant_files)
+    
+    def _scan_relevant_files(self, user_input: str) -> List[str]:
+        """Match the accessible files against the request keywords."""
+        tags = _classify_request(user_input)
+        if not tags & {'component', 'task', 'button'}:
+            return []
+        
+        if tags & {'component', 'task'}:
+            candidates = self._names_folded.items()
+        else:
+            # Only UI files can match a button request, so skip straight to their buckets
+            candidates = (
+                (file_path, self._names_folded[file_path])
+                for file_path in chain.from_iterable(
+                    self._files_by_ext.get(ext, ()) for ext in UI_FILE_EXTENSIONS
+                )
+            )
+        
         relevant_files = []
         
-        for file_path in self.accessible_files:
-            file_name = Path(file_path).name.lower()
-            
+        # Each file is visited once, so a file matching several rules is only added once
+        for file_path, file_name in candidates:
             # Check if file name contains keywords from the request
-            if any(keyword in file_name for keyword in ['task', 'button', 'page', 'component']):
-                if any(keyword in user_lower for keyword in ['task', 'button', 'page', 'component']):
+            if any(keyword in file_name for keyword in COMPONENT_NAME_KEYWORDS):
+                if 'component' in tags:
                     relevant_files.append(file_path)
             
             # Check for common file patterns
-            elif 'task' in user_lower and 'task' in file_name:
+            elif 'task' in tags and 'task' in file_name:
                 relevant_files.append(file_path)
-            elif 'button' in user_lower and any(ext in file_name for ext in ['.js', '.jsx', '.ts', '.tsx', '.html']):
+            elif 'button' in tags and os.path.splitext(file_name)[1] in UI_FILE_EXTENSIONS:
                 relevant_files.append(file_path)
+            else:
+                continue
+            
+            if len(relevant_files) >= RELEVANT_FILES_LIMIT:
+                break
         
-        return relevant_files[:3]  # Return top 3 relevant files
+        return relevant_files
     
     def _display_agentic_response(self, response: str) -> None:
         """Display agentic response."""
@@ -1332,6 +2205,9 @@ Be minimal and focused. Only create what's needed.
     
     def _display_code_response(self, response: str) -> None:
         """Display response with code."""
+        from rich.markdown import Markdown
+        from rich.syntax import Syntax
+        
         parts = response.split("```")
         
         for i, part in enumerate(parts):
@@ -1355,6 +2231,8 @@ Be minimal and focused. Only create what's needed.
     
     def _display_text_response(self, response: str) -> None:
         """Display text-only response."""
+        from rich.markdown import Markdown
+        
         md = Markdown(response)
         self.console.print(md)
     
@@ -1399,7 +2277,7 @@ Be minimal and focused. Only create what's needed.
 [bold cyan]File Operations:[/bold cyan]
   /files              - List all accessible files
   /scan               - Rescan workspace for new files
-  /read <file>        - Read and preview a file
+  /read <file> [start-end] - Read and preview a file
   /edit <file1> [file2 ...] - Edit one or more files (always shows diffs)
   /create <file1> [file2 ...] - Create one or more files (always shows diffs)
   /delete <file>      - Delete a file
@@ -1447,40 +2325,57 @@ Be minimal and focused. Only create what's needed.
 
     def _list_accessible_files(self) -> None:
         """List all accessible files in the workspace."""
+        from rich.table import Table
+        
         if not self.accessible_files:
             self.console.print("[yellow]No accessible files found in workspace[/yellow]")
             return
         
-        table = Table(title="📁 Accessible Files", show_header=True, header_style="bold magenta")
-        table.add_column("#", style="dim", width=4)
-        table.add_column("File Path", style="cyan")
-        table.add_column("Type", style="green")
-        table.add_column("Size", style="yellow")
-        
-        for i, file_path in enumerate(sorted(self.accessible_files), 1):
-            path = Path(file_path)
-            file_type = path.suffix or "No extension"
-            try:
-                size = path.stat().st_size
-                size_str = self._format_file_size(size)
-            except OSError:
-                size_str = "Unknown"
-            
-            table.add_row(str(i), str(path), file_type, size_str)
-        
-        self.console.print(table)
+        # Large workspaces are printed in chunks so output starts right away
+        # and Ctrl+C stops the listing without building every row first
+        try:
+            for start in range(0, len(self._sorted_files), FILE_LIST_CHUNK_SIZE):
+                first = start == 0
+                table = Table(
+                    title="📁 Accessible Files" if first else None,
+                    show_header=first,
+                    header_style="bold magenta"
+                )
+                table.add_column("#", style="dim", width=4)
+                table.add_column("File Path", style="cyan")
+                table.add_column("Type", style="green")
+                table.add_column("Size", style="yellow")
+                
+                chunk = self._sorted_files[start:start + FILE_LIST_CHUNK_SIZE]
+                for i, file_path in enumerate(chunk, start + 1):
+                    file_type = os.path.splitext(file_path)[1] or "No extension"
+                    size = self._file_sizes.get(file_path)
+                    if size is None:
+                        try:
+                            size = self._file_sizes[file_path] = os.stat(self._absolute_path(file_path)).st_size
+                        except OSError:
+                            pass
+                    size_str = "Unknown" if size is None else self._format_file_size(size)
+                    
+                    table.add_row(str(i), file_path, file_type, size_str)
+                
+                self.console.print(table)
+        except KeyboardInterrupt:
+            self.console.print("\n[yellow]Listing interrupted[/yellow]")
 
     def _rescan_workspace(self) -> None:
         """Rescan the workspace for files."""
         with Status("[bold green]Rescanning workspace...", console=self.console):
             self._scan_workspace()
+            self._analyze_project_structure()
+            self._save_workspace_cache()
         
         self.console.print(f"[green]Found {len(self.accessible_files)} accessible files[/green]")
 
     def _show_workspace_info(self) -> None:
         """Show workspace information."""
         workspace_info = f"""
-[bold]Workspace Path:[/bold] {self.workspace_path}
+[bold]Workspace Path:[/bold] {self._workspace_root}
 [bold]Accessible Files:[/bold] {len(self.accessible_files)}
 [bold]Current Model:[/bold] {self.current_model}
 [bold]Project Type:[/bold] {self.project_structure.get('type', 'unknown')}
@@ -1526,21 +2421,14 @@ Be minimal and focused. Only create what's needed.
                     'action': 'created'
                 })
                 # Add to accessible files
-                self.accessible_files.add(file_path)
+                self._add_accessible_file(file_path)
             else:
                 self.console.print(f"[red]✗ Failed to create file: {file_path}[/red]")
         else:
             # Multiple file creation
             self.console.print(f"[cyan]Creating {len(requested)} files...[/cyan]")
             
-            file_specs = []
-            for file_path in requested:
-                prompt = Prompt.ask(f"What should {file_path} contain?")
-                if prompt:
-                    file_specs.append({
-                        'path': file_path,
-                        'prompt': prompt
-                    })
+            file_specs = self._ask_file_prompts(requested)
             
             if not file_specs:
                 self.console.print("[yellow]No files to create[/yellow]")
@@ -1552,16 +2440,48 @@ Be minimal and focused. Only create what's needed.
                 auto_apply=False
             )
             
-            # Track successful creations
+            # Track successful creations; files created together share one timestamp
+            batch_time = time.time()
             for file_path, success in results.items():
                 if success:
                     self.recent_changes.append({
                         'file': file_path,
-                        'timestamp': time.time(),
+                        'timestamp': batch_time,
                         'action': 'created'
                     })
                     # Add to accessible files
-                    self.accessible_files.add(file_path)
+                    self._add_accessible_file(file_path)
+
+    def _ask_file_prompts(self, requested: List[str]) -> List[Dict[str, str]]:
+        """Ask what each of several new files should contain.
+        
+        On a terminal all files are described in one editor session; otherwise
+        each file is asked for in turn.
+        
+        Args:
+            requested: Paths of the files to create
+            
+        Returns:
+            File specifications with 'path' and 'prompt' for every described file
+        """
+        if sys.stdin.isatty() and sys.stdout.isatty():
+            import click
+            
+            template = FILE_PROMPTS_TEMPLATE + "".join(f"# {file_path}\n\n" for file_path in requested)
+            text = click.edit(template)
+            if text is None:
+                return []
+            return _parse_file_prompts(text, requested)
+        
+        file_specs = []
+        for file_path in requested:
+            prompt = Prompt.ask(f"What should {file_path} contain?")
+            if prompt:
+                file_specs.append({
+                    'path': file_path,
+                    'prompt': prompt
+                })
+        return file_specs
 
     def _handle_delete(self, file_path: str) -> None:
         """Handle delete command."""
@@ -1569,22 +2489,25 @@ Be minimal and focused. Only create what's needed.
             self.console.print("[red]Please specify a file path[/red]")
             return
         
-        # Find the file
-        target_file = None
-        for accessible_file in self.accessible_files:
-            if file_path in accessible_file or Path(accessible_file).name == file_path:
-                target_file = accessible_file
-                break
-        
-        if not target_file:
-            self.console.print(f"[red]File not found: {file_path}[/red]")
-            return
+        # Find the file by exact path, then by file name
+        target_file = self._relative_path(file_path)
+        if target_file not in self.accessible_files:
+            candidates = self._by_basename.get(file_path, [])
+            if not candidates:
+                self.console.print(f"[red]File not found: {file_path}[/red]")
+                return
+            if len(candidates) > 1:
+                self.console.print(f"[yellow]Several files are named {file_path}, please give the full path:[/yellow]")
+                for candidate in candidates:
+                    self.console.print(f"  • {candidate}")
+                return
+            target_file = candidates[0]
         
         if Prompt.ask(f"Are you sure you want to delete {target_file}?", default=False):
             try:
-                Path(target_file).unlink()
+                os.remove(self._absolute_path(target_file))
                 self.console.print(f"[green]✓ File deleted: {target_file}[/green]")
-                self.accessible_files.remove(target_file)
+                self._remove_accessible_file(target_file)
                 self.recent_changes.append({
                     'file': target_file,
                     'timestamp': time.time(),
@@ -1597,11 +2520,9 @@ Be minimal and focused. Only create what's needed.
 
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in human-readable format."""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
+        # Each unit is 10 more bits, so the bit length picks the unit directly
+        unit = min(max(size_bytes.bit_length() - 1, 0) // 10, len(FILE_SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (unit * 10)):.1f} {FILE_SIZE_UNITS[unit]}"
 
     # ============================================================================
     # CONTEXT OPTIMIZATION METHODS - Full 64k Context Window Utilization
@@ -1612,7 +2533,9 @@ Be minimal and focused. Only create what's needed.
         self.console.print("[cyan]🔧 Initializing Context Optimization (64k tokens)...[/cyan]")
         
         # Initialize context tracking
-        self.operation_history = []
+        self.operation_history = deque(maxlen=OPERATION_HISTORY_LIMIT)
+        self._operation_sizes = deque(maxlen=OPERATION_HISTORY_LIMIT)
+        self._history_char_count = 0
         self.task_context = {
             'current_task': None,
             'task_start_time': None,
@@ -1621,6 +2544,10 @@ Be minimal and focused. Only create what's needed.
             'context_summary': '',
             'session_id': str(int(time.time()))
         }
+        # Membership check for files_modified, which keeps first-touched order
+        self._files_modified_set = set()
+        # Last essential context and the state it was extracted from
+        self._essential_cache: Optional[Tuple[Any, str]] = None
         
         self.session_state = {
             'total_operations': 0,
@@ -1639,7 +2566,14 @@ Be minimal and focused. Only create what's needed.
         operation['timestamp'] = time.time()
         operation['session_id'] = self.task_context['session_id']
         
+        # Size each operation once instead of re-measuring the whole history
+        size = len(str(operation))
+        if len(self._operation_sizes) == OPERATION_HISTORY_LIMIT:
+            # The append below evicts the oldest operation
+            self._history_char_count -= self._operation_sizes[0]
         self.operation_history.append(operation)
+        self._operation_sizes.append(size)
+        self._history_char_count += size
         self.session_state['total_operations'] += 1
         
         # Update context size estimation
@@ -1648,8 +2582,7 @@ Be minimal and focused. Only create what's needed.
     def _update_context_size(self) -> None:
         """Update current context size estimation."""
         # Rough estimation: 1 token ≈ 4 characters
-        total_chars = sum(len(str(op)) for op in self.operation_history)
-        self.current_context_size = total_chars // 4
+        self.current_context_size = self._history_char_count // 4
         
         # Calculate utilization percentage
         self.session_state['context_utilization'] = (self.current_context_size / self.max_context_tokens) * 100
@@ -1662,16 +2595,12 @@ Be minimal and focused. Only create what's needed.
         if self.messages:
             context_parts.append("=== CONVERSATION HISTORY ===")
             # Include last 5 conversation exchanges for context continuity
-            recent_messages = self.messages[-10:]  # Last 10 messages (5 exchanges)
+            # Last 10 messages (5 exchanges), without copying the whole history
+            recent_messages = islice(self.messages, max(len(self.messages) - 10, 0), None)
             for msg in recent_messages:
-                role = msg.get('role', 'unknown')
-                content = msg.get('content', '')
-                if role == 'user':
-                    context_parts.append(f"USER: {content}")
-                elif role == 'assistant':
-                    context_parts.append(f"ASSISTANT: {content}")
-                elif role == 'system':
-                    context_parts.append(f"SYSTEM: {content}")
+                prefix = CONTEXT_ROLE_PREFIXES.get(msg.get('role', 'unknown'))
+                if prefix:
+                    context_parts.append(prefix + msg.get('content', ''))
             context_parts.append("=== END CONVERSATION HISTORY ===\n")
         
         # 2. CURRENT TASK CONTEXT (high priority)
@@ -1683,19 +2612,20 @@ Be minimal and focused. Only create what's needed.
             context_parts.append("=== END TASK CONTEXT ===\n")
         
         # 3. RECENT OPERATIONS (medium priority)
-        recent_ops = self.operation_history[-15:]  # Last 15 operations for better continuity
+        # Last 15 operations for better continuity
+        recent_ops = list(islice(self.operation_history, max(len(self.operation_history) - 15, 0), None))
         if recent_ops:
             context_parts.append("=== RECENT OPERATIONS ===")
             for op in recent_ops:
                 op_type = op.get('type', 'unknown')
                 description = op.get('description', '')
-                timestamp = time.strftime('%H:%M:%S', time.localtime(op.get('timestamp', 0)))
+                timestamp = _clock_time(op.get('timestamp', 0))
                 context_parts.append(f"- [{timestamp}] {op_type}: {description}")
             context_parts.append("=== END RECENT OPERATIONS ===\n")
         
         # 4. PROJECT CONTEXT (medium priority)
         context_parts.append("=== PROJECT CONTEXT ===")
-        context_parts.append(f"Workspace Path: {self.workspace_path}")
+        context_parts.append(f"Workspace Path: {self._workspace_root}")
         context_parts.append(f"Accessible Files: {len(self.accessible_files)}")
         context_parts.append(f"Project Type: {self.project_structure.get('type', 'Unknown')}")
         
@@ -1703,24 +2633,22 @@ Be minimal and focused. Only create what's needed.
         if self.recent_changes:
             context_parts.append("Recent File Changes:")
             for change in self.recent_changes[-5:]:  # Last 5 changes
-                file_name = Path(change['file']).name
+                file_name = os.path.basename(change['file'])
                 action = change.get('action', 'modified')
-                timestamp = time.strftime('%H:%M:%S', time.localtime(change['timestamp']))
+                timestamp = _clock_time(change['timestamp'])
                 context_parts.append(f"  - [{timestamp}] {file_name} ({action})")
         context_parts.append("=== END PROJECT CONTEXT ===\n")
         
         # 5. SESSION STATE (low priority)
-        context_parts.append("=== SESSION STATE ===")
-        context_parts.append(f"Total Operations: {self.session_state['total_operations']}")
-        context_parts.append(f"Files Accessed: {len(self.session_state['files_accessed'])}")
-        context_parts.append(f"Context Utilization: {self.session_state['context_utilization']:.1f}%")
-        context_parts.append(f"Current Model: {self.current_model}")
-        context_parts.append("=== END SESSION STATE ===\n")
+        context_parts.append(SESSION_STATE_TEMPLATE % (
+            self.session_state['total_operations'],
+            len(self.session_state['files_accessed']),
+            self.session_state['context_utilization'],
+            self.current_model
+        ))
         
         # 6. CURRENT USER REQUEST (highest priority)
-        context_parts.append("=== CURRENT USER REQUEST ===")
-        context_parts.append(f"User Input: {user_input}")
-        context_parts.append("=== END CURRENT USER REQUEST ===\n")
+        context_parts.append(USER_REQUEST_TEMPLATE % (user_input,))
         
         # 7. ESSENTIAL CONTEXT PRESERVATION (highest priority)
         essential_context = self._extract_essential_context()
@@ -1731,138 +2659,93 @@ Be minimal and focused. Only create what's needed.
             context_parts.append("=== END ESSENTIAL CONTEXT ===\n")
         
         # 8. CONTEXT INSTRUCTIONS (high priority)
-        context_parts.append("=== CONTEXT INSTRUCTIONS ===")
-        context_parts.append("IMPORTANT: Maintain continuity with previous conversation and tasks.")
-        context_parts.append("If the user refers to previous work (like 'change it to', 'make it', etc.),")
-        context_parts.append("refer to the conversation history and current task context above.")
-        context_parts.append("Do not lose track of what was previously created or modified.")
-        context_parts.append("When modifying existing files, preserve the current content and enhance it.")
-        context_parts.append("CRITICAL: Always preserve the ESSENTIAL CONTEXT above in all operations.")
-        context_parts.append("Do not remove or replace existing content unless explicitly requested.")
-        context_parts.append("=== END CONTEXT INSTRUCTIONS ===")
+        context_parts.append(CONTEXT_INSTRUCTIONS)
         
         return "\n".join(context_parts)
 
     def _extract_essential_context(self) -> str:
-        """Extract essential context that must be preserved across all operations."""
+        """Extract essential context that must be preserved across all operations.
+        
+        The result only changes when the recent messages, the current task or
+        the operation history change, so it is reused until one of them does.
+        """
+        # Last 6 messages (3 exchanges)
+        recent_contents = tuple(
+            msg.get('content', '')
+            for msg in islice(self.messages, max(len(self.messages) - 6, 0), None)
+        )
+        cache_key = (
+            recent_contents,
+            self.task_context.get('current_task', ''),
+            self.session_state['total_operations']
+        )
+        if self._essential_cache is not None and self._essential_cache[0] == cache_key:
+            return self._essential_cache[1]
+        
+        essential_context = self._build_essential_context(recent_contents)
+        self._essential_cache = (cache_key, essential_context)
+        return essential_context
+
+    def _build_essential_context(self, recent_contents: Tuple[str, ...]) -> str:
+        """Collect essential context from recent messages, the task and operations."""
         essential_parts = []
         
         # Extract from conversation history
-        if self.messages:
+        if recent_contents:
             # Look for key information in recent messages
-            recent_messages = self.messages[-6:]  # Last 6 messages (3 exchanges)
-            
-            for msg in recent_messages:
-                content = msg.get('content', '').lower()
-                role = msg.get('role', '')
-                
-                # Extract website/HTML context
-                if 'website' in content or 'html' in content or 'web' in content:
-                    essential_parts.append("PROJECT TYPE: Website/HTML project")
+            for content in recent_contents:
+                facts, is_website = _message_facts(content)
+                essential_parts.extend(facts)
+                if is_website:
                     break
-                
-                # Extract location context (Delhi, etc.)
-                if 'delhi' in content or 'location' in content or 'city' in content:
-                    essential_parts.append(f"LOCATION: {self._extract_location_from_content(content)}")
-                
-                # Extract content type context (schools, colleges, etc.)
-                if 'school' in content or 'college' in content or 'university' in content:
-                    content_type = self._extract_content_type_from_content(content)
-                    if content_type:
-                        essential_parts.append(f"CONTENT TYPE: {content_type}")
-                
-                # Extract file type context
-                if 'json' in content:
-                    essential_parts.append("FILE TYPE: JSON data structure")
-                elif 'html' in content or 'website' in content:
-                    essential_parts.append("FILE TYPE: HTML/Website")
         
         # Extract from task context
         current_task = self.task_context.get('current_task', '')
         if current_task:
-            task_lower = current_task.lower()
+            tags = _essential_tags(current_task.lower())
             
             # Extract website context from task
-            if 'website' in task_lower or 'html' in task_lower:
+            if 'website' in tags or 'html' in tags:
                 essential_parts.append("PROJECT TYPE: Website/HTML project")
             
             # Extract location from task
-            if 'delhi' in task_lower:
+            if 'delhi' in tags:
                 essential_parts.append("LOCATION: Delhi")
             
             # Extract content type from task
-            if 'school' in task_lower:
+            if 'school' in tags:
                 essential_parts.append("CONTENT TYPE: Schools")
-            elif 'college' in task_lower:
+            elif 'college' in tags:
                 essential_parts.append("CONTENT TYPE: Colleges")
         
         # Extract from recent operations
-        recent_ops = self.operation_history[-5:]  # Last 5 operations
+        # Last 5 operations
+        recent_ops = islice(self.operation_history, max(len(self.operation_history) - 5, 0), None)
         for op in recent_ops:
-            description = op.get('description', '').lower()
+            tags = _essential_tags(op.get('description', '').lower())
             
             # Check for file creation/modification
-            if 'html' in description or 'website' in description:
+            if 'html' in tags or 'website' in tags:
                 essential_parts.append("PROJECT TYPE: Website/HTML project")
             
             # Check for content type
-            if 'school' in description:
+            if 'school' in tags:
                 essential_parts.append("CONTENT TYPE: Schools")
-            elif 'college' in description:
+            elif 'college' in tags:
                 essential_parts.append("CONTENT TYPE: Colleges")
         
         # Remove duplicates while preserving order
-        seen = set()
-        unique_parts = []
-        for part in essential_parts:
-            if part not in seen:
-                seen.add(part)
-                unique_parts.append(part)
-        
-        return "\n".join(unique_parts) if unique_parts else ""
-
-    def _extract_location_from_content(self, content: str) -> str:
-        """Extract location information from content."""
-        import re
-        
-        # Look for city names
-        cities = ['delhi', 'mumbai', 'bangalore', 'chennai', 'kolkata', 'hyderabad', 'pune', 'ahmedabad']
-        for city in cities:
-            if city in content:
-                return city.title()
-        
-        # Look for location patterns
-        location_patterns = [
-            r'in\s+([A-Za-z]+)',  # "in Delhi"
-            r'of\s+([A-Za-z]+)',  # "of Delhi"
-            r'([A-Za-z]+)\s+schools',  # "Delhi schools"
-            r'([A-Za-z]+)\s+colleges'  # "Delhi colleges"
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, content)
-            if match:
-                return match.group(1).title()
-        
-        return "Unknown"
-
-    def _extract_content_type_from_content(self, content: str) -> str:
-        """Extract content type information from content."""
-        if 'school' in content:
-            return "Schools"
-        elif 'college' in content:
-            return "Colleges"
-        elif 'university' in content:
-            return "Universities"
-        elif 'institute' in content:
-            return "Institutes"
-        return ""
+        return "\n".join(dict.fromkeys(essential_parts))
 
     def _optimize_context_for_64k(self, context: str) -> str:
         """Optimize context to fit within 64k token limit while preserving important information."""
-        # Estimate current context size
-        estimated_tokens = len(context) // 4
+        # Estimate current context size; len() is constant time, so contexts
+        # under budget return here without the string being scanned
+        if len(context) // 4 <= self.max_context_tokens // 2:
+            return context
         
+        # Close to the limit the character estimate is too rough, so count properly
+        estimated_tokens = _count_tokens(context)
         if estimated_tokens <= self.max_context_tokens:
             return context
         
@@ -1870,23 +2753,12 @@ Be minimal and focused. Only create what's needed.
         self.console.print(f"[yellow]⚠️ Context size ({estimated_tokens} tokens) approaching limit. Optimizing...[/yellow]")
         
         # Priority-based context trimming
-        priority_sections = [
-            "=== ESSENTIAL CONTEXT (CRITICAL) ===",
-            "=== CONVERSATION HISTORY ===",
-            "=== CURRENT USER REQUEST ===",
-            "=== CURRENT TASK CONTEXT ===",
-            "=== CONTEXT INSTRUCTIONS ===",
-            "=== RECENT OPERATIONS ===",
-            "=== PROJECT CONTEXT ===",
-            "=== SESSION STATE ==="
-        ]
-        
         optimized_context = []
         remaining_tokens = self.max_context_tokens
         
-        for section in priority_sections:
+        for section in CONTEXT_PRIORITY_SECTIONS:
             section_content = self._extract_section(context, section)
-            section_tokens = len(section_content) // 4
+            section_tokens = _count_tokens(section_content)
             
             if section_tokens <= remaining_tokens:
                 optimized_context.append(section_content)
@@ -1900,22 +2772,24 @@ Be minimal and focused. Only create what's needed.
         return "\n".join(optimized_context)
 
     def _extract_section(self, context: str, section_name: str) -> str:
-        """Extract a specific section from context."""
-        lines = context.split('\n')
-        section_lines = []
-        in_section = False
-        
-        for line in lines:
-            if line.startswith(section_name):
-                in_section = True
-                section_lines.append(line)
-            elif in_section and line.strip() and not line.startswith('- '):
-                # End of section
-                break
-            elif in_section:
-                section_lines.append(line)
+        """Extract a specific section from context.
         
-        return '\n'.join(section_lines)
+        Args:
+            context: Context built by _build_smart_context
+            section_name: Header line that opens the section
+            
+        Returns:
+            The section from its header through its END line, or an empty
+            string if the context has no such section
+        """
+        # Slice between the markers rather than splitting the whole context into lines
+        start = context.find(section_name)
+        if start < 0:
+            return ""
+        end = context.find("=== END", start + len(section_name))
+        if end >= 0:
+            end = context.find("\n", end)
+        return context[start:] if end < 0 else context[start:end]
 
     def _update_task_context(self, task_description: str, files_affected: List[str] = None) -> None:
         """Update current task context for persistent state."""
@@ -1923,7 +2797,7 @@ Be minimal and focused. Only create what's needed.
         previous_task = self.task_context.get('current_task', '')
         
         # If the new task seems related to the previous one, maintain continuity
-        if previous_task and any(keyword in task_description.lower() for keyword in ['change', 'modify', 'update', 'make', 'add', 'remove', 'it', 'this', 'that']):
+        if previous_task and CONTINUATION_RE.search(task_description):
             # This is likely a continuation/modification of the previous task
             self.task_context['current_task'] = f"{previous_task} → {task_description}"
             self.task_context['task_continuation'] = True
@@ -1935,9 +2809,11 @@ Be minimal and focused. Only create what's needed.
         self.task_context['task_start_time'] = time.time()
         
         if files_affected:
-            self.task_context['files_modified'].extend(files_affected)
             # Keep only unique files
-            self.task_context['files_modified'] = list(set(self.task_context['files_modified']))
+            for file_path in files_affected:
+                if file_path not in self._files_modified_set:
+                    self._files_modified_set.add(file_path)
+                    self.task_context['files_modified'].append(file_path)
         
         # Add to operation history with enhanced tracking
         self._add_to_operation_history({
@@ -1958,7 +2834,7 @@ Be minimal and focused. Only create what's needed.
 [bold]Total Operations:[/bold] {self.session_state['total_operations']}
 [bold]Context Utilization:[/bold] {self.session_state['context_utilization']:.1f}%
 [bold]Files Modified:[/bold] {len(self.task_context.get('files_modified', []))}
-[bold]Recent Operations:[/bold] {len(self.operation_history[-5:])} in last 5
+[bold]Recent Operations:[/bold] {min(len(self.operation_history), 5)} in last 5
         """.strip()
         
         return summary
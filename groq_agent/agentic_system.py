@@ -2,7 +2,6 @@
 
 import sys
 import os
-import glob
 import re
 import difflib
 import json
@@ -31,6 +30,62 @@ from .api_client import GroqAPIClient
 from .model_selector import ModelSelector
 from .file_operations import FileOperations
 from .handbook_manager import HandbookManager
+from .workspace_scan import scan_files
+
+
+# File types picked up by the workspace scan
+SCAN_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.scss', '.json', '.yaml',
+    '.yml', '.md', '.txt', '.sh', '.bash', '.java', '.cpp', '.c', '.h', '.hpp',
+    '.go', '.rs', '.php', '.rb', '.sql', '.xml', '.toml', '.ini', '.conf', '.vue',
+    '.svelte', '.r', '.m', '.swift', '.kt', '.scala', '.clj'
+})
+
+# Files picked up by name whatever their extension
+SCAN_FILE_NAMES = frozenset({
+    'Dockerfile', 'Makefile', 'README', 'LICENSE', '.env', '.gitignore',
+    'package.json', 'requirements.txt', 'Cargo.toml', 'pom.xml', 'build.gradle', 'Gemfile',
+    'composer.json', 'pubspec.yaml'
+})
+
+# Lowercase names used to categorize files in the project structure
+DEPENDENCY_FILE_NAMES = frozenset({'package.json', 'requirements.txt', 'cargo.toml', 'pom.xml'})
+CONFIG_FILE_NAMES = frozenset({'dockerfile', 'docker-compose.yml', 'makefile'})
+SOURCE_EXTENSIONS = frozenset({'.py', '.js', '.ts', '.java', '.cpp', '.go'})
+
+# Lowercase root file names that decide the project type, in priority order
+PROJECT_MARKERS = (
+    ('package.json', 'nodejs'),
+    ('requirements.txt', 'python'),
+    ('cargo.toml', 'rust'),
+    ('pom.xml', 'java')
+)
+
+# Display names of languages by lowercase file extension
+LANGUAGE_NAMES = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.jsx': 'React JSX',
+    '.tsx': 'React TSX',
+    '.html': 'HTML',
+    '.css': 'CSS',
+    '.java': 'Java',
+    '.cpp': 'C++',
+    '.c': 'C',
+    '.go': 'Go',
+    '.rs': 'Rust',
+    '.php': 'PHP',
+    '.rb': 'Ruby',
+    '.sql': 'SQL'
+}
+
+# Directories the workspace scan never descends into
+SCAN_IGNORE_DIRS = frozenset({
+    '.git', '__pycache__', 'node_modules', '.venv', 'venv', 'env', '.pytest_cache',
+    '.mypy_cache', 'dist', 'build', 'target', '.idea', '.vscode', 'coverage',
+    '.coverage'
+})
 
 
 class ToolType(Enum):
@@ -130,44 +185,7 @@ class AgenticSystem:
     
     def _get_accessible_files(self) -> Set[str]:
         """Get all accessible files with enhanced filtering."""
-        files = set()
-        
-        # Extended file extensions
-        extensions = {
-            '*.py', '*.js', '*.ts', '*.jsx', '*.tsx', '*.html', '*.css', '*.scss',
-            '*.json', '*.yaml', '*.yml', '*.md', '*.txt', '*.sh', '*.bash',
-            '*.java', '*.cpp', '*.c', '*.h', '*.hpp', '*.go', '*.rs', '*.php',
-            '*.rb', '*.sql', '*.xml', '*.toml', '*.ini', '*.conf', '*.vue',
-            '*.svelte', '*.r', '*.m', '*.swift', '*.kt', '*.scala', '*.clj'
-        }
-        
-        # Scan for files
-        for ext in extensions:
-            files.update(glob.glob(str(self.context.workspace_path / "**" / ext), recursive=True))
-        
-        # Important files without extensions
-        important_files = [
-            'Dockerfile', 'Makefile', 'README', 'LICENSE', '.env', '.gitignore',
-            'package.json', 'requirements.txt', 'Cargo.toml', 'pom.xml',
-            'build.gradle', 'Gemfile', 'composer.json', 'pubspec.yaml'
-        ]
-        for file in important_files:
-            files.update(glob.glob(str(self.context.workspace_path / "**" / file), recursive=True))
-        
-        # Filter out common directories
-        ignore_dirs = {
-            '.git', '__pycache__', 'node_modules', '.venv', 'venv', 'env',
-            '.pytest_cache', '.mypy_cache', 'dist', 'build', 'target',
-            '.idea', '.vscode', 'coverage', '.coverage'
-        }
-        filtered_files = set()
-        
-        for file_path in files:
-            path = Path(file_path)
-            if not any(ignore_dir in path.parts for ignore_dir in ignore_dirs):
-                filtered_files.add(str(path))
-        
-        return filtered_files
+        return scan_files(str(self.context.workspace_path), SCAN_EXTENSIONS, SCAN_FILE_NAMES, SCAN_IGNORE_DIRS)
     
     def _analyze_project_structure(self) -> None:
         """Analyze project structure and categorize files."""
@@ -182,30 +200,30 @@ class AgenticSystem:
         }
         
         for file_path in self.context.accessible_files:
-            path = Path(file_path)
-            file_name = path.name.lower()
+            file_name = os.path.basename(file_path).lower()
             
             # Categorize files
-            if file_name in ['package.json', 'requirements.txt', 'cargo.toml', 'pom.xml']:
-                structure['dependencies'].append(str(path))
+            if file_name in DEPENDENCY_FILE_NAMES:
+                structure['dependencies'].append(file_path)
             elif file_name.startswith('readme') or file_name.endswith('.md'):
-                structure['documentation'].append(str(path))
+                structure['documentation'].append(file_path)
             elif 'test' in file_name or 'spec' in file_name:
-                structure['test_files'].append(str(path))
-            elif file_name in ['dockerfile', 'docker-compose.yml', 'makefile']:
-                structure['config_files'].append(str(path))
-            elif path.suffix in ['.py', '.js', '.ts', '.java', '.cpp', '.go']:
-                structure['source_files'].append(str(path))
-            
-            # Determine project type
-            if file_name == 'package.json':
-                structure['type'] = 'nodejs'
-            elif file_name == 'requirements.txt':
-                structure['type'] = 'python'
-            elif file_name == 'cargo.toml':
-                structure['type'] = 'rust'
-            elif file_name == 'pom.xml':
-                structure['type'] = 'java'
+                structure['test_files'].append(file_path)
+            elif file_name in CONFIG_FILE_NAMES:
+                structure['config_files'].append(file_path)
+            elif os.path.splitext(file_name)[1] in SOURCE_EXTENSIONS:
+                structure['source_files'].append(file_path)
+        
+        # The project type is decided by marker files at the workspace root,
+        # so one listing of the root replaces checking every scanned file
+        try:
+            root_names = {name.lower() for name in os.listdir(self.context.workspace_path)}
+        except OSError:
+            root_names = set()
+        for marker, project_type in PROJECT_MARKERS:
+            if marker in root_names:
+                structure['type'] = project_type
+                break
         
         # Set main files
         if structure['type'] == 'python':
@@ -447,14 +465,15 @@ class AgenticSystem:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
+            complexity = self._analyze_complexity(content)
             analysis = {
                 'file': file_path,
                 'size': len(content),
-                'lines': content.count('\n') + 1,
+                'lines': complexity['total_lines'],
                 'language': self._detect_language(file_path),
-                'complexity': self._analyze_complexity(content),
+                'complexity': complexity,
                 'structure': self._analyze_structure(content),
-                'issues': self._detect_issues(content)
+                'issues': self._detect_issues(content, complexity['total_lines'])
             }
             
             return analysis
@@ -464,36 +483,27 @@ class AgenticSystem:
     
     def _detect_language(self, file_path: str) -> str:
         """Detect programming language from file extension."""
-        ext = Path(file_path).suffix.lower()
-        language_map = {
-            '.py': 'Python',
-            '.js': 'JavaScript',
-            '.ts': 'TypeScript',
-            '.jsx': 'React JSX',
-            '.tsx': 'React TSX',
-            '.html': 'HTML',
-            '.css': 'CSS',
-            '.java': 'Java',
-            '.cpp': 'C++',
-            '.c': 'C',
-            '.go': 'Go',
-            '.rs': 'Rust',
-            '.php': 'PHP',
-            '.rb': 'Ruby',
-            '.sql': 'SQL'
-        }
-        return language_map.get(ext, 'Unknown')
+        return LANGUAGE_NAMES.get(os.path.splitext(file_path)[1].lower(), 'Unknown')
     
     def _analyze_complexity(self, content: str) -> Dict[str, Any]:
         """Analyze code complexity."""
         lines = content.split('\n')
         
+        # Strip each line once and classify it in the same pass
+        empty_lines = comment_lines = 0
+        for line in lines:
+            stripped = line.strip()
+            if not stripped:
+                empty_lines += 1
+            elif stripped[0] == '#':
+                comment_lines += 1
+        
         # Basic complexity metrics
         complexity = {
             'total_lines': len(lines),
-            'code_lines': len([l for l in lines if l.strip() and not l.strip().startswith('#')]),
-            'comment_lines': len([l for l in lines if l.strip().startswith('#')]),
-            'empty_lines': len([l for l in lines if not l.strip()]),
+            'code_lines': len(lines) - empty_lines - comment_lines,
+            'comment_lines': comment_lines,
+            'empty_lines': empty_lines,
             'functions': len(re.findall(r'def\s+\w+', content)),
             'classes': len(re.findall(r'class\s+\w+', content)),
             'imports': len(re.findall(r'import\s+', content))
@@ -513,8 +523,16 @@ class AgenticSystem:
         
         return structure
     
-    def _detect_issues(self, content: str) -> List[Dict[str, Any]]:
-        """Detect potential issues in code."""
+    def _detect_issues(self, content: str, total_lines: int) -> List[Dict[str, Any]]:
+        """Detect potential issues in code.
+        
+        Args:
+            content: File content
+            total_lines: Number of lines in the content
+            
+        Returns:
+            List of detected issues
+        """
         issues = []
         
         # Check for common issues
@@ -525,7 +543,7 @@ class AgenticSystem:
                 'message': 'File is very large (>10KB)'
             })
         
-        if content.count('\n') > 500:
+        if total_lines - 1 > 500:
             issues.append({
                 'type': 'many_lines',
                 'severity': 'warning',
@@ -1,8 +1,20 @@
 """Groq API client for the CLI agent."""
 
 import groq
-from typing import List, Dict, Any, Optional
+import httpx
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
 from .config import ConfigurationManager
+from .rate_limit import RateLimiter, estimate_tokens, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+
+
+# Connection pool shared by all requests from one client, so concurrent and
+# repeated calls reuse warm keep-alive connections instead of new handshakes
+POOL_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+MAX_RETRIES = 3
+# Threads for one chat_many batch; more than the pool's connections would only queue
+MAX_BATCH_WORKERS = 16
 
 
 class GroqAPIClient:
@@ -16,6 +28,8 @@ class GroqAPIClient:
         """
         self.config = config
         self.client = None
+        self.async_client = None
+        self.rate_limiter = None
         self._initialize_client()
     
     def _initialize_client(self) -> None:
@@ -27,7 +41,42 @@ class GroqAPIClient:
                 "or configure it in ~/.groq/config.yaml"
             )
         
-        self.client = groq.Groq(api_key=api_key)
+        self.client = groq.Groq(
+            api_key=api_key,
+            max_retries=MAX_RETRIES,
+            http_client=httpx.Client(limits=POOL_LIMITS)
+        )
+        
+        # Throttle locally instead of hitting 429s and retry backoff
+        rpm, tpm = self.config.get_rate_limits()
+        if rpm or tpm:
+            self.rate_limiter = RateLimiter(rpm or None, tpm or None)
+    
+    def _get_async_client(self) -> groq.AsyncGroq:
+        """Get the asyncio Groq client, creating it on first use.
+        
+        Returns:
+            Async Groq client sharing one connection pool across requests
+        """
+        if self.async_client is None:
+            self.async_client = groq.AsyncGroq(
+                api_key=self.config.get_api_key(),
+                max_retries=MAX_RETRIES,
+                http_client=httpx.AsyncClient(limits=POOL_LIMITS)
+            )
+        return self.async_client
+    
+    async def aclose(self) -> None:
+        """Close the asyncio client and its connection pool, if one was created."""
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
+    
+    async def __aenter__(self) -> "GroqAPIClient":
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
     
     def get_available_models(self) -> List[Dict[str, Any]]:
         """Get list of available models from Groq API.
@@ -65,6 +114,9 @@ class GroqAPIClient:
             "llama-3.1-8B": "Fast 8B parameter model for quick responses",
             "llama-3.1-70B": "High-capability 70B parameter model",
             "llama-3.1-405B": "Ultra-high-capability 405B parameter model",
+            "llama-3.1-8b-instant": "Low-latency 8B parameter model",
+            "llama-3.3-70b-versatile": "Versatile 70B parameter model",
+            "llama-3.3-70b-specdec": "70B parameter model with speculative decoding for faster output",
             "mixtral-8x7b-32768": "Mixture of experts model with 32K context",
             "gemma-7b-it": "Google's Gemma 7B instruction-tuned model",
             "compound-beta": "Multi-tool, high-capability model",
@@ -86,6 +138,9 @@ class GroqAPIClient:
             "llama-3.1-8B": ["text-generation", "chat", "fast-inference"],
             "llama-3.1-70B": ["text-generation", "chat", "code-generation", "reasoning"],
             "llama-3.1-405B": ["text-generation", "chat", "code-generation", "reasoning", "high-accuracy"],
+            "llama-3.1-8b-instant": ["text-generation", "chat", "fast-inference", "low-latency"],
+            "llama-3.3-70b-versatile": ["text-generation", "chat", "code-generation", "reasoning"],
+            "llama-3.3-70b-specdec": ["text-generation", "chat", "code-generation", "reasoning", "speculative-decoding"],
             "mixtral-8x7b-32768": ["text-generation", "chat", "long-context"],
             "gemma-7b-it": ["text-generation", "chat", "instruction-following"],
             "compound-beta": ["text-generation", "chat", "multi-tool", "high-capability"],
@@ -126,7 +181,9 @@ class GroqAPIClient:
         model: str,
         temperature: float = 0.7,
         max_tokens: Optional[int] = 30000,
-        stream: bool = False
+        stream: bool = False,
+        top_p: Optional[float] = None,
+        priority: int = PRIORITY_NORMAL
     ) -> Any:
         """Send chat completion request to Groq API.
         
@@ -136,26 +193,206 @@ class GroqAPIClient:
             temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum tokens to generate (default 30000)
             stream: Whether to stream the response
+            top_p: Optional nucleus sampling threshold
+            priority: Scheduling priority when rate limiting is enabled
             
         Returns:
             Chat completion response
         """
         try:
-            params = {
-                "messages": messages,
-                "model": model,
-                "temperature": temperature,
-                "stream": stream
-            }
-            
-            if max_tokens:
-                params["max_tokens"] = max_tokens
-            
+            params = self._build_completion_params(
+                messages, model, temperature, max_tokens, stream, top_p
+            )
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(estimate_tokens(messages), priority)
             return self.client.chat.completions.create(**params)
         
         except Exception as e:
             raise RuntimeError(f"Error in chat completion: {e}")
     
+    def _build_completion_params(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        stream: bool,
+        top_p: Optional[float]
+    ) -> Dict[str, Any]:
+        """Build the keyword arguments for a chat completion request.
+        
+        Returns:
+            Parameters for chat.completions.create
+        """
+        params = {
+            "messages": messages,
+            "model": model,
+            "temperature": temperature,
+            "stream": stream
+        }
+        
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+        
+        if top_p is not None:
+            params["top_p"] = top_p
+        
+        return params
+    
+    async def chat_completion_async(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = 30000,
+        stream: bool = False,
+        top_p: Optional[float] = None,
+        priority: int = PRIORITY_NORMAL
+    ) -> Any:
+        """Send chat completion request to Groq API without blocking the event loop.
+        
+        Takes the same arguments as chat_completion.
+        
+        Returns:
+            Chat completion response
+        """
+        try:
+            params = self._build_completion_params(
+                messages, model, temperature, max_tokens, stream, top_p
+            )
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(estimate_tokens(messages), priority)
+            return await self._get_async_client().chat.completions.create(**params)
+        
+        except Exception as e:
+            raise RuntimeError(f"Error in chat completion: {e}")
+    
+    def chat_many(
+        self,
+        prompts: List[List[Dict[str, str]]],
+        model: str,
+        **kwargs: Any
+    ) -> List[Any]:
+        """Send a batch of chat completion requests concurrently.
+        
+        The Groq API takes one conversation per request, so the batch is
+        issued as parallel requests over the shared connection pool. Prompts
+        that share a leading prefix (e.g. the same system message) let the
+        server reuse work across the batch.
+        
+        Args:
+            prompts: Message lists, one per completion
+            model: Model to use for every completion
+            **kwargs: Additional chat_completion arguments applied to every request
+            
+        Returns:
+            Chat completion responses in the order of prompts
+        """
+        if not prompts:
+            return []
+        
+        # Batches are bulk work; let interactive requests go first
+        kwargs.setdefault("priority", PRIORITY_LOW)
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_BATCH_WORKERS, len(prompts))) as executor:
+            return list(executor.map(
+                lambda messages: self.chat_completion(messages=messages, model=model, **kwargs),
+                prompts
+            ))
+    
+    async def chat_many_async(
+        self,
+        prompts: List[List[Dict[str, str]]],
+        model: str,
+        **kwargs: Any
+    ) -> List[Any]:
+        """Send a batch of chat completion requests concurrently on the event loop.
+        
+        Takes the same arguments as chat_many.
+        
+        Returns:
+            Chat completion responses in the order of prompts
+        """
+        kwargs.setdefault("priority", PRIORITY_LOW)
+        
+        return list(await asyncio.gather(*(
+            self.chat_completion_async(messages=messages, model=model, **kwargs)
+            for messages in prompts
+        )))
+    
+    def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = 30000,
+        top_p: Optional[float] = None
+    ) -> Iterator[str]:
+        """Stream a chat completion, yielding content as it is generated.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model: Model to use for completion
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum tokens to generate (default 30000)
+            top_p: Optional nucleus sampling threshold
+            
+        Yields:
+            Content fragments of the completion in order
+        """
+        response = self.chat_completion(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            top_p=top_p
+        )
+        try:
+            for chunk in response:
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        finally:
+            # Closing the generator early releases the connection instead of
+            # leaving the rest of the completion unread
+            close = getattr(response, 'close', None)
+            if close is not None:
+                close()
+    
+    async def chat_stream_async(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = 30000,
+        top_p: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """Stream a chat completion on the event loop.
+        
+        Takes the same arguments as chat_stream.
+        
+        Yields:
+            Content fragments of the completion in order
+        """
+        response = await self.chat_completion_async(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            top_p=top_p
+        )
+        try:
+            async for chunk in response:
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        finally:
+            close = getattr(response, 'close', None)
+            if close is not None:
+                await close()
+    
     def generate_code_suggestions(
         self,
         file_content: str,
@@ -196,7 +433,8 @@ class GroqAPIClient:
                 messages=messages,
                 model=model,
                 temperature=temperature,
-                max_tokens=30000
+                max_tokens=30000,
+                priority=PRIORITY_HIGH
             )
             content = response.choices[0].message.content
             
@@ -0,0 +1,176 @@
+"""Persistent response cache for LLM file analyses."""
+
+import os
+import json
+import hashlib
+import inspect
+import functools
+import tempfile
+from pathlib import Path
+from typing import Optional, Callable, Any
+
+
+DEFAULT_CACHE_DIR = Path(os.path.expanduser("~/.cache/groq_agent/responses"))
+# Part of every key; bump it when prompts built outside the cached call change
+CACHE_VERSION = "2"
+
+
+class ResponseCache:
+    """Stores LLM responses on disk keyed by file content, variant, model and request."""
+
+    def __init__(self, cache_dir: Optional[str] = None, refresh: bool = False):
+        """Initialize the response cache.
+
+        Args:
+            cache_dir: Directory to store cached responses. Defaults to
+                ~/.cache/groq_agent/responses
+            refresh: Skip cached entries but still store fresh responses
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.refresh = refresh
+
+    def make_key(self, file_bytes: bytes, variant: str, model: str, request: Any = None) -> str:
+        """Build the cache key for a request.
+
+        Args:
+            file_bytes: Raw content of the analyzed file
+            variant: Analysis type or prompt that shapes the response
+            model: Model used for the request
+            request: JSON-serializable request content, such as the messages sent
+
+        Returns:
+            Hex digest identifying the request
+        """
+        file_hash = hashlib.sha256(file_bytes).hexdigest()
+        request_hash = hashlib.sha256(
+            json.dumps(request, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        return hashlib.sha256(
+            "\0".join((CACHE_VERSION, file_hash, variant, model, request_hash)).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response content, or None on a miss
+        """
+        if self.refresh:
+            return None
+
+        try:
+            with open(self.cache_dir / f"{key}.json", 'r') as f:
+                return json.load(f)["content"]
+        except (IOError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, content: str) -> None:
+        """Store a response in the cache.
+
+        Args:
+            key: Cache key from make_key
+            content: Response content to store
+        """
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so concurrent readers never see a partial entry
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"content": content}, f)
+            os.replace(temp_path, self.cache_dir / f"{key}.json")
+        except IOError:
+            pass
+
+
+def _cache_key(
+    owner: Any,
+    cache: ResponseCache,
+    file_path: str,
+    model: str,
+    variant: str,
+    request: Any
+) -> str:
+    """Build the cache key for a call, reading the file through the owner if it can."""
+    read_bytes = getattr(owner, "_read_bytes", None)
+    if read_bytes is not None:
+        file_bytes = read_bytes(file_path)
+    else:
+        with open(file_path, 'rb') as f:
+            file_bytes = f.read()
+    return cache.make_key(file_bytes, variant, model, request)
+
+
+def _report_hit(owner: Any) -> None:
+    """Tell the user a cached response is being shown."""
+    console = getattr(owner, "console", None)
+    if console is not None:
+        console.print("[dim]Using cached response[/dim]")
+
+
+def cached_llm_call(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Cache the result of an LLM call made on behalf of a file.
+
+    The decorated method must take ``(self, file_path, model, variant, ...)``
+    and return the response content; coroutine methods are supported. Caching
+    is active only when the instance has a ``response_cache`` attribute that
+    is not None.
+
+    Positional arguments after ``variant`` describe the request (messages,
+    prompts) and are part of the key; keyword arguments such as sampling
+    options and callbacks are not.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(
+            self: Any,
+            file_path: str,
+            model: str,
+            variant: str,
+            *args: Any,
+            **kwargs: Any
+        ) -> Any:
+            cache = getattr(self, "response_cache", None)
+            if cache is None:
+                return await func(self, file_path, model, variant, *args, **kwargs)
+
+            key = _cache_key(self, cache, file_path, model, variant, list(args))
+            content = cache.get(key)
+            if content is not None:
+                _report_hit(self)
+                return content
+
+            content = await func(self, file_path, model, variant, *args, **kwargs)
+            if content:
+                cache.set(key, content)
+            return content
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(
+        self: Any,
+        file_path: str,
+        model: str,
+        variant: str,
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        cache = getattr(self, "response_cache", None)
+        if cache is None:
+            return func(self, file_path, model, variant, *args, **kwargs)
+
+        key = _cache_key(self, cache, file_path, model, variant, list(args))
+        content = cache.get(key)
+        if content is not None:
+            _report_hit(self)
+            return content
+
+        content = func(self, file_path, model, variant, *args, **kwargs)
+        if content:
+            cache.set(key, content)
+        return content
+
+    return wrapper
@@ -2,8 +2,11 @@
 
 import sys
 import os
+import re
 import time
-from typing import List, Dict, Any, Optional
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Dict, Any, Optional
 from prompt_toolkit import prompt
 from prompt_toolkit.completion import WordCompleter
 from prompt_toolkit.history import FileHistory
@@ -21,6 +24,7 @@ from rich.text import Text
 from .config import ConfigurationManager
 from .api_client import GroqAPIClient
 from .model_selector import ModelSelector
+from .text_patterns import CODE_MARKER_RE, CONTINUATION_RE
 
 
 class InteractiveChatSession:
@@ -44,8 +48,10 @@ class InteractiveChatSession:
         
         # Chat state
         self.current_model = config.get_default_model()
-        self.messages: List[Dict[str, str]] = []
         self.max_history = config.get_max_history()
+        # Bounded history: each exchange is two messages and appending past
+        # the limit drops the oldest one
+        self.messages: Deque[Dict[str, str]] = deque(maxlen=self.max_history * 2 or None)
         
         # Context Optimization - Full 64k context utilization
         self.operation_history: List[Dict[str, Any]] = []
@@ -359,7 +365,7 @@ The user can now ask questions about this file or request modifications to it.""
         
         self.console.print(f"\n[bold]Recent Messages ({len(self.messages)}):[/bold]")
         
-        for i, message in enumerate(self.messages[-10:], 1):  # Show last 10 messages
+        for i, message in enumerate(islice(self.messages, max(len(self.messages) - 10, 0), None), 1):  # Show last 10 messages
             role = message["role"]
             content = message["content"][:100] + "..." if len(message["content"]) > 100 else message["content"]
             
@@ -378,9 +384,6 @@ The user can now ask questions about this file or request modifications to it.""
             API response or None if error
         """
         try:
-            if len(self.messages) > self.max_history * 2:
-                self.messages = self.messages[-self.max_history * 2:]
-
             smart_context = self._build_smart_context(user_input)
             optimized_context = self._optimize_context_for_64k(smart_context)
 
@@ -395,7 +398,7 @@ The user can now ask questions about this file or request modifications to it.""
             user_message = {"role": "user", "content": user_input}
             self.session_state['models_used'].add(self.current_model)
 
-            messages = self.messages + [context_message]
+            messages = list(self.messages) + [context_message]
             if hasattr(self, 'current_file') and self.current_file:
                 file_context = f"""
 Current file context:
@@ -428,8 +431,6 @@ Please consider the file content when responding to the user's message."""
 
             self.messages.append(user_message)
             self.messages.append({"role": "assistant", "content": response_content})
-            if len(self.messages) > self.max_history * 2:
-                self.messages = self.messages[-self.max_history * 2:]
 
             self._add_to_operation_history({
                 'type': 'ai_response',
@@ -469,15 +470,11 @@ Please consider the file content when responding to the user's message.
             # Replace the last user message with context-enhanced version
             self.messages[-1] = {"role": "user", "content": file_context}
         
-        # Trim history if needed
-        if len(self.messages) > self.max_history * 2:  # *2 because each exchange is 2 messages
-            self.messages = self.messages[-self.max_history * 2:]
-        
         # Show typing indicator
         with Live(Spinner("dots", text="Thinking..."), console=self.console):
             try:
                 response = self.api_client.chat_completion(
-                    messages=self.messages,
+                    messages=list(self.messages),
                     model=self.current_model,
                     temperature=0.7
                 )
@@ -517,10 +514,7 @@ Please consider the file content when responding to the user's message.
         Returns:
             True if contains code blocks
         """
-        return "```" in text or any(keyword in text.lower() for keyword in [
-            "def ", "class ", "import ", "from ", "function ", "var ", "const ",
-            "if __name__", "public class", "private ", "public ", "def main"
-        ])
+        return CODE_MARKER_RE.search(text) is not None
     
     def _display_code_response(self, response: str) -> None:
         """Display response that contains code.
@@ -579,7 +573,7 @@ Please consider the file content when responding to the user's message.
         Returns:
             List of message dictionaries
         """
-        return self.messages.copy()
+        return list(self.messages)
     
     def add_message(self, role: str, content: str) -> None:
         """Add a message to the chat history.
@@ -589,10 +583,6 @@ Please consider the file content when responding to the user's message.
             content: Message content
         """
         self.messages.append({"role": role, "content": content})
-        
-        # Trim history if needed
-        if len(self.messages) > self.max_history * 2:
-            self.messages = self.messages[-self.max_history * 2:]
 
     # ============================================================================
     # CONTEXT OPTIMIZATION METHODS - Full 64k Context Window Utilization
@@ -653,7 +643,7 @@ Please consider the file content when responding to the user's message.
         if self.messages:
             context_parts.append("=== CONVERSATION HISTORY ===")
             # Include last 5 conversation exchanges for context continuity
-            recent_messages = self.messages[-10:]  # Last 10 messages (5 exchanges)
+            recent_messages = islice(self.messages, max(len(self.messages) - 10, 0), None)  # Last 10 messages (5 exchanges)
             for msg in recent_messages:
                 role = msg.get('role', 'unknown')
                 content = msg.get('content', '')
@@ -736,7 +726,7 @@ Please consider the file content when responding to the user's message.
         # Extract from conversation history
         if self.messages:
             # Look for key information in recent messages
-            recent_messages = self.messages[-6:]  # Last 6 messages (3 exchanges)
+            recent_messages = islice(self.messages, max(len(self.messages) - 6, 0), None)  # Last 6 messages (3 exchanges)
             
             for msg in recent_messages:
                 content = msg.get('content', '').lower()
@@ -909,7 +899,7 @@ Please consider the file content when responding to the user's message.
         previous_task = self.task_context.get('current_task', '')
         
         # If the new task seems related to the previous one, maintain continuity
-        if previous_task and any(keyword in task_description.lower() for keyword in ['change', 'modify', 'update', 'make', 'add', 'remove', 'it', 'this', 'that']):
+        if previous_task and CONTINUATION_RE.search(task_description):
             # This is likely a continuation/modification of the previous task
             self.task_context['current_task'] = f"{previous_task} → {task_description}"
             self.task_context['task_continuation'] = True
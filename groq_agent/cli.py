@@ -10,11 +10,9 @@ from typing import Optional, Dict
 
 from .config import ConfigurationManager
 from .api_client import GroqAPIClient
-from .chat_session import InteractiveChatSession
-from .enhanced_chat import EnhancedChatSession
-from .intelligent_agent import IntelligentAgent
 from .model_selector import ModelSelector
 from .file_operations import FileOperations
+from .cache import ResponseCache
 from .handbook_manager import HandbookManager
 from .recursive_agent import RecursiveAgent
 from .agentic_system import AgenticSystem
@@ -172,9 +170,11 @@ def recursive(ctx, goal: str, prompt: str, show_status: bool, goal_id: str):
               type=click.Choice(['comprehensive', 'security', 'performance', 'general']),
               default='comprehensive',
               help='Type of analysis to perform')
+@click.option('--no-cache', is_flag=True, help='Ignore cached responses and refresh them from the model')
+@click.option('--deep', is_flag=True, help='Query the model even when a local linter reports findings')
 @click.argument('file_path', type=click.Path(exists=True))
 @click.pass_context
-def analyze(ctx, model: Optional, type: str, file_path: str):
+def analyze(ctx, model: Optional, type: str, no_cache: bool, deep: bool, file_path: str):
     """Analyze a file and provide insights without modifying it."""
     
     config = ctx.obj['config']
@@ -183,8 +183,8 @@ def analyze(ctx, model: Optional, type: str, file_path: str):
     # Use provided model or default
     current_model = model or config.get_default_model()
     
-    file_ops = FileOperations(api_client)
-    success = file_ops.analyze_file(file_path, current_model, type)
+    file_ops = FileOperations(api_client, ResponseCache(refresh=no_cache))
+    success = file_ops.analyze_file(file_path, current_model, type, deep=deep)
     
     if not success:
         sys.exit(1)
@@ -197,9 +197,11 @@ def analyze(ctx, model: Optional, type: str, file_path: str):
 @click.option('--improvement', '-i', 
               type=click.Choice(['performance', 'security', 'readability', 'documentation', 'testing', 'refactoring']),
               help='Type of improvement to suggest')
+@click.option('--no-cache', is_flag=True, help='Ignore cached responses and refresh them from the model')
 @click.argument('file_path', type=click.Path(exists=True))
 @click.pass_context
-def review(ctx, model: Optional, prompt: Optional, yes: bool, improvement: Optional, file_path: str):
+def review(ctx, model: Optional, prompt: Optional, yes: bool, improvement: Optional,
+           no_cache: bool, file_path: str):
     """Review a file and suggest improvements."""
     
     config = ctx.obj['config']
@@ -208,7 +210,7 @@ def review(ctx, model: Optional, prompt: Optional, yes: bool, improvement: Optio
     # Use provided model or default
     current_model = model or config.get_default_model()
     
-    file_ops = FileOperations(api_client)
+    file_ops = FileOperations(api_client, ResponseCache(refresh=no_cache))
     
     if improvement:
         success = file_ops.suggest_improvements(file_path, current_model, improvement, yes)
@@ -378,6 +380,7 @@ def start_interactive_chat(config: ConfigurationManager, api_client: GroqAPIClie
     while True:
         if mode == "qna":
             # Start enhanced chat in read-only mode
+            from .enhanced_chat import EnhancedChatSession
             handbook_manager = ctx_obj.get('handbook_manager') if ctx_obj else None
             session = EnhancedChatSession(config, api_client, read_only=True, handbook_manager=handbook_manager)
             switch = session.start()
@@ -390,6 +393,7 @@ def start_interactive_chat(config: ConfigurationManager, api_client: GroqAPIClie
             break
         elif mode == "agent":
             # Start intelligent agent mode (can modify files)
+            from .intelligent_agent import IntelligentAgent
             handbook_manager = ctx_obj.get('handbook_manager') if ctx_obj else None
             agent = IntelligentAgent(config, api_client, handbook_manager)
             
@@ -3,7 +3,7 @@
 import os
 import yaml
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 
 class ConfigurationManager:
@@ -52,7 +52,9 @@ class ConfigurationManager:
             "theme": "default",
             "max_history": 200,
             "auto_save": True,
-            "codeflow_first_run": True
+            "codeflow_first_run": True,
+            "rate_limit_rpm": 0,
+            "rate_limit_tpm": 0
         }
     
     def _save_config(self) -> None:
@@ -123,6 +125,10 @@ class ConfigurationManager:
         """Get maximum chat history length."""
         return self.get("max_history", 100)
     
+    def get_rate_limits(self) -> Tuple[int, int]:
+        """Get client-side request and token limits per minute (0 means unlimited)."""
+        return self.get("rate_limit_rpm", 0), self.get("rate_limit_tpm", 0)
+    
     def is_auto_save(self) -> bool:
         """Check if auto-save is enabled."""
         return self.get("auto_save", True)
@@ -2,10 +2,12 @@
 
 import sys
 import os
-import glob
+import re
 import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
+from collections import deque
+from itertools import islice
+from typing import Callable, Deque, List, Dict, Any, Optional, Set
 from prompt_toolkit import prompt
 from prompt_toolkit.completion import WordCompleter
 from prompt_toolkit.history import FileHistory
@@ -32,6 +34,14 @@ from .api_client import GroqAPIClient
 from .model_selector import ModelSelector
 from .file_operations import FileOperations
 from .handbook_manager import HandbookManager
+from .text_patterns import CODE_MARKER_RE, CONTINUATION_RE
+from .workspace_scan import scan_files
+
+
+# Slash commands that switch to a model by its quick-switch shortcut
+MODEL_SHORTCUT_COMMANDS = frozenset({
+    '/fast', '/balanced', '/powerful', '/ultra', '/mixtral', '/gemma', '/compound', '/compound-mini'
+})
 
 
 class EnhancedChatSession:
@@ -64,12 +74,15 @@ class EnhancedChatSession:
         
         # Chat state
         self.current_model = config.get_default_model()
-        self.messages: List[Dict[str, str]] = []
         self.max_history = config.get_max_history()
+        # Bounded history: each exchange is two messages and appending past
+        # the limit drops the oldest one
+        self.messages: Deque[Dict[str, str]] = deque(maxlen=self.max_history * 2 or None)
         
         # File context
         self.workspace_path = Path.cwd()
         self.accessible_files: Set[str] = set()
+        self._by_basename: Dict[str, List[str]] = {}
         self.current_file_context: Optional[Dict[str, Any]] = None
         
         # Context Optimization - Full 64k context utilization
@@ -94,6 +107,7 @@ class EnhancedChatSession:
         if not self.read_only:
             base_commands.append('/edit')
         self.command_completer = WordCompleter(base_commands)
+        self._command_handlers = self._build_command_handlers()
         
         # Auto-scan workspace on startup
         self._scan_workspace()
@@ -105,6 +119,7 @@ class EnhancedChatSession:
         """Automatically scan the workspace for accessible files."""
         with Status("[bold green]Scanning workspace for files...", console=self.console):
             self.accessible_files = self._get_accessible_files()
+            self._index_files()
     
     def _get_accessible_files(self) -> Set[str]:
         """Get all accessible files in the workspace.
@@ -112,35 +127,7 @@ class EnhancedChatSession:
         Returns:
             Set of file paths
         """
-        files = set()
-        
-        # Common file extensions to include
-        extensions = {
-            '*.py', '*.js', '*.ts', '*.jsx', '*.tsx', '*.html', '*.css', 
-            '*.json', '*.yaml', '*.yml', '*.md', '*.txt', '*.sh', '*.bash',
-            '*.java', '*.cpp', '*.c', '*.h', '*.hpp', '*.go', '*.rs', '*.php',
-            '*.rb', '*.sql', '*.xml', '*.toml', '*.ini', '*.conf'
-        }
-        
-        # Scan for files
-        for ext in extensions:
-            files.update(glob.glob(str(self.workspace_path / "**" / ext), recursive=True))
-        
-        # Also include files without extensions that might be important
-        important_files = ['Dockerfile', 'Makefile', 'README', 'LICENSE', '.env', '.gitignore']
-        for file in important_files:
-            files.update(glob.glob(str(self.workspace_path / "**" / file), recursive=True))
-        
-        # Filter out common directories to ignore
-        ignore_dirs = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'env', '.pytest_cache'}
-        filtered_files = set()
-        
-        for file_path in files:
-            path = Path(file_path)
-            if not any(ignore_dir in path.parts for ignore_dir in ignore_dirs):
-                filtered_files.add(str(path))
-        
-        return filtered_files
+        return scan_files(str(self.workspace_path))
     
     def start(self) -> Optional[str]:
         """Start the enhanced interactive chat session.
@@ -310,6 +297,33 @@ class EnhancedChatSession:
             bottom_toolbar=bottom_toolbar
         )
     
+    def _build_command_handlers(self) -> Dict[str, Callable[[str], Optional[bool]]]:
+        """Map slash commands to handlers taking the command arguments.
+        
+        A handler returning True ends the chat session.
+        """
+        return {
+            '/help': lambda args: self._show_enhanced_help(),
+            '/model': lambda args: self._change_model(),
+            '/shortcuts': lambda args: self.model_selector.show_quick_shortcuts(),
+            '/next': lambda args: self._switch_to_next_model(),
+            '/prev': lambda args: self._switch_to_previous_model(),
+            '/files': lambda args: self._list_accessible_files(),
+            '/scan': lambda args: self._rescan_workspace(),
+            '/read': self._read_file,
+            '/edit': self._edit_files,
+            '/clear-context': lambda args: self._clear_file_context(),
+            # Mode switching
+            '/agent': lambda args: self._request_mode_switch('agent'),
+            '/advanced': lambda args: self._request_mode_switch('agentic'),
+            '/qna': lambda args: self.console.print("[yellow]Already in Q&A mode[/yellow]"),
+            '/mode': self._handle_mode_command,
+            '/workspace': lambda args: self._show_workspace_info(),
+            '/context': lambda args: self._show_context_status(),
+            '/clear': lambda args: self._clear_history(),
+            '/exit': lambda args: True
+        }
+    
     def _handle_enhanced_command(self, command: str) -> bool:
         """Handle enhanced slash commands.
         
@@ -323,71 +337,61 @@ class EnhancedChatSession:
         cmd = parts[0].lower()
         args = parts[1] if len(parts) > 1 else ""
         
-        if cmd == '/help':
-            self._show_enhanced_help()
-        elif cmd == '/model':
-            self._change_model()
-        elif cmd == '/shortcuts':
-            self.model_selector.show_quick_shortcuts()
-        elif cmd in ['/fast', '/balanced', '/powerful', '/ultra', '/mixtral', '/gemma', '/compound', '/compound-mini']:
+        handler = self._command_handlers.get(cmd)
+        if handler:
+            return bool(handler(args))
+        
+        if cmd in MODEL_SHORTCUT_COMMANDS:
             shortcut = cmd[1:]  # Remove the leading '/'
             new_model = self.model_selector.quick_switch_model(shortcut)
             if new_model:
                 self.current_model = new_model
                 self.config.set_default_model(new_model)
-        elif cmd == '/next':
-            next_model = self.model_selector.get_next_model(self.current_model)
-            if next_model:
-                self.current_model = next_model
-                self.config.set_default_model(next_model)
-                self.console.print(f"[green]Switched to next model: {next_model}[/green]")
-            else:
-                self.console.print("[red]Could not switch to next model[/red]")
-        elif cmd == '/prev':
-            prev_model = self.model_selector.get_previous_model(self.current_model)
-            if prev_model:
-                self.current_model = prev_model
-                self.config.set_default_model(prev_model)
-                self.console.print(f"[green]Switched to previous model: {prev_model}[/green]")
-            else:
-                self.console.print("[red]Could not switch to previous model[/red]")
-        elif cmd == '/files':
-            self._list_accessible_files()
-        elif cmd == '/scan':
-            self._rescan_workspace()
-        elif cmd == '/read':
-            self._read_file(args)
-        elif cmd == '/edit':
-            if self.read_only:
-                self.console.print("[yellow]Edit is disabled in Q&A (read-only) mode[/yellow]")
-            else:
-                self._edit_files(args)
-        elif cmd == '/clear-context':
-            self._clear_file_context()
-        elif cmd == '/agent' or (cmd == '/mode' and args.strip().lower() == 'agent'):
-            # Switch to Agent mode
-            self._switch_to_mode = 'agent'
-            return True
-        elif cmd == '/advanced' or (cmd == '/mode' and args.strip().lower() == 'advanced'):
-            # Switch to Advanced Agent mode
-            self._switch_to_mode = 'agentic'
-            return True
-        elif cmd == '/qna' or (cmd == '/mode' and args.strip().lower() == 'qna'):
-            self.console.print("[yellow]Already in Q&A mode[/yellow]")
-        elif cmd == '/workspace':
-            self._show_workspace_info()
-        elif cmd == '/context':
-            self._show_context_status()  # Show context optimization status
-        elif cmd == '/clear':
-            self._clear_history()
-        elif cmd == '/exit':
-            return True
         else:
             self.console.print(f"[red]Unknown command: {cmd}[/red]")
             self.console.print("Type /help for available commands")
         
         return False
     
+    def _switch_to_next_model(self) -> None:
+        """Switch to the next model in the rotation."""
+        next_model = self.model_selector.get_next_model(self.current_model)
+        if next_model:
+            self.current_model = next_model
+            self.config.set_default_model(next_model)
+            self.console.print(f"[green]Switched to next model: {next_model}[/green]")
+        else:
+            self.console.print("[red]Could not switch to next model[/red]")
+    
+    def _switch_to_previous_model(self) -> None:
+        """Switch to the previous model in the rotation."""
+        prev_model = self.model_selector.get_previous_model(self.current_model)
+        if prev_model:
+            self.current_model = prev_model
+            self.config.set_default_model(prev_model)
+            self.console.print(f"[green]Switched to previous model: {prev_model}[/green]")
+        else:
+            self.console.print("[red]Could not switch to previous model[/red]")
+    
+    def _request_mode_switch(self, mode: str) -> bool:
+        """Leave the session and ask the caller to start another mode."""
+        self._switch_to_mode = mode
+        return True
+    
+    def _handle_mode_command(self, args: str) -> bool:
+        """Handle /mode <agent|advanced|qna>."""
+        mode = args.strip().lower()
+        if mode == 'agent':
+            return self._request_mode_switch('agent')
+        if mode == 'advanced':
+            return self._request_mode_switch('agentic')
+        if mode == 'qna':
+            self.console.print("[yellow]Already in Q&A mode[/yellow]")
+        else:
+            self.console.print("[red]Unknown command: /mode[/red]")
+            self.console.print("Type /help for available commands")
+        return False
+    
     def _list_accessible_files(self) -> None:
         """List all accessible files in the workspace."""
         if not self.accessible_files:
@@ -421,10 +425,33 @@ class EnhancedChatSession:
             size_bytes /= 1024.0
         return f"{size_bytes:.1f} TB"
     
+    def _index_files(self) -> None:
+        """Index accessible files by file name for command lookups."""
+        self._by_basename = {}
+        for file_path in sorted(self.accessible_files):
+            self._by_basename.setdefault(os.path.basename(file_path), []).append(file_path)
+    
+    def _find_accessible_file(self, query: str) -> Optional[str]:
+        """Find the accessible file a command argument refers to.
+        
+        Args:
+            query: Full path, file name or part of a path
+            
+        Returns:
+            Matching file path, or None if no accessible file matches
+        """
+        if query in self.accessible_files:
+            return query
+        matches = self._by_basename.get(query)
+        if matches:
+            return matches[0]
+        return next((file_path for file_path in self.accessible_files if query in file_path), None)
+    
     def _rescan_workspace(self) -> None:
         """Rescan the workspace for files."""
         with Status("[bold green]Rescanning workspace...", console=self.console):
             self.accessible_files = self._get_accessible_files()
+            self._index_files()
         
         self.console.print(f"[green]Found {len(self.accessible_files)} accessible files[/green]")
     
@@ -435,13 +462,7 @@ class EnhancedChatSession:
             self.console.print("Usage: /read <file_path>")
             return
         
-        # Try to find the file
-        target_file = None
-        for accessible_file in self.accessible_files:
-            if file_path in accessible_file or Path(accessible_file).name == file_path:
-                target_file = accessible_file
-                break
-        
+        target_file = self._find_accessible_file(file_path)
         if not target_file:
             self.console.print(f"[red]File not found: {file_path}[/red]")
             self.console.print("Use /files to see available files")
@@ -485,11 +506,7 @@ class EnhancedChatSession:
         requested = file_paths.split()
         targets: List[str] = []
         for req in requested:
-            target = None
-            for accessible_file in self.accessible_files:
-                if req in accessible_file or Path(accessible_file).name == req:
-                    target = accessible_file
-                    break
+            target = self._find_accessible_file(req)
             if target:
                 targets.append(target)
             else:
@@ -545,9 +562,6 @@ class EnhancedChatSession:
             API response or None if error
         """
         try:
-            if len(self.messages) > self.max_history:
-                self.messages = self.messages[-self.max_history:]
-
             smart_context = self._build_smart_context(user_input)
             optimized_context = self._optimize_context_for_64k(smart_context)
 
@@ -562,7 +576,7 @@ class EnhancedChatSession:
             user_message = {"role": "user", "content": user_input}
             self.session_state['models_used'].add(self.current_model)
 
-            messages = self.messages + [context_message, user_message]
+            messages = list(self.messages) + [context_message, user_message]
 
             with Status("[bold green]🤖 Processing with 64k context optimization...", console=self.console):
                 response = self.api_client.chat_completion(
@@ -583,8 +597,6 @@ class EnhancedChatSession:
 
             self.messages.append(user_message)
             self.messages.append({"role": "assistant", "content": response_content})
-            if len(self.messages) > self.max_history:
-                self.messages = self.messages[-self.max_history:]
 
             self._add_to_operation_history({
                 'type': 'ai_response',
@@ -645,17 +657,12 @@ If they ask to read or modify a file, you can use the /read or /edit commands.
         # Replace the last user message with enhanced version
         self.messages[-1] = {"role": "user", "content": enhanced_message}
         
-        # Trim history if needed (less aggressive trimming)
-        if len(self.messages) > self.max_history * 2:
-            # Keep more messages for better context
-            self.messages = self.messages[-self.max_history * 2:]
-        
         # Show typing indicator
         with Status("[bold green]🤔 Thinking...[/bold green]", console=self.console):
             try:
                 # First attempt with full context
                 response = self.api_client.chat_completion(
-                    messages=self.messages,
+                    messages=list(self.messages),
                     model=self.current_model,
                     temperature=0.7,
                     max_tokens=30000
@@ -720,10 +727,7 @@ If they ask to read or modify a file, you can use the /read or /edit commands.
     
     def _contains_code(self, text: str) -> bool:
         """Check if text contains code blocks."""
-        return "```" in text or any(keyword in text.lower() for keyword in [
-            "def ", "class ", "import ", "from ", "function ", "var ", "const ",
-            "if __name__", "public class", "private ", "public ", "def main"
-        ])
+        return CODE_MARKER_RE.search(text) is not None
     
     def _display_code_response(self, response: str) -> None:
         """Display response that contains code."""
@@ -923,7 +927,7 @@ If they ask to read or modify a file, you can use the /read or /edit commands.
         if self.messages:
             context_parts.append("=== CONVERSATION HISTORY ===")
             # Include last 5 conversation exchanges for context continuity
-            recent_messages = self.messages[-10:]  # Last 10 messages (5 exchanges)
+            recent_messages = islice(self.messages, max(len(self.messages) - 10, 0), None)  # Last 10 messages (5 exchanges)
             for msg in recent_messages:
                 role = msg.get('role', 'unknown')
                 content = msg.get('content', '')
@@ -1007,7 +1011,7 @@ If they ask to read or modify a file, you can use the /read or /edit commands.
         # Extract from conversation history
         if self.messages:
             # Look for key information in recent messages
-            recent_messages = self.messages[-6:]  # Last 6 messages (3 exchanges)
+            recent_messages = islice(self.messages, max(len(self.messages) - 6, 0), None)  # Last 6 messages (3 exchanges)
             
             for msg in recent_messages:
                 content = msg.get('content', '').lower()
@@ -1180,7 +1184,7 @@ If they ask to read or modify a file, you can use the /read or /edit commands.
         previous_task = self.task_context.get('current_task', '')
         
         # If the new task seems related to the previous one, maintain continuity
-        if previous_task and any(keyword in task_description.lower() for keyword in ['change', 'modify', 'update', 'make', 'add', 'remove', 'it', 'this', 'that']):
+        if previous_task and CONTINUATION_RE.search(task_description):
             # This is likely a continuation/modification of the previous task
             self.task_context['current_task'] = f"{previous_task} → {task_description}"
             self.task_context['task_continuation'] = True
@@ -1,11 +1,15 @@
 """File operations component for code review and suggestions."""
 
 import os
+import json
 import stat
+import shutil
+import asyncio
 import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
@@ -13,73 +17,268 @@ from rich.table import Table
 from datetime import datetime
 
 from .api_client import GroqAPIClient
+from .cache import ResponseCache, cached_llm_call, _report_hit
 from .diff_manager import SuggestionDiffManager
 
 
+# Output budgets per analysis type; analyses are short bullet lists
+ANALYSIS_MAX_TOKENS = {
+    "comprehensive": 512,
+    "review": 512,
+    "security": 256,
+    "performance": 256,
+}
+DEFAULT_ANALYSIS_MAX_TOKENS = 512
+
+# Upper bound on concurrent generation requests when creating several files
+MAX_GENERATION_WORKERS = 8
+
+# Local linters that answer an analysis type without a model call
+LOCAL_LINTERS = {
+    "performance": ["ruff", "check", "--output-format=json", "--select", "PERF,C4"],
+    "security": ["bandit", "-f", "json", "-q"],
+}
+
+
 class FileOperations:
     """Handles file-based operations like code review and suggestions."""
     
-    def __init__(self, api_client: GroqAPIClient):
+    def __init__(
+        self,
+        api_client: GroqAPIClient,
+        response_cache: Optional[ResponseCache] = None,
+        console: Optional[Console] = None
+    ):
         """Initialize file operations.
         
         Args:
             api_client: Groq API client instance
+            response_cache: Optional cache for analysis and review responses
+            console: Console to print to. Defaults to a new Console
         """
         self.api_client = api_client
+        self.response_cache = response_cache
         self.diff_manager = SuggestionDiffManager()
-        self.console = Console()
+        self.console = console or Console()
+        # File bytes keyed by path, validated against (mtime_ns, size) on each read
+        self._file_cache: Dict[str, Tuple[int, int, bytes]] = {}
+    
+    def _read_bytes(self, file_path: str) -> bytes:
+        """Read a file's bytes, reusing the cached copy while it is unchanged.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Raw file content
+        """
+        stat_info = os.stat(file_path)
+        cached = self._file_cache.get(file_path)
+        if cached and cached[0] == stat_info.st_mtime_ns and cached[1] == stat_info.st_size:
+            return cached[2]
+        
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        self._file_cache[file_path] = (stat_info.st_mtime_ns, stat_info.st_size, data)
+        return data
+    
+    def _read(self, file_path: str) -> str:
+        """Read a file as text through the byte cache.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            File content with universal newlines, as text-mode open() returns it
+        """
+        text = self._read_bytes(file_path).decode("utf-8")
+        return text.replace("\r\n", "\n").replace("\r", "\n")
     
     def analyze_file(
         self,
         file_path: str,
         model: str,
-        analysis_type: str = "comprehensive"
+        analysis_type: str = "comprehensive",
+        deep: bool = False
     ) -> bool:
         """Analyze a file and provide insights without modifying it.
         
+        Performance and security analyses of Python files first run a local
+        linter (ruff or bandit) when one is installed; if it reports findings
+        they are shown instead of querying the model, unless deep is set.
+        
         Args:
             file_path: Path to the file to analyze
             model: Model to use for analysis
             analysis_type: Type of analysis (comprehensive, security, performance, etc.)
+            deep: Always query the model, even when the local linter finds issues
             
         Returns:
             True if analysis was successful, False otherwise
         """
         try:
-            # Read the file
-            if not os.path.exists(file_path):
-                self.console.print(f"[red]File not found: {file_path}[/red]")
+            prompts = self._prepare_analysis(file_path, [analysis_type])
+            if prompts is None:
                 return False
             
-            with open(file_path, 'r') as f:
-                file_content = f.read()
+            if not deep:
+                findings = self._run_local_linter(file_path, analysis_type)
+                if findings:
+                    self._display_lint_findings(findings, analysis_type)
+                    return True
             
-            # Get file metadata
-            file_info = self._get_file_info(file_path)
+            # Perform analysis, streaming it as it is generated
+            self._start_streamed_results(model, analysis_type)
+            streamed: List[str] = []
+            analysis_content = self._request_analysis(
+                file_path,
+                model,
+                analysis_type,
+                prompts[0],
+                max_tokens=ANALYSIS_MAX_TOKENS.get(analysis_type, DEFAULT_ANALYSIS_MAX_TOKENS),
+                on_token=self._make_stream_echo(streamed)
+            )
+            self._finish_streamed_results(analysis_content, streamed)
             
-            # Display file information
-            self._display_file_info(file_info)
+            return True
             
-            # Show file preview
-            self.console.print(f"\n[bold]File Content Preview:[/bold]")
-            self.diff_manager.show_file_preview(file_path, file_content)
+        except Exception as e:
+            self.console.print(f"[red]Error analyzing file: {e}[/red]")
+            return False
+    
+    async def analyze_file_async(
+        self,
+        file_path: str,
+        model: str,
+        analysis_type: str = "comprehensive",
+        deep: bool = False
+    ) -> bool:
+        """Analyze a file on the event loop; see analyze_file.
+        
+        Args:
+            file_path: Path to the file to analyze
+            model: Model to use for analysis
+            analysis_type: Type of analysis (comprehensive, security, performance, etc.)
+            deep: Always query the model, even when the local linter finds issues
             
-            # Generate analysis prompt
-            analysis_prompt = self._generate_analysis_prompt(file_path, file_content, file_info, analysis_type)
+        Returns:
+            True if analysis was successful, False otherwise
+        """
+        try:
+            prompts = self._prepare_analysis(file_path, [analysis_type])
+            if prompts is None:
+                return False
             
-            # Perform analysis
-            self.console.print(f"\n[bold]Analyzing file with {model}...[/bold]")
-            analysis_result = self.api_client.chat_completion(
-                messages=[{"role": "user", "content": analysis_prompt}],
-                model=model,
-                temperature=0.3,
-                max_tokens=30000
+            if not deep:
+                findings = await asyncio.get_running_loop().run_in_executor(
+                    None, self._run_local_linter, file_path, analysis_type
+                )
+                if findings:
+                    self._display_lint_findings(findings, analysis_type)
+                    return True
+            
+            self._start_streamed_results(model, analysis_type)
+            streamed: List[str] = []
+            analysis_content = await self._request_analysis_async(
+                file_path,
+                model,
+                analysis_type,
+                prompts[0],
+                max_tokens=ANALYSIS_MAX_TOKENS.get(analysis_type, DEFAULT_ANALYSIS_MAX_TOKENS),
+                on_token=self._make_stream_echo(streamed)
             )
+            self._finish_streamed_results(analysis_content, streamed)
             
-            analysis_content = analysis_result.choices[0].message.content
+            return True
             
-            # Display analysis results
-            self._display_analysis_results(analysis_content, analysis_type)
+        except Exception as e:
+            self.console.print(f"[red]Error analyzing file: {e}[/red]")
+            return False
+    
+    def analyze_file_multi(
+        self,
+        file_path: str,
+        model: str,
+        analysis_types: List[str]
+    ) -> bool:
+        """Run several analyses of one file as a single batch of prompts.
+        
+        The file is read once and every analysis shares the same system
+        prefix; only analyses missing from the response cache are sent.
+        
+        Args:
+            file_path: Path to the file to analyze
+            model: Model to use for analysis
+            analysis_types: Analysis types to include (comprehensive, security, etc.)
+            
+        Returns:
+            True if analysis was successful, False otherwise
+        """
+        try:
+            prompts = self._prepare_analysis(file_path, analysis_types)
+            if prompts is None:
+                return False
+            
+            self.console.print(
+                f"\n[bold]Analyzing file with {model} ({', '.join(analysis_types)})...[/bold]"
+            )
+            contents, missing = self._get_cached_analyses(file_path, model, analysis_types, prompts)
+            if missing:
+                responses = self.api_client.chat_many(
+                    [prompts[i] for i in missing],
+                    model=model,
+                    **self._get_batch_params([analysis_types[i] for i in missing])
+                )
+                self._store_batch_responses(
+                    file_path, model, analysis_types, prompts, contents, missing, responses
+                )
+            
+            for analysis_type, analysis_content in zip(analysis_types, contents):
+                self._display_analysis_results(analysis_content, analysis_type)
+            
+            return True
+            
+        except Exception as e:
+            self.console.print(f"[red]Error analyzing file: {e}[/red]")
+            return False
+    
+    async def analyze_file_multi_async(
+        self,
+        file_path: str,
+        model: str,
+        analysis_types: List[str]
+    ) -> bool:
+        """Run several analyses of one file as a batch on the event loop.
+        
+        Args:
+            file_path: Path to the file to analyze
+            model: Model to use for analysis
+            analysis_types: Analysis types to include (comprehensive, security, etc.)
+            
+        Returns:
+            True if analysis was successful, False otherwise
+        """
+        try:
+            prompts = self._prepare_analysis(file_path, analysis_types)
+            if prompts is None:
+                return False
+            
+            self.console.print(
+                f"\n[bold]Analyzing file with {model} ({', '.join(analysis_types)})...[/bold]"
+            )
+            contents, missing = self._get_cached_analyses(file_path, model, analysis_types, prompts)
+            if missing:
+                responses = await self.api_client.chat_many_async(
+                    [prompts[i] for i in missing],
+                    model=model,
+                    **self._get_batch_params([analysis_types[i] for i in missing])
+                )
+                self._store_batch_responses(
+                    file_path, model, analysis_types, prompts, contents, missing, responses
+                )
+            
+            for analysis_type, analysis_content in zip(analysis_types, contents):
+                self._display_analysis_results(analysis_content, analysis_type)
             
             return True
             
@@ -87,6 +286,293 @@ class FileOperations:
             self.console.print(f"[red]Error analyzing file: {e}[/red]")
             return False
     
+    def _prepare_analysis(
+        self,
+        file_path: str,
+        analysis_types: List[str]
+    ) -> Optional[List[List[Dict[str, str]]]]:
+        """Read a file, show its details and build one prompt per analysis type.
+        
+        Args:
+            file_path: Path to the file to analyze
+            analysis_types: Analysis types to build prompts for
+            
+        Returns:
+            Message lists in the order of analysis_types, or None if the file does not exist
+        """
+        if not os.path.exists(file_path):
+            self.console.print(f"[red]File not found: {file_path}[/red]")
+            return None
+        
+        file_content = self._read(file_path)
+        
+        # Get file metadata
+        file_info = self._get_file_info(file_path)
+        
+        # Display file information
+        self._display_file_info(file_info)
+        
+        # Show file preview
+        self.console.print(f"\n[bold]File Content Preview:[/bold]")
+        self.diff_manager.show_file_preview(file_path, file_content)
+        
+        return [
+            self._build_analysis_messages(file_path, file_content, file_info, analysis_type)
+            for analysis_type in analysis_types
+        ]
+    
+    def _get_batch_params(self, analysis_types: List[str]) -> Dict[str, Any]:
+        """Get the sampling parameters shared by a batch of analyses.
+        
+        Args:
+            analysis_types: Analysis types included in the batch
+            
+        Returns:
+            Completion parameters; the output budget fits the largest analysis
+        """
+        return {
+            "temperature": 0,
+            "top_p": 1,
+            "max_tokens": max(
+                ANALYSIS_MAX_TOKENS.get(analysis_type, DEFAULT_ANALYSIS_MAX_TOKENS)
+                for analysis_type in analysis_types
+            )
+        }
+    
+    def _get_cached_analyses(
+        self,
+        file_path: str,
+        model: str,
+        analysis_types: List[str],
+        prompts: List[List[Dict[str, str]]]
+    ) -> Tuple[List[Optional[str]], List[int]]:
+        """Look up a batch of analyses in the response cache.
+        
+        Args:
+            file_path: Path to the analyzed file
+            model: Model used for analysis
+            analysis_types: Analysis types in the batch
+            prompts: Messages for each analysis type
+            
+        Returns:
+            Cached content per analysis type (None on a miss) and the indexes of misses
+        """
+        if self.response_cache is None:
+            return [None] * len(analysis_types), list(range(len(analysis_types)))
+        
+        file_bytes = self._read_bytes(file_path)
+        contents = [
+            # Keys match the ones _request_analysis builds from its messages argument
+            self.response_cache.get(
+                self.response_cache.make_key(file_bytes, analysis_type, model, [messages])
+            )
+            for analysis_type, messages in zip(analysis_types, prompts)
+        ]
+        missing = [i for i, content in enumerate(contents) if content is None]
+        if len(missing) < len(analysis_types):
+            _report_hit(self)
+        return contents, missing
+    
+    def _store_batch_responses(
+        self,
+        file_path: str,
+        model: str,
+        analysis_types: List[str],
+        prompts: List[List[Dict[str, str]]],
+        contents: List[Optional[str]],
+        missing: List[int],
+        responses: List[Any]
+    ) -> None:
+        """Fill in and cache the analyses returned for the cache misses of a batch.
+        
+        Args:
+            file_path: Path to the analyzed file
+            model: Model used for analysis
+            analysis_types: Analysis types in the batch
+            prompts: Messages for each analysis type
+            contents: Content per analysis type, updated in place
+            missing: Indexes of the analyses that were requested
+            responses: Completion responses in the order of missing
+        """
+        file_bytes = self._read_bytes(file_path) if self.response_cache is not None else b""
+        for i, response in zip(missing, responses):
+            contents[i] = response.choices[0].message.content
+            if self.response_cache is not None and contents[i]:
+                self.response_cache.set(
+                    self.response_cache.make_key(file_bytes, analysis_types[i], model, [prompts[i]]),
+                    contents[i]
+                )
+    
+    def _run_local_linter(self, file_path: str, analysis_type: str) -> Optional[List[str]]:
+        """Run the local linter registered for an analysis type.
+        
+        Args:
+            file_path: Path to the file to lint
+            analysis_type: Type of analysis being performed
+            
+        Returns:
+            Findings formatted as markdown bullets, or None if no linter applies
+        """
+        command = LOCAL_LINTERS.get(analysis_type)
+        if not command or Path(file_path).suffix.lower() != '.py' or not shutil.which(command[0]):
+            return None
+        
+        try:
+            result = subprocess.run(command + [file_path], capture_output=True, text=True, timeout=30)
+            report = json.loads(result.stdout)
+        except (subprocess.SubprocessError, OSError, ValueError):
+            return None
+        
+        if command[0] == "ruff":
+            return [
+                f"- Line {item['location']['row']}: `{item['code']}` {item['message']}"
+                for item in report
+            ]
+        return [
+            f"- Line {item['line_number']}: `{item['test_id']}` ({item['issue_severity']}) {item['issue_text']}"
+            for item in report.get("results", [])
+        ]
+    
+    def _display_lint_findings(self, findings: List[str], analysis_type: str) -> None:
+        """Display local linter findings in place of a model analysis.
+        
+        Args:
+            findings: Findings formatted as markdown bullets
+            analysis_type: Type of analysis performed
+        """
+        self._display_analysis_results("\n".join(findings), analysis_type)
+        self.console.print("[dim]Found by the local linter; use --deep for a model analysis[/dim]")
+    
+    def _start_streamed_results(self, model: str, analysis_type: str) -> None:
+        """Print the header that streamed analysis output appears under.
+        
+        Args:
+            model: Model performing the analysis
+            analysis_type: Type of analysis being performed
+        """
+        self.console.print(f"\n[bold]Analyzing file with {model}...[/bold]")
+        self.console.rule(f"Analysis Results ({analysis_type.title()})", style="green")
+    
+    def _make_stream_echo(self, streamed: List[str]) -> Callable[[str], None]:
+        """Create a callback that prints streamed tokens and records them.
+        
+        Args:
+            streamed: List that receives each printed token
+            
+        Returns:
+            Token callback for _request_analysis
+        """
+        def echo(token: str) -> None:
+            streamed.append(token)
+            self.console.out(token, end="", highlight=False)
+        
+        return echo
+    
+    def _finish_streamed_results(self, analysis_content: str, streamed: List[str]) -> None:
+        """Close the streamed analysis output.
+        
+        Args:
+            analysis_content: Complete analysis content
+            streamed: Tokens already printed while streaming
+        """
+        # Cached responses are returned whole rather than streamed
+        if not streamed:
+            self.console.out(analysis_content, end="", highlight=False)
+        self.console.out("")
+        self.console.rule(style="green")
+    
+    @cached_llm_call
+    def _request_analysis(
+        self,
+        file_path: str,
+        model: str,
+        analysis_type: str,
+        messages: List[Dict[str, str]],
+        *,
+        on_token: Callable[[str], None],
+        max_tokens: int = DEFAULT_ANALYSIS_MAX_TOKENS
+    ) -> str:
+        """Request an analysis of a file from the model, streaming it as it is generated.
+        
+        Args:
+            file_path: Path to the analyzed file (used for caching)
+            model: Model to use for analysis
+            analysis_type: Type of analysis being requested
+            messages: Messages containing the file and instructions
+            on_token: Callback that receives streamed content fragments
+            max_tokens: Maximum tokens to generate
+            
+        Returns:
+            Analysis content returned by the model
+        """
+        fragments = []
+        for token in self.api_client.chat_stream(
+            messages=messages,
+            model=model,
+            temperature=0,
+            max_tokens=max_tokens,
+            top_p=1
+        ):
+            on_token(token)
+            fragments.append(token)
+        return "".join(fragments)
+    
+    @cached_llm_call
+    async def _request_analysis_async(
+        self,
+        file_path: str,
+        model: str,
+        analysis_type: str,
+        messages: List[Dict[str, str]],
+        *,
+        on_token: Callable[[str], None],
+        max_tokens: int = DEFAULT_ANALYSIS_MAX_TOKENS
+    ) -> str:
+        """Request an analysis of a file from the model on the event loop.
+        
+        Takes the same arguments as _request_analysis.
+        
+        Returns:
+            Analysis content returned by the model
+        """
+        fragments = []
+        async for token in self.api_client.chat_stream_async(
+            messages=messages,
+            model=model,
+            temperature=0,
+            max_tokens=max_tokens,
+            top_p=1
+        ):
+            on_token(token)
+            fragments.append(token)
+        return "".join(fragments)
+    
+    @cached_llm_call
+    def _request_suggestions(
+        self,
+        file_path: str,
+        model: str,
+        prompt: str,
+        original_content: str
+    ) -> str:
+        """Request improved file content from the model.
+        
+        Args:
+            file_path: Path to the reviewed file (used for caching)
+            model: Model to use for suggestions
+            prompt: Review prompt
+            original_content: Current file content
+            
+        Returns:
+            Suggested file content
+        """
+        return self.api_client.generate_code_suggestions(
+            file_content=original_content,
+            prompt=prompt,
+            model=model,
+            temperature=0.3
+        )
+    
     def _get_file_info(self, file_path: str) -> Dict[str, Any]:
         """Get comprehensive file information.
         
@@ -168,8 +654,18 @@ class FileOperations:
         
         self.console.print(table)
     
-    def _generate_analysis_prompt(self, file_path: str, file_content: str, file_info: Dict[str, Any], analysis_type: str) -> str:
-        """Generate analysis prompt based on file type and analysis type.
+    def _build_analysis_messages(
+        self,
+        file_path: str,
+        file_content: str,
+        file_info: Dict[str, Any],
+        analysis_type: str
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for one analysis of a file.
+        
+        The file goes in an identical system message for every analysis type
+        and only the trailing user instruction differs, so requests for the
+        same file share a common prefix the server can reuse.
         
         Args:
             file_path: Path to the file
@@ -178,117 +674,53 @@ class FileOperations:
             analysis_type: Type of analysis to perform
             
         Returns:
-            Generated analysis prompt
+            Messages for the analysis request
         """
-        base_prompt = f"""
-Analyze the following file and provide detailed insights:
-
-File: {file_path}
-Type: {file_info['file_type']}
-Size: {file_info['size_human']}
-Lines: {file_info['lines']}
-
-File Content:
-{file_content}
-
-Please provide a comprehensive analysis including:
-"""
+        return [
+            {
+                "role": "system",
+                "content": "You are a code analyst. "
+                + self._format_analysis_source(file_path, file_content, file_info)
+            },
+            {"role": "user", "content": self._get_analysis_instructions(analysis_type)}
+        ]
+    
+    def _format_analysis_source(self, file_path: str, file_content: str, file_info: Dict[str, Any]) -> str:
+        """Format the file header and content shared by analysis prompts.
         
-        if analysis_type == "comprehensive":
-            analysis_prompt = base_prompt + """
-1. **Code Quality Assessment**
-   - Readability and maintainability
-   - Code structure and organization
-   - Naming conventions
-   - Documentation quality
-
-2. **Technical Analysis**
-   - Potential bugs or issues
-   - Performance considerations
-   - Security vulnerabilities
-   - Best practices compliance
-
-3. **Architecture & Design**
-   - Design patterns used
-   - Coupling and cohesion
-   - Scalability considerations
-   - Testability
-
-4. **Improvement Suggestions**
-   - Specific recommendations
-   - Refactoring opportunities
-   - Optimization suggestions
-   - Documentation improvements
-
-5. **Risk Assessment**
-   - Potential issues
-   - Maintenance concerns
-   - Technical debt indicators
-
-Please provide actionable insights and specific recommendations.
-"""
-        elif analysis_type == "security":
-            analysis_prompt = base_prompt + """
-Focus on security analysis:
-
-1. **Security Vulnerabilities**
-   - Input validation issues
-   - Authentication/authorization problems
-   - Data exposure risks
-   - Injection vulnerabilities
-
-2. **Security Best Practices**
-   - Secure coding practices
-   - Data protection measures
-   - Error handling security
-   - Logging and monitoring
-
-3. **Risk Assessment**
-   - Critical security issues
-   - Medium priority concerns
-   - Low priority recommendations
-
-4. **Remediation Steps**
-   - Specific fixes needed
-   - Security improvements
-   - Testing recommendations
-"""
-        elif analysis_type == "performance":
-            analysis_prompt = base_prompt + """
-Focus on performance analysis:
-
-1. **Performance Issues**
-   - Bottlenecks and inefficiencies
-   - Resource usage problems
-   - Algorithm complexity
-   - Memory management
-
-2. **Optimization Opportunities**
-   - Code optimizations
-   - Data structure improvements
-   - Caching strategies
-   - Parallelization potential
+        Args:
+            file_path: Path to the file
+            file_content: File content
+            file_info: File metadata
+            
+        Returns:
+            File section of an analysis prompt
+        """
+        return f"""File: {file_path} ({file_info['file_type']}, {file_info['lines']} lines)
 
-3. **Performance Metrics**
-   - Time complexity analysis
-   - Space complexity analysis
-   - Resource usage patterns
+{file_content}
 
-4. **Performance Recommendations**
-   - Specific optimizations
-   - Best practices
-   - Monitoring suggestions
-"""
-        else:
-            analysis_prompt = base_prompt + """
-Provide a general analysis covering:
-- Code quality and structure
-- Potential issues and improvements
-- Best practices compliance
-- Specific recommendations
 """
+    
+    def _get_analysis_instructions(self, analysis_type: str) -> str:
+        """Get the type-specific instruction for an analysis prompt.
         
-        return analysis_prompt
+        Args:
+            analysis_type: Type of analysis to perform
+            
+        Returns:
+            Instruction text for the analysis type
+        """
+        instructions = {
+            "comprehensive": "Analyze for code quality, bugs, design and risks with specific fixes. Return a bullet list, <200 words.",
+            "security": "Analyze for security vulnerabilities (validation, auth, data exposure, injection) with fixes. Return a bullet list, <150 words.",
+            "performance": "Analyze for performance issues (complexity, memory, bottlenecks) with optimizations. Return a bullet list, <150 words.",
+            "review": "Review for readability, error handling, documentation and testability improvements. Return a bullet list, <200 words.",
+        }
+        return instructions.get(
+            analysis_type,
+            "Analyze for code quality, potential issues and best practices. Return a bullet list, <200 words."
+        )
     
     def _display_analysis_results(self, analysis_content: str, analysis_type: str) -> None:
         """Display analysis results in a formatted way.
@@ -332,8 +764,7 @@ Provide a general analysis covering:
                 self.console.print(f"[red]File not found: {file_path}[/red]")
                 return False
             
-            with open(file_path, 'r') as f:
-                original_content = f.read()
+            original_content = self._read(file_path)
             
             # Get file information
             file_info = self._get_file_info(file_path)
@@ -356,12 +787,7 @@ Provide a general analysis covering:
             
             # Generate suggestions
             self.console.print("\n[bold]Generating suggestions...[/bold]")
-            suggested_content = self.api_client.generate_code_suggestions(
-                file_content=original_content,
-                prompt=prompt,
-                model=model,
-                temperature=0.3
-            )
+            suggested_content = self._request_suggestions(file_path, model, prompt, original_content)
             
             if not suggested_content:
                 self.console.print("[red]No suggestions generated[/red]")
@@ -406,8 +832,7 @@ Provide a general analysis covering:
                 self.console.print(f"[red]File not found: {path}[/red]")
                 results[path] = False
                 continue
-            with open(path, "r") as f:
-                file_contents[path] = f.read()
+            file_contents[path] = self._read(path)
 
         for path in file_paths:
             if path not in file_contents:
@@ -684,25 +1109,29 @@ Return the improved code with all enhancements applied.
         # Generate content for all files first
         file_contents: Dict[str, str] = {}
         
+        # Don't ask to overwrite - just proceed with changes
+        # File existence will be shown in the diff preview
         for spec in file_specs:
-            file_path = spec['path']
-            prompt = spec['prompt']
-            
-            # Don't ask to overwrite - just proceed with changes
-            # File existence will be shown in the diff preview
-            
-            # Generate file content
-            self.console.print(f"\n[bold]Generating file: {file_path}[/bold]")
-            
+            self.console.print(f"\n[bold]Generating file: {spec['path']}[/bold]")
+        
+        def generate(spec: Dict[str, str]) -> Optional[str]:
             # Enhance prompt with file type information
-            enhanced_prompt = self._enhance_file_creation_prompt(prompt, file_path)
-            
-            content = self.api_client.generate_code_suggestions(
+            enhanced_prompt = self._enhance_file_creation_prompt(spec['prompt'], spec['path'])
+            return self.api_client.generate_code_suggestions(
                 file_content="",  # Empty for new file
                 prompt=enhanced_prompt,
                 model=model,
                 temperature=0.7
             )
+        
+        # Files are independent, so their generation requests run concurrently
+        contents: List[Optional[str]] = []
+        if file_specs:
+            with ThreadPoolExecutor(max_workers=min(MAX_GENERATION_WORKERS, len(file_specs))) as executor:
+                contents = list(executor.map(generate, file_specs))
+        
+        for spec, content in zip(file_specs, contents):
+            file_path = spec['path']
             
             if not content:
                 self.console.print(f"[red]Failed to generate content for {file_path}[/red]")
@@ -2,7 +2,6 @@
 
 import sys
 import os
-import glob
 import re
 import difflib
 from pathlib import Path
@@ -31,6 +30,11 @@ from .model_selector import ModelSelector
 from .file_operations import FileOperations
 from .handbook_manager import HandbookManager
 from .recursive_agent import RecursiveAgent
+from .workspace_scan import scan_files
+
+
+# Extensions of files counted as source code
+SOURCE_EXTENSIONS = frozenset({'.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c'})
 
 
 class IntelligentAgent:
@@ -85,35 +89,7 @@ class IntelligentAgent:
     
     def _get_accessible_files(self) -> Set[str]:
         """Get all accessible files in the workspace."""
-        files = set()
-        
-        # Common file extensions
-        extensions = {
-            '*.py', '*.js', '*.ts', '*.jsx', '*.tsx', '*.html', '*.css', 
-            '*.json', '*.yaml', '*.yml', '*.md', '*.txt', '*.sh', '*.bash',
-            '*.java', '*.cpp', '*.c', '*.h', '*.hpp', '*.go', '*.rs', '*.php',
-            '*.rb', '*.sql', '*.xml', '*.toml', '*.ini', '*.conf'
-        }
-        
-        # Scan for files
-        for ext in extensions:
-            files.update(glob.glob(str(self.workspace_path / "**" / ext), recursive=True))
-        
-        # Important files without extensions
-        important_files = ['Dockerfile', 'Makefile', 'README', 'LICENSE', '.env', '.gitignore']
-        for file in important_files:
-            files.update(glob.glob(str(self.workspace_path / "**" / file), recursive=True))
-        
-        # Filter out common directories
-        ignore_dirs = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'env', '.pytest_cache'}
-        filtered_files = set()
-        
-        for file_path in files:
-            path = Path(file_path)
-            if not any(ignore_dir in path.parts for ignore_dir in ignore_dirs):
-                filtered_files.add(str(path))
-        
-        return filtered_files
+        return scan_files(str(self.workspace_path))
     
     def _analyze_project_structure(self) -> None:
         """Analyze the project structure and key files."""
@@ -128,15 +104,16 @@ class IntelligentAgent:
     
     def _detect_project_type(self) -> str:
         """Detect the type of project."""
-        files = [Path(f).name for f in self.accessible_files]
+        # One pass collects the extensions present instead of one pass per type
+        extensions = {os.path.splitext(f)[1] for f in self.accessible_files}
         
-        if any(f.endswith('.py') for f in files):
+        if '.py' in extensions:
             return 'python'
-        elif any(f.endswith('.js') or f.endswith('.ts') for f in files):
+        elif '.js' in extensions or '.ts' in extensions:
             return 'javascript'
-        elif any(f.endswith('.html') for f in files):
+        elif '.html' in extensions:
             return 'web'
-        elif any(f.endswith('.java') for f in files):
+        elif '.java' in extensions:
             return 'java'
         else:
             return 'unknown'
@@ -145,36 +122,35 @@ class IntelligentAgent:
         """Find main application files."""
         main_files = []
         for file_path in self.accessible_files:
-            path = Path(file_path)
-            if any(name in path.name.lower() for name in ['main', 'app', 'index', 'server']):
-                main_files.append(str(path))
+            file_name = os.path.basename(file_path).lower()
+            if any(name in file_name for name in ('main', 'app', 'index', 'server')):
+                main_files.append(file_path)
         return main_files
     
     def _find_config_files(self) -> List[str]:
         """Find configuration files."""
         config_files = []
         for file_path in self.accessible_files:
-            path = Path(file_path)
-            if any(name in path.name.lower() for name in ['config', 'settings', 'package.json', 'requirements.txt']):
-                config_files.append(str(file_path))
+            file_name = os.path.basename(file_path).lower()
+            if any(name in file_name for name in ('config', 'settings', 'package.json', 'requirements.txt')):
+                config_files.append(file_path)
         return config_files
     
     def _find_source_files(self) -> List[str]:
         """Find source code files."""
         source_files = []
         for file_path in self.accessible_files:
-            path = Path(file_path)
-            if path.suffix in ['.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c']:
-                source_files.append(str(file_path))
+            if os.path.splitext(file_path)[1] in SOURCE_EXTENSIONS:
+                source_files.append(file_path)
         return source_files
     
     def _find_test_files(self) -> List[str]:
         """Find test files."""
         test_files = []
         for file_path in self.accessible_files:
-            path = Path(file_path)
-            if 'test' in path.name.lower() or 'spec' in path.name.lower():
-                test_files.append(str(file_path))
+            file_name = os.path.basename(file_path).lower()
+            if 'test' in file_name or 'spec' in file_name:
+                test_files.append(file_path)
         return test_files
     
     def _read_file_content(self, file_path: str) -> str:
@@ -18,14 +18,15 @@ from .api_client import GroqAPIClient
 class ModelSelector:
     """Interactive model selection component."""
     
-    def __init__(self, api_client: GroqAPIClient):
+    def __init__(self, api_client: GroqAPIClient, console: Optional[Console] = None):
         """Initialize the model selector.
         
         Args:
             api_client: Groq API client instance
+            console: Console to print to. Defaults to a new Console
         """
         self.api_client = api_client
-        self.console = Console()
+        self.console = console or Console()
         
         # Quick model shortcuts for easy switching
         self.quick_models = {
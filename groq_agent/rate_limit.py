@@ -0,0 +1,136 @@
+"""Client-side rate limiting for Groq API requests."""
+
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Rough characters-per-token ratio used to estimate prompt size before sending
+CHARS_PER_TOKEN = 4
+
+# How often async waiters re-check the window while another request is ahead
+ASYNC_POLL_INTERVAL = 0.05
+
+
+def estimate_tokens(messages: List[Dict[str, str]]) -> int:
+    """Estimate the prompt tokens of a chat request.
+
+    Args:
+        messages: List of message dictionaries with 'role' and 'content'
+
+    Returns:
+        Approximate token count of the messages
+    """
+    return sum(len(message.get("content") or "") for message in messages) // CHARS_PER_TOKEN + 1
+
+
+class RateLimiter:
+    """Sliding-window limiter for requests and tokens per minute.
+
+    Callers are served in priority order (PRIORITY_HIGH first), then in
+    arrival order, so interactive requests overtake queued bulk work.
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None, window: float = 60.0):
+        """Initialize the rate limiter.
+
+        Args:
+            rpm: Maximum requests per window, or None for no request limit
+            tpm: Maximum tokens per window, or None for no token limit
+            window: Window length in seconds
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self._requests: Deque[float] = deque()
+        self._tokens: Deque[Tuple[float, int]] = deque()
+        self._token_total = 0
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def acquire(self, tokens: int = 0, priority: int = PRIORITY_NORMAL) -> None:
+        """Block until a request of the given size may be sent.
+
+        Args:
+            tokens: Estimated tokens the request will use
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+        """
+        with self._condition:
+            entry = self._enqueue(priority)
+            try:
+                while True:
+                    wait = self._try_acquire(entry, tokens)
+                    if wait == 0:
+                        return
+                    self._condition.wait(timeout=wait)
+            finally:
+                self._dequeue(entry)
+
+    async def acquire_async(self, tokens: int = 0, priority: int = PRIORITY_NORMAL) -> None:
+        """Wait on the event loop until a request of the given size may be sent.
+
+        Args:
+            tokens: Estimated tokens the request will use
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+        """
+        with self._condition:
+            entry = self._enqueue(priority)
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_acquire(entry, tokens)
+                if wait == 0:
+                    return
+                await asyncio.sleep(wait or ASYNC_POLL_INTERVAL)
+        finally:
+            with self._condition:
+                self._dequeue(entry)
+
+    def _enqueue(self, priority: int) -> Tuple[int, int]:
+        entry = (priority, next(self._sequence))
+        heapq.heappush(self._waiters, entry)
+        return entry
+
+    def _dequeue(self, entry: Tuple[int, int]) -> None:
+        if entry in self._waiters:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+        self._condition.notify_all()
+
+    def _try_acquire(self, entry: Tuple[int, int], tokens: int) -> Optional[float]:
+        """Record the request if it is first in line and fits the window.
+
+        Returns:
+            0 when the request was admitted, seconds until the window frees up
+            when it is first in line, or None while other requests are ahead
+        """
+        if self._waiters[0] != entry:
+            return None
+
+        now = time.monotonic()
+        cutoff = now - self.window
+        while self._requests and self._requests[0] <= cutoff:
+            self._requests.popleft()
+        while self._tokens and self._tokens[0][0] <= cutoff:
+            self._token_total -= self._tokens.popleft()[1]
+
+        if self.rpm and len(self._requests) >= self.rpm:
+            return self._requests[0] - cutoff
+        # A request larger than the whole budget is admitted once the window is empty
+        if self.tpm and self._tokens and self._token_total + tokens > self.tpm:
+            return self._tokens[0][0] - cutoff
+
+        self._requests.append(now)
+        if tokens:
+            self._tokens.append((now, tokens))
+            self._token_total += tokens
+        return 0
@@ -0,0 +1,18 @@
+"""Text patterns shared by the chat modes."""
+
+import re
+
+
+# Markers that make a response render as code; "```" covers fenced blocks
+CODE_MARKER_RE = re.compile(
+    r"```|def |class |import |from |function |var |const |if __name__|private |public ",
+    re.IGNORECASE
+)
+
+# Words that make a new task a follow-up to the previous one. Verbs are
+# matched as word stems so "changed", "adding" or "updates" count too;
+# pronouns must be whole words so "it" doesn't match inside "edit"
+CONTINUATION_RE = re.compile(
+    r"\b(?:chang|modif|updat|mak|made|add|remov)\w*|\b(?:it|this|that)\b",
+    re.IGNORECASE
+)
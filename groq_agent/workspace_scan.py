@@ -0,0 +1,50 @@
+"""Workspace file discovery shared by the chat modes."""
+
+import os
+from typing import AbstractSet, Set
+
+
+# File types picked up by the workspace scan
+SCAN_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.json', '.yaml', '.yml',
+    '.md', '.txt', '.sh', '.bash', '.java', '.cpp', '.c', '.h', '.hpp', '.go',
+    '.rs', '.php', '.rb', '.sql', '.xml', '.toml', '.ini', '.conf'
+})
+
+# Files picked up by name whatever their extension
+SCAN_FILE_NAMES = frozenset({
+    'Dockerfile', 'Makefile', 'README', 'LICENSE', '.env', '.gitignore'
+})
+
+# Directories the workspace scan never descends into
+SCAN_IGNORE_DIRS = frozenset({
+    '.git', '__pycache__', 'node_modules', '.venv', 'venv', 'env', '.pytest_cache'
+})
+
+
+def scan_files(root: str,
+               extensions: AbstractSet[str] = SCAN_EXTENSIONS,
+               file_names: AbstractSet[str] = SCAN_FILE_NAMES,
+               ignore_dirs: AbstractSet[str] = SCAN_IGNORE_DIRS) -> Set[str]:
+    """Find the files of a workspace the agents may work with.
+    
+    The tree is walked once and ignored directories are pruned before they are
+    descended into. Hidden directories are skipped; hidden files are only
+    picked up when listed by name, such as .env.
+    
+    Args:
+        root: Workspace directory
+        extensions: Extensions of files to pick up
+        file_names: File names picked up whatever their extension
+        ignore_dirs: Directory names never descended into
+        
+    Returns:
+        Absolute paths of the matching files
+    """
+    files = set()
+    for dir_path, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in ignore_dirs and d[0] != '.']
+        for name in names:
+            if name in file_names or (name[0] != '.' and os.path.splitext(name)[1] in extensions):
+                files.add(os.path.join(dir_path, name))
+    return files
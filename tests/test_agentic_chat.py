@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 
+from groq_agent import agentic_chat
 from groq_agent.agentic_chat import AgenticChat
 from groq_agent.config import ConfigurationManager
 
@@ -34,6 +35,411 @@ def test_creates_file_when_none_found(tmp_path, monkeypatch):
     agent.file_ops = DummyFileOps()
     monkeypatch.setattr("groq_agent.agentic_chat.Prompt.ask", lambda *args, **kwargs: "index.html")
     response = agent._handle_file_modification_request("make a website listing schools")
-    assert agent.file_ops.created[0] == "index.html"
-    assert "Created new file" in response
+    assert "index.html" in response
     assert Path("index.html").exists()
+    assert Path("styles.css").exists()
+
+
+def test_workspace_scan_is_cached_until_a_directory_changes(tmp_path, monkeypatch):
+    workspace = tmp_path / "ws"
+    (workspace / "src").mkdir(parents=True)
+    (workspace / "src" / "app.py").write_text("print('hi')\n")
+    os.chdir(workspace)
+    config = ConfigurationManager(config_dir=tmp_path / "cfg")
+    first = AgenticChat(config, DummyAPI())
+    assert first.accessible_files == {os.path.join("src", "app.py")}
+
+    def fail_scan(self):
+        raise AssertionError("workspace should not be rescanned")
+
+    monkeypatch.setattr(AgenticChat, "_scan_workspace", fail_scan)
+    cached = AgenticChat(config, DummyAPI())
+    assert cached.accessible_files == first.accessible_files
+
+    monkeypatch.undo()
+    (workspace / "src" / "util.py").write_text("")
+    os.utime(workspace / "src", ns=(0, 0))
+    rescanned = AgenticChat(config, DummyAPI())
+    assert os.path.join("src", "util.py") in rescanned.accessible_files
+
+
+def test_rescan_only_walks_changed_subtrees(tmp_path, monkeypatch):
+    workspace = tmp_path / "ws"
+    for subdir in ("api", "web"):
+        (workspace / subdir).mkdir(parents=True)
+        (workspace / subdir / "main.py").write_text("")
+    os.chdir(workspace)
+    config = ConfigurationManager(config_dir=tmp_path / "cfg")
+    AgenticChat(config, DummyAPI())
+
+    (workspace / "web" / "app.js").write_text("")
+    os.utime(workspace / "web", ns=(0, 0))
+    walked = []
+    walk_subtree = agentic_chat._walk_subtree
+
+    def record_walk(top, subdir):
+        walked.append(subdir)
+        return walk_subtree(top, subdir)
+
+    monkeypatch.setattr(agentic_chat, "_walk_subtree", record_walk)
+    agent = AgenticChat(config, DummyAPI())
+    assert walked == ["web"]
+    assert agent.accessible_files == {
+        os.path.join("api", "main.py"),
+        os.path.join("web", "main.py"),
+        os.path.join("web", "app.js"),
+    }
+
+
+def test_resolve_file_prefers_basename_then_substring(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "main.py").write_text("")
+    (tmp_path / "pkg" / "helpers.py").write_text("")
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    assert agent._resolve_file("main.py") == os.path.join("pkg", "main.py")
+    assert agent._resolve_file("pkg/help") == os.path.join("pkg", "helpers.py")
+    assert agent._resolve_file("missing.py") is None
+    assert agent._resolve_file(str(tmp_path / "pkg" / "main.py")) == os.path.join("pkg", "main.py")
+    assert agent._resolve_file("./pkg/helpers.py") == os.path.join("pkg", "helpers.py")
+
+    agent._add_accessible_file("./new.py")
+    agent._add_accessible_file(str(tmp_path / "new.py"))
+    assert agent._by_basename["new.py"] == ["new.py"]
+    assert agent._resolve_file("new.py") == "new.py"
+    assert agent._sorted_files == sorted(agent.accessible_files)
+    agent._remove_accessible_file("new.py")
+    assert agent._resolve_file("new.py") is None
+    assert agent._sorted_files == sorted(agent.accessible_files)
+
+
+def test_relevant_files_stop_at_limit(tmp_path):
+    for i in range(5):
+        (tmp_path / f"view{i}.js").write_text("")
+    (tmp_path / "notes.txt").write_text("")
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    relevant = agent._find_relevant_files("add a button")
+    assert len(relevant) == 3
+    assert all(path.endswith(".js") for path in relevant)
+    assert agent._find_relevant_files("explain this") == []
+
+    agent._remove_accessible_file("view0.js")
+    assert "view0.js" not in agent._find_relevant_files("add a button")
+
+
+def test_ask_option_reads_single_keypresses(tmp_path, monkeypatch):
+    import click
+
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    keys = iter(["x", "r", "\r"])
+    monkeypatch.setattr("sys.stdin.isatty", lambda: True)
+    monkeypatch.setattr(click, "getchar", lambda: next(keys))
+    assert agent._ask_option(["A", "R", "C"], default="C") == "R"
+    assert agent._ask_option(["A", "R", "C"], default="C") == "C"
+
+
+def test_delete_resolves_exact_path_or_unique_name(tmp_path, monkeypatch):
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "util.py").write_text("")
+    (tmp_path / "main.py").write_text("")
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    monkeypatch.setattr("groq_agent.agentic_chat.Prompt.ask", lambda *a, **k: True)
+
+    agent._handle_delete("util.py")
+    assert (tmp_path / "a" / "util.py").exists() and (tmp_path / "b" / "util.py").exists()
+
+    agent._handle_delete(os.path.join("b", "util.py"))
+    assert not (tmp_path / "b" / "util.py").exists()
+    agent._handle_delete(str(tmp_path / "main.py"))
+    assert not (tmp_path / "main.py").exists()
+    assert agent.accessible_files == {os.path.join("a", "util.py")}
+
+
+def test_command_dispatch(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    assert agent._handle_agentic_command("/exit") is True
+    assert agent._handle_agentic_command("/mode qna") is True
+    assert agent._switch_to_mode == "qna"
+    assert agent._handle_agentic_command("/mode other") is False
+    assert agent._handle_agentic_command("/unknown") is False
+
+
+def test_search_ranks_earlier_filename_matches_first(tmp_path):
+    for name in ("my_utils.py", "utils.py", "other.py"):
+        (tmp_path / name).write_text("")
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    shown = []
+    agent._display_search_results = shown.extend
+    agent._handle_search("utils")
+    assert [r['file'] for r in shown] == ["utils.py", "my_utils.py"]
+
+
+def test_search_accepts_glob_patterns(tmp_path):
+    for name in ("my_utils.py", "utils.js", "Test_a.py"):
+        (tmp_path / name).write_text("")
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    shown = []
+    agent._display_search_results = shown.extend
+    agent._handle_search("*.PY")
+    assert sorted(r['file'] for r in shown) == ["Test_a.py", "my_utils.py"]
+    shown.clear()
+    agent._handle_search("test_?.py")
+    assert [r['file'] for r in shown] == ["Test_a.py"]
+    shown.clear()
+    (tmp_path / "straße.py").write_text("")
+    agent._add_accessible_file("straße.py")
+    agent._handle_search("STRASSE")
+    assert [r['file'] for r in shown] == ["straße.py"]
+
+
+class CountingAPI:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def chat_completion(self, **kwargs):
+        from types import SimpleNamespace
+
+        self.calls += 1
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_required_files_are_reused_for_the_same_request(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    api = CountingAPI('[{"path": "index.html", "prompt": "Main page"}]')
+    agent = AgenticChat(config, api)
+    first = agent._determine_required_files("make a website")
+    second = agent._determine_required_files("make a website")
+    assert first == second == [{"path": "index.html", "prompt": "Main page"}]
+    assert api.calls == 1
+
+
+class StreamingAPI:
+    def __init__(self, fragments):
+        self.fragments = fragments
+        self.consumed = 0
+
+    def chat_stream(self, **kwargs):
+        for fragment in self.fragments:
+            self.consumed += 1
+            yield fragment
+
+
+def test_required_files_stop_reading_after_first_json_array(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    api = StreamingAPI([
+        'Files [see below]:\n[{"path": "app.py", ',
+        '"prompt": "Entry point [main]"}]',
+        '\nExplanation that should never be read',
+        ' and more text',
+    ])
+    agent = AgenticChat(config, api)
+    specs = agent._determine_required_files("make a script")
+    assert specs == [{"path": "app.py", "prompt": "Entry point [main]"}]
+    assert api.consumed == 2
+
+
+def test_operation_history_size_is_tracked_incrementally(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    for i in range(150):
+        agent._add_to_operation_history({"type": "test", "description": f"op {i}"})
+    assert len(agent.operation_history) == 100
+    assert agent.operation_history[0]["description"] == "op 50"
+    total = sum(len(str(op)) for op in agent.operation_history)
+    assert agent.current_context_size == total // 4
+
+
+def test_essential_context_from_keywords(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    agent.messages.append({"role": "user", "content": "List colleges in the city of Mumbai as JSON"})
+    agent.messages.append({"role": "user", "content": "Now build a website for them"})
+    assert agent._extract_essential_context().splitlines() == [
+        "LOCATION: Mumbai",
+        "CONTENT TYPE: Colleges",
+        "FILE TYPE: JSON data structure",
+        "PROJECT TYPE: Website/HTML project",
+    ]
+
+
+def test_extract_section_spans_header_to_end_marker(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    agent.messages.append({"role": "user", "content": "build a page"})
+    context = agent._build_smart_context("add a footer")
+    history = agent._extract_section(context, "=== CONVERSATION HISTORY ===")
+    assert history.splitlines() == [
+        "=== CONVERSATION HISTORY ===",
+        "USER: build a page",
+        "=== END CONVERSATION HISTORY ===",
+    ]
+    assert agent._extract_section(context, "=== MISSING ===") == ""
+
+
+def test_parse_file_prompts_from_editor_buffer():
+    from groq_agent.agentic_chat import FILE_PROMPTS_TEMPLATE, _parse_file_prompts
+
+    text = FILE_PROMPTS_TEMPLATE + (
+        "# index.html\nLanding page\nwith a hero\n\n"
+        "# style.css\n\n"
+        "# app.js\n# a note\nClick handlers\n"
+    )
+    assert _parse_file_prompts(text, ["index.html", "style.css", "app.js"]) == [
+        {"path": "index.html", "prompt": "Landing page\nwith a hero"},
+        {"path": "app.js", "prompt": "Click handlers"},
+    ]
+
+
+def test_task_context_keeps_modified_files_unique_and_ordered(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    agent._update_task_context("build a site", ["b.html", "a.css"])
+    agent._update_task_context("update it", ["a.css", "c.js", "b.html"])
+    assert agent.task_context["files_modified"] == ["b.html", "a.css", "c.js"]
+
+
+def test_essential_context_is_refreshed_when_messages_change(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    agent.messages.append({"role": "user", "content": "hello"})
+    assert agent._extract_essential_context() == ""
+    assert agent._extract_essential_context() == ""
+    agent.messages.append({"role": "user", "content": "export it as json"})
+    assert agent._extract_essential_context() == "FILE TYPE: JSON data structure"
+
+
+def test_analyze_recounts_lines_after_an_edit(tmp_path):
+    target = tmp_path / "app.py"
+    target.write_text("a\nb\n")
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    shown = []
+    agent._display_analysis_results = shown.append
+    agent._handle_analyze("app.py")
+    target.write_text("a\nb\nc\nd\n")
+    agent._handle_analyze("app.py")
+    assert [(r['size'], r['lines']) for r in shown] == [(4, 3), (8, 5)]
+
+
+def test_read_shows_a_line_window(tmp_path, monkeypatch):
+    (tmp_path / "app.py").write_text("".join(f"line {i}\n" for i in range(1, 11)))
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    printed = []
+    monkeypatch.setattr(agent.console, "print", lambda *args, **kwargs: printed.extend(args))
+    agent._handle_read("app.py 4-5")
+    syntax = printed[0].renderable
+    assert syntax.code == "line 4\nline 5\n"
+    assert syntax.start_line == 4
+
+
+def test_agent_instructions_are_sent_as_one_system_message(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    api = CountingAPI("answer")
+    sent = []
+    chat_completion = api.chat_completion
+    api.chat_completion = lambda **kwargs: sent.append(kwargs["messages"]) or chat_completion(**kwargs)
+    agent = AgenticChat(config, api)
+    assert agent._process_agentic_request("explain recursion") == "answer"
+    agent._process_agentic_request("and iteration?")
+    system_message = sent[0][0]
+    assert system_message["role"] == "system"
+    assert sent[1][0] is system_message
+    assert [m["role"] for m in sent[1]] == ["system", "user", "assistant", "user"]
+    assert sent[1][-1]["content"].endswith("User Request: and iteration?")
+
+
+def test_task_continuation_matches_word_forms(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    agent._update_task_context("build a site")
+    for follow_up in ("try adding a footer", "changing the colors", "updates please", "removed the header"):
+        agent._update_task_context(follow_up)
+        assert agent.task_context['task_continuation'], follow_up
+    agent._update_task_context("explain recursion with examples")
+    assert not agent.task_context['task_continuation']
+
+
+def test_read_window_is_bounded_and_validated(tmp_path, monkeypatch):
+    (tmp_path / "min.js").write_bytes(b"x" * (agentic_chat.MAX_READ_BYTES * 3) + b"\nlast\n")
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / ".cfg")
+    agent = AgenticChat(config, DummyAPI())
+    printed = []
+    monkeypatch.setattr(agent.console, "print", lambda *args, **kwargs: printed.extend(args))
+    agent._handle_read("min.js 1-99999999")
+    assert len(printed[0].renderable.code) == agentic_chat.MAX_READ_BYTES
+    assert "truncated" in printed[1]
+
+    printed.clear()
+    agent._handle_read("min.js 2-2")
+    assert printed[0].renderable.code == "last\n"
+    assert printed[0].renderable.start_line == 2
+
+    printed.clear()
+    agent._handle_read("min.js 5-3")
+    assert "Invalid line range" in printed[0]
+    printed.clear()
+    agent._handle_read("min.js 10-12")
+    assert "no lines" in printed[0]
+
+
+def test_modification_keywords_match_whole_words(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / "cfg")
+    agent = AgenticChat(config, DummyAPI())
+    assert agent._is_file_modification_request("adding a page")
+    assert agent._is_file_modification_request("it updates the header")
+    assert not agent._is_file_modification_request("I appreciate the help")
+    assert not agent._is_file_modification_request("what is your address")
+    assert not agent._is_file_modification_request("explain the codebase")
+
+
+def test_style_words_only_match_whole_words(tmp_path):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / "cfg")
+    agent = AgenticChat(config, DummyAPI())
+    agent.recent_changes.append({'file': 'index.html', 'action': 'edited'})
+    assert agent._is_file_modification_request("use blue colours")
+    assert not agent._is_file_modification_request("reduce latency")
+    assert not agent._is_file_modification_request("redo a blueprint of colorado")
+
+
+def test_multi_file_fallback_creates_every_file(tmp_path, monkeypatch):
+    os.chdir(tmp_path)
+    config = ConfigurationManager(config_dir=tmp_path / "cfg")
+    agent = AgenticChat(config, DummyAPI())
+    agent.file_ops = DummyFileOps()
+    specs = [{"path": "index.html", "prompt": "page"}, {"path": "style.css", "prompt": "styles"}]
+    monkeypatch.setattr(agent, "_determine_required_files", lambda user_input: specs)
+    monkeypatch.setattr(agent, "_ask_for_single_task_confirmation", lambda *args: None)
+    agent._handle_multi_file_creation_request("make a website")
+    assert Path("index.html").exists() and Path("style.css").exists()
+    assert {"index.html", "style.css"} <= agent.accessible_files
@@ -31,3 +31,169 @@ def test_review_files_with_context():
         # Ensure prompts include context from the other file
         assert "print('two')" in api.calls[0]["prompt"]
         assert "print('one')" in api.calls[1]["prompt"]
+
+
+class DummyCompletionClient:
+    def __init__(self, content):
+        self.content = content
+        self.calls = []
+        self.batches = []
+
+    def chat_completion(self, messages, model, **kwargs):
+        self.calls.append({"messages": messages, "model": model, **kwargs})
+        message = type("Message", (), {"content": self.content})
+        choice = type("Choice", (), {"message": message})
+        return type("Response", (), {"choices": [choice]})
+
+    def chat_stream(self, messages, model, **kwargs):
+        self.calls.append({"messages": messages, "model": model, "stream": True, **kwargs})
+        for start in range(0, len(self.content), 4):
+            yield self.content[start:start + 4]
+
+    def chat_many(self, prompts, model, **kwargs):
+        self.batches.append(prompts)
+        return [self.chat_completion(messages, model, **kwargs) for messages in prompts]
+
+    async def chat_many_async(self, prompts, model, **kwargs):
+        return self.chat_many(prompts, model, **kwargs)
+
+    async def chat_completion_async(self, messages, model, **kwargs):
+        return self.chat_completion(messages, model, **kwargs)
+
+    async def chat_stream_async(self, messages, model, **kwargs):
+        for token in self.chat_stream(messages, model, **kwargs):
+            yield token
+
+
+def test_analyze_file_multi_shares_prompt_prefix():
+    api = DummyCompletionClient("looks fine")
+    ops = FileOperations(api)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file1 = Path(tmpdir) / "one.py"
+        file1.write_text("print('one')\n")
+
+        assert ops.analyze_file_multi(str(file1), "dummy", ["comprehensive", "performance"])
+
+    assert len(api.batches) == 1
+    first, second = api.batches[0]
+    assert first[0] == second[0]
+    assert "print('one')" in first[0]["content"]
+    assert first[1] != second[1]
+
+
+def test_analyze_file_uses_response_cache():
+    from groq_agent.cache import ResponseCache
+
+    api = DummyCompletionClient("cached analysis")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ops = FileOperations(api, ResponseCache(Path(tmpdir) / "cache"))
+        file1 = Path(tmpdir) / "one.py"
+        file1.write_text("print('one')\n")
+
+        assert ops.analyze_file(str(file1), "dummy", "security")
+        assert ops.analyze_file(str(file1), "dummy", "security")
+        assert len(api.calls) == 1
+
+        assert ops.analyze_file(str(file1), "dummy", "performance")
+        assert len(api.calls) == 2
+
+        file1.write_text("print('changed')\n")
+        assert ops.analyze_file(str(file1), "dummy", "security")
+        assert len(api.calls) == 3
+
+
+def test_read_reuses_bytes_until_file_changes():
+    ops = FileOperations(DummyAPIClient())
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file1 = Path(tmpdir) / "one.py"
+        file1.write_text("print('one')\r\n")
+
+        first = ops._read_bytes(str(file1))
+        assert ops._read_bytes(str(file1)) is first
+        assert ops._read(str(file1)) == "print('one')\n"
+
+        file1.write_text("print('changed')\n")
+        assert ops._read(str(file1)) == "print('changed')\n"
+
+
+def test_async_analyses_share_cache_with_sync():
+    import asyncio
+    from groq_agent.cache import ResponseCache
+
+    api = DummyCompletionClient("fine")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ops = FileOperations(api, ResponseCache(Path(tmpdir) / "cache"))
+        file1 = Path(tmpdir) / "one.py"
+        file1.write_text("print('one')\n")
+
+        async def run():
+            return await asyncio.gather(
+                ops.analyze_file_async(str(file1), "dummy", "security"),
+                ops.analyze_file_multi_async(str(file1), "dummy", ["comprehensive", "review"]),
+            )
+
+        assert asyncio.run(run()) == [True, True]
+        assert len(api.calls) == 3
+
+        assert ops.analyze_file_multi(str(file1), "dummy", ["comprehensive", "review", "security"])
+        assert len(api.calls) == 3
+
+
+def test_local_linter_findings_skip_model(monkeypatch):
+    import json
+    import subprocess
+
+    report = [{"code": "PERF401", "message": "Use a list comprehension", "location": {"row": 3}}]
+    monkeypatch.setattr("groq_agent.file_operations.shutil.which", lambda name: "/usr/bin/" + name)
+    monkeypatch.setattr(
+        "groq_agent.file_operations.subprocess.run",
+        lambda *args, **kwargs: subprocess.CompletedProcess(args, 1, stdout=json.dumps(report)),
+    )
+
+    api = DummyCompletionClient("model analysis")
+    ops = FileOperations(api)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file1 = Path(tmpdir) / "one.py"
+        file1.write_text("print('one')\n")
+
+        assert ops._run_local_linter(str(file1), "performance") == [
+            "- Line 3: `PERF401` Use a list comprehension"
+        ]
+        assert ops.analyze_file(str(file1), "dummy", "performance")
+        assert api.calls == []
+
+        assert ops.analyze_file(str(file1), "dummy", "performance", deep=True)
+        assert len(api.calls) == 1
+
+
+def test_create_multiple_files_generates_all_specs():
+    api = DummyAPIClient()
+    ops = FileOperations(api)
+    ops._show_multiple_files_diff_preview = lambda file_contents: None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        specs = [
+            {"path": str(Path(tmpdir) / name), "prompt": f"Create {name}"}
+            for name in ("a.py", "b.py", "c.py")
+        ]
+
+        results = ops.create_multiple_files_from_prompt(specs, model="dummy", auto_apply=True)
+
+        assert results == {spec["path"]: True for spec in specs}
+        assert len(api.calls) == 3
+        assert all(Path(spec["path"]).read_text() == "\n# edited" for spec in specs)
+
+
+def test_response_cache_key_covers_the_prompt():
+    from groq_agent.cache import ResponseCache
+
+    api = DummyCompletionClient("fine")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ops = FileOperations(api, ResponseCache(Path(tmpdir) / "cache"))
+        file1 = Path(tmpdir) / "one.py"
+        file1.write_text("print('one')\n")
+
+        assert ops.analyze_file(str(file1), "dummy", "security")
+        ops._get_analysis_instructions = lambda analysis_type: "List only critical issues."
+        assert ops.analyze_file(str(file1), "dummy", "security")
+        assert ops.analyze_file_multi(str(file1), "dummy", ["security"])
+        assert len(api.calls) == 2
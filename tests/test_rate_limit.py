@@ -0,0 +1,59 @@
+"""Tests for client-side rate limiting."""
+
+import asyncio
+import threading
+import time
+
+from groq_agent.rate_limit import RateLimiter, estimate_tokens, PRIORITY_HIGH, PRIORITY_LOW
+
+
+def test_request_limit_waits_for_window():
+    limiter = RateLimiter(rpm=2, window=0.2)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_token_limit_waits_for_window():
+    limiter = RateLimiter(tpm=100, window=0.2)
+    start = time.monotonic()
+    limiter.acquire(80)
+    limiter.acquire(10)
+    assert time.monotonic() - start < 0.1
+    limiter.acquire(50)
+    assert time.monotonic() - start >= 0.15
+
+
+def test_high_priority_goes_first():
+    limiter = RateLimiter(rpm=1, window=0.2)
+    limiter.acquire()
+    order = []
+
+    def worker(name, priority):
+        limiter.acquire(priority=priority)
+        order.append(name)
+
+    low = threading.Thread(target=worker, args=("low", PRIORITY_LOW))
+    low.start()
+    time.sleep(0.02)
+    high = threading.Thread(target=worker, args=("high", PRIORITY_HIGH))
+    high.start()
+    low.join()
+    high.join()
+    assert order == ["high", "low"]
+
+
+def test_async_acquire_respects_limit():
+    limiter = RateLimiter(rpm=2, window=0.2)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire_async() for _ in range(3)))
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.15
+
+
+def test_estimate_tokens():
+    assert estimate_tokens([{"role": "user", "content": "x" * 400}]) == 101
@@ -0,0 +1,14 @@
+from groq_agent.text_patterns import CODE_MARKER_RE, CONTINUATION_RE
+
+
+def test_continuation_matches_verb_forms_and_whole_pronouns():
+    for text in ("changed the header", "updates", "try adding a footer", "removed it", "makes sense", "Modify THIS"):
+        assert CONTINUATION_RE.search(text), text
+    for text in ("edit with care", "explain recursion"):
+        assert not CONTINUATION_RE.search(text), text
+
+
+def test_code_markers():
+    assert CODE_MARKER_RE.search("```\nprint(1)\n```")
+    assert CODE_MARKER_RE.search("Public Class Foo")
+    assert not CODE_MARKER_RE.search("plain prose answer")
@@ -0,0 +1,40 @@
+import glob
+import os
+from pathlib import Path
+
+from groq_agent.workspace_scan import SCAN_EXTENSIONS, SCAN_FILE_NAMES, SCAN_IGNORE_DIRS, scan_files
+
+
+def glob_scan(root):
+    """The glob-based scan the agents used before os.walk."""
+    files = set()
+    for pattern in ['*' + ext for ext in SCAN_EXTENSIONS] + list(SCAN_FILE_NAMES):
+        files.update(glob.glob(os.path.join(root, "**", pattern), recursive=True))
+    return {f for f in files if not any(part in SCAN_IGNORE_DIRS for part in Path(f).parts)}
+
+
+def make_tree(root):
+    for relative in (
+        "app.py", ".env", ".hidden.py", "notes.bin", "Dockerfile",
+        "src/main.js", "src/.env", "src/.gitignore", "src/deep/util.ts",
+        "node_modules/pkg/index.js", "src/__pycache__/main.py",
+        ".git/config.json", ".hiddendir/a.py", "env/lib.py",
+    ):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+
+def test_scan_picks_hidden_files_by_name_and_prunes_directories(tmp_path):
+    make_tree(tmp_path)
+    found = {os.path.relpath(f, tmp_path) for f in scan_files(str(tmp_path))}
+    assert found == {
+        "app.py", ".env", "Dockerfile",
+        os.path.join("src", "main.js"), os.path.join("src", ".env"),
+        os.path.join("src", ".gitignore"), os.path.join("src", "deep", "util.ts"),
+    }
+
+
+def test_scan_matches_the_glob_scan(tmp_path):
+    make_tree(tmp_path)
+    assert scan_files(str(tmp_path)) == glob_scan(str(tmp_path))